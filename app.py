@@ -1,16 +1,23 @@
-from flask import Flask, render_template, jsonify, request, flash, redirect, url_for
+from flask import Flask, render_template, jsonify, request, flash, redirect, url_for, g
 from flask_socketio import SocketIO
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import schedule
+import threading
 from datetime import datetime
 from decimal import Decimal
-import fdb
 from config import DB_CONFIG, APP_CONFIG, LOG_CONFIG
 
 from woocommerce.wc_client import WooCommerceClient
 from woocommerce.sync_manager import WooCommerceSyncManager
+from wolvox.connection_pool import get_pool
+from wolvox.product import WolvoxProduct
 from wolvox.product_reader import ProductReader
+from wolvox.stock_ledger import get_stock_ledger
+from wolvox.statement_cache import get_statement_cache
+from src.core.concurrency import get_concurrency_controller
+from src.database.failed_orders import FailedOrderStore
 
 # Flask uygulamasını oluştur
 app = Flask(__name__)
@@ -63,21 +70,99 @@ app.config.update(
     WC_CONSUMER_SECRET=os.getenv('WC_CONSUMER_SECRET', 'cs_62e4007a181e06ed919fa469baaf6e3fac8ea45f')
 )
 
+def get_db_pool():
+    """Wolvox bağlantı havuzunu getir"""
+    return get_pool(
+        dsn=f"{DB_CONFIG['host']}:{DB_CONFIG['database']}",
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        charset=DB_CONFIG['charset']
+    )
+
 def get_db_connection():
-    """Veritabanı bağlantısı oluştur"""
+    """İstek boyunca kullanılacak veritabanı bağlantısını getir
+
+    Bağlantı havuzdan istek başına bir kez alınır ve istek sonunda havuza
+    iade edilir; route'lardaki conn.close() çağrıları etkisizdir.
+    """
+    if 'db_conn' not in g:
+        try:
+            g.db_conn = get_db_pool().acquire(scoped=True)
+        except Exception as e:
+            logger.error(f"Veritabanı bağlantı hatası: {str(e)}")
+            raise Exception(f"Veritabanı bağlantı hatası: {str(e)}")
+    return g.db_conn
+
+def get_wc_client():
+    """WooCommerce API istemcisini uygulama ayarlarıyla oluştur"""
+    return WooCommerceClient(
+        app.config['WC_URL'],
+        app.config['WC_CONSUMER_KEY'],
+        app.config['WC_CONSUMER_SECRET']
+    )
+
+# Stok/fiyat hızlı şeridinin yöneticisi; indeks ve son gönderilen değerler turlar arasında korunur
+stock_price_lane = None
+stock_price_lane_lock = threading.Lock()
+
+# Zamanlanmış senkronizasyon durumu (/api/sync/start ve /api/sync/stop)
+sync_instance = None
+sync_thread = None
+is_syncing = False
+
+def background_task():
+    """Zamanlanmış görevleri çalıştıran arka plan döngüsü"""
+    while True:
+        schedule.run_pending()
+        socketio.sleep(1)
+
+def seed_stock_ledger():
+    """Stok defteri hiç oluşturulmamışsa arka planda oluştur
+
+    Okumalar defteri oluşturmaz; defter hazır olana kadar istenen stoklar
+    Wolvox'tan canlı okunur.
+    """
     try:
-        # DSN formatında bağlantı
-        dsn = f"{DB_CONFIG['host']}:{DB_CONFIG['database']}"
-        conn = fdb.connect(
-            dsn=dsn,
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password'],
-            charset=DB_CONFIG['charset']
-        )
-        return conn
+        ledger = get_stock_ledger(get_db_pool())
+        if not ledger.is_seeded():
+            ledger.seed()
     except Exception as e:
-        logger.error(f"Veritabanı bağlantı hatası: {str(e)}")
-        raise Exception(f"Veritabanı bağlantı hatası: {str(e)}")
+        logger.error(f"Stok defteri oluşturulamadı: {str(e)}")
+
+def run_stock_price_lane():
+    """Zamanlanmış stok/fiyat hızlı şeridi (istek bağlamı dışında çalışır)
+
+    Zamanlayıcı ve /sync/stock-prices/changes aynı yöneticiyi paylaştığından
+    aynı anda tek tur çalışır; süren bir tur varken gelen çağrı reddedilir.
+    """
+    global stock_price_lane
+    if not stock_price_lane_lock.acquire(blocking=False):
+        logger.info("Stok/fiyat hızlı şeridi zaten çalışıyor, tur atlandı")
+        return [(False, 'Stok/fiyat hızlı şeridi zaten çalışıyor')]
+    try:
+        conn = get_db_pool().acquire()
+        try:
+            if stock_price_lane is None:
+                stock_price_lane = WooCommerceSyncManager(get_wc_client(), None)
+            stock_price_lane.reader = ProductReader(conn)
+            return stock_price_lane.sync_stock_price_changes()
+        finally:
+            # Havuza iade edilen bağlantı bir sonraki turda kullanılmasın
+            if stock_price_lane is not None:
+                stock_price_lane.reader = None
+            conn.close()
+    except Exception as e:
+        logger.error(f"Stok/fiyat hızlı şeridi hatası: {str(e)}")
+        return [(False, f"Hata: {str(e)}")]
+    finally:
+        stock_price_lane_lock.release()
+
+@app.teardown_appcontext
+def release_db_connection(exception=None):
+    """İstek sonunda bağlantıyı havuza iade et"""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        conn.release()
 
 def decimal_default(obj):
     """JSON serializer için Decimal tipini destekler"""
@@ -143,20 +228,10 @@ def products():
                 ROWS 50
             """)
         
-        products = []
-        for row in cursor.fetchall():
-            products.append({
-                'blkodu': row[0],
-                'stok_kodu': row[1],
-                'stok_adi': row[2],
-                'barkod': row[3],
-                'birim': row[4],
-                'kdv_orani': row[5],
-                'webde_gorunsun': row[6],
-                'aktif': row[7],
-                'satis_fiyati1': float(row[8] or 0),
-                'satis_fiyati2': float(row[9] or 0)
-            })
+        products = list(WolvoxProduct.from_rows(cursor.fetchall(), (
+            'blkodu', 'stok_kodu', 'stok_adi', 'barkod', 'birim', 'kdv_orani',
+            'webde_gorunsun', 'aktif', 'satis_fiyati', 'satis_fiyati2'
+        )))
         
         cursor.close()
         conn.close()
@@ -190,58 +265,34 @@ def test_connection_api():
     })
 
 def get_product_stock(stok_kodu):
-    """Ürünün depo bazlı stok miktarlarını getirir"""
+    """Ürünün depo bazlı stok miktarlarını getirir
+
+    Bakiyeler süreç boyunca paylaşılan sync.db stok defterinden okunur;
+    deftere henüz işlenmemiş hareketleri olan stoklar Wolvox'tan canlı
+    hesaplanır ve tüm isteklerde kısa süre tekrar kullanılır.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Toplam stok miktarı
-        cursor.execute("""
-            SELECT 
-                COALESCE(SUM(MIKTAR), 0) as STOK_MIKTARI
-            FROM STOK_HAREKETLERI
-            WHERE STOK_KODU = ?
-        """, (stok_kodu,))
-        
-        total_stock = cursor.fetchone()[0]
-        
-        # Depo bazlı stok miktarları
-        cursor.execute("""
-            SELECT 
-                d.DEPO_ADI,
-                COALESCE(SUM(sh.MIKTAR), 0) as MIKTAR
-            FROM DEPOLAR d
-            LEFT JOIN STOK_HAREKETLERI sh ON sh.DEPO = d.DEPO_KODU AND sh.STOK_KODU = ?
-            GROUP BY d.DEPO_ADI, d.DEPO_KODU
-            HAVING COALESCE(SUM(sh.MIKTAR), 0) <> 0
-            ORDER BY d.DEPO_ADI
-        """, (stok_kodu,))
+        stock = get_stock_ledger(get_db_pool()).get_stock(stok_kodu)
         
         depot_stocks = []
-        for row in cursor.fetchall():
-            depot_stocks.append(f"{row[0].strip()}: {float(row[1])}")
+        for depo_adi, miktar in stock['depots'].items():
+            depot_stocks.append(f"{depo_adi}: {float(miktar)}")
         
         return {
-            'total': float(total_stock) if total_stock else 0,
+            'total': stock['total'],
             'depots': depot_stocks
         }
         
     except Exception as e:
         logger.error(f"Stok miktarı alınırken hata: {str(e)}")
         raise
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 def get_product_prices(stok_kodu):
     """Ürünün satış fiyatlarını getirir"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
         
-        cursor.execute("""
+        cursor = get_statement_cache(conn).execute("""
             SELECT 
                 SATIS_FIYATI1,
                 SATIS_FIYATI2,
@@ -267,8 +318,6 @@ def get_product_prices(stok_kodu):
         logger.error(f"Fiyat bilgisi alınırken hata: {str(e)}")
         raise
     finally:
-        if cursor:
-            cursor.close()
         if conn:
             conn.close()
 
@@ -409,10 +458,10 @@ def get_product_detail(stokkodu):
     """Stok detayını döndürür"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
+        statements = get_statement_cache(conn)
         
         # Ana ürün bilgilerini al
-        cursor.execute("""
+        cursor = statements.execute("""
             SELECT 
                 s.BLKODU,
                 s.STOKKODU,
@@ -450,7 +499,7 @@ def get_product_detail(stokkodu):
         product['SATIS_FIYATI2'] = price_info['satis_fiyati2']
         
         # Ürün özelliklerini al
-        cursor.execute("""
+        cursor = statements.execute("""
             SELECT 
                 o.OZELLIK_ADI,
                 od.DEGER
@@ -462,7 +511,7 @@ def get_product_detail(stokkodu):
         product['ozellikler'] = [dict(zip(['name', 'value'], row)) for row in cursor.fetchall()]
         
         # Stok hareketlerini al
-        cursor.execute("""
+        cursor = statements.execute("""
             SELECT FIRST 100
                 sh.TARIH,
                 sh.TUTAR_TURU,
@@ -478,7 +527,7 @@ def get_product_detail(stokkodu):
                                 for row in cursor.fetchall()]
         
         # Resimleri al
-        cursor.execute("""
+        cursor = statements.execute("""
             SELECT 
                 s.RESIM,
                 s.RESIM2,
@@ -492,7 +541,6 @@ def get_product_detail(stokkodu):
         row = cursor.fetchone()
         product['resimler'] = [img.strip() for img in row if img and img.strip()]
         
-        cursor.close()
         conn.close()
         
         return jsonify(product)
@@ -520,6 +568,8 @@ def start_sync():
         return jsonify({'status': 'error', 'message': 'Senkronizasyon zaten çalışıyor'})
     
     try:
+        # main.py içe aktarılırken kendi loglama ve .env ayarlarını yükler; yalnızca gerektiğinde yüklenir
+        from main import WolvoxWooCommerceSync
         sync_instance = WolvoxWooCommerceSync()
         
         # Zamanlanmış görevleri ayarla
@@ -527,17 +577,18 @@ def start_sync():
         schedule.every(30).minutes.do(sync_instance.sync_products)
         schedule.every(15).minutes.do(sync_instance.sync_orders)
         schedule.every(60).minutes.do(sync_instance.sync_categories)
+        schedule.every(int(os.getenv('STOCK_PRICE_LANE_INTERVAL', '60'))).seconds.do(run_stock_price_lane)
         
         # Hemen ilk senkronizasyonu başlat
         sync_instance.sync_categories()
         sync_instance.sync_products()
         sync_instance.sync_orders()
         
-        # Arka plan thread'ini başlat
-        if not sync_thread:
+        # schedule.run_pending() döngüsünü çalıştıran arka plan thread'ini başlat
+        is_syncing = True
+        if sync_thread is None:
             sync_thread = socketio.start_background_task(background_task)
         
-        is_syncing = True
         return jsonify({'status': 'success', 'message': 'Senkronizasyon başlatıldı'})
     
     except Exception as e:
@@ -566,10 +617,12 @@ def get_sync_status():
     """Senkronizasyon durumu API endpoint'i"""
     try:
         status = {
-            'running': sync_thread is not None and sync_thread.is_alive(),
+            'running': is_syncing and sync_thread is not None and sync_thread.is_alive(),
             'last_sync': None,  # TODO: Son senkronizasyon bilgisi
             'stats': None,      # TODO: Senkronizasyon istatistikleri
-            'logs': []          # TODO: Senkronizasyon logları
+            'logs': [],         # TODO: Senkronizasyon logları
+            'concurrency': get_concurrency_controller().metrics(),
+            'quarantined_orders': FailedOrderStore().quarantined()
         }
         return jsonify(status)
     except Exception as e:
@@ -845,8 +898,8 @@ def test_wc_connection():
     try:
         wc_client = get_wc_client()
         
-        sync_manager = WooCommerceSyncManager(wc_client, get_db_connection())
-        success, message = sync_manager.sync_product('PET-100-70-13-175-4000')
+        with WooCommerceSyncManager(wc_client, get_db_connection()) as sync_manager:
+            success, message = sync_manager.sync_product('PET-100-70-13-175-4000')
         
         return jsonify({
             'success': success,
@@ -1046,8 +1099,8 @@ def sync_single_product(stok_kodu):
     try:
         wc_client = get_wc_client()
         
-        sync_manager = WooCommerceSyncManager(wc_client, get_db_connection())
-        success, message = sync_manager.sync_product(stok_kodu)
+        with WooCommerceSyncManager(wc_client, get_db_connection()) as sync_manager:
+            success, message = sync_manager.sync_product(stok_kodu)
         
         return jsonify({
             'success': success,
@@ -1064,8 +1117,8 @@ def sync_all_products():
     try:
         wc_client = get_wc_client()
         
-        sync_manager = WooCommerceSyncManager(wc_client, get_db_connection())
-        results = sync_manager.sync_all_products()
+        with WooCommerceSyncManager(wc_client, get_db_connection()) as sync_manager:
+            results = sync_manager.sync_all_products()
         
         return jsonify(results)
         
@@ -1079,8 +1132,8 @@ def sync_stock(stok_kodu):
     try:
         wc_client = get_wc_client()
         
-        sync_manager = WooCommerceSyncManager(wc_client, get_db_connection())
-        success, message = sync_manager.sync_stock(stok_kodu)
+        with WooCommerceSyncManager(wc_client, get_db_connection()) as sync_manager:
+            success, message = sync_manager.sync_stock(stok_kodu)
         
         return jsonify({
             'success': success,
@@ -1097,8 +1150,8 @@ def sync_price(stok_kodu):
     try:
         wc_client = get_wc_client()
         
-        sync_manager = WooCommerceSyncManager(wc_client, get_db_connection())
-        success, message = sync_manager.sync_price(stok_kodu)
+        with WooCommerceSyncManager(wc_client, get_db_connection()) as sync_manager:
+            success, message = sync_manager.sync_price(stok_kodu)
         
         return jsonify({
             'success': success,
@@ -1116,9 +1169,8 @@ def sync_all():
         conn = get_db_connection()
         wc_client = get_wc_client()
         product_reader = ProductReader(conn)
-        sync_manager = WooCommerceSyncManager(wc_client, product_reader)
-        
-        results = sync_manager.sync_all_products()
+        with WooCommerceSyncManager(wc_client, product_reader) as sync_manager:
+            results = sync_manager.sync_all_products()
         
         success_count = len([r for r, _ in results if r])
         total_count = len(results)
@@ -1145,9 +1197,8 @@ def sync_stock_prices():
         conn = get_db_connection()
         wc_client = get_wc_client()
         product_reader = ProductReader(conn)
-        sync_manager = WooCommerceSyncManager(wc_client, product_reader)
-        
-        results = sync_manager.sync_stock_prices()
+        with WooCommerceSyncManager(wc_client, product_reader) as sync_manager:
+            results = sync_manager.sync_stock_prices()
         
         success_count = len([r for r, _ in results if r])
         total_count = len(results)
@@ -1167,6 +1218,57 @@ def sync_stock_prices():
             'message': f'Hata: {str(e)}'
         }), 500
 
+@app.route('/sync/stock-prices/changes', methods=['POST'])
+def sync_stock_price_changes():
+    """Yalnızca değişen stok ve fiyatları gönder"""
+    results = run_stock_price_lane()
+    success_count = len([r for r, _ in results if r])
+    return jsonify({
+        'success': all(r for r, _ in results),
+        'message': f'{success_count}/{len(results)} ürün güncellendi',
+        'results': [{'success': r, 'message': m} for r, m in results]
+    })
+
+@app.route('/sync/products', methods=['POST'])
+def sync_products_by_codes():
+    """Seçili ürünleri senkronize et"""
+    try:
+        stok_kodlari = (request.get_json(silent=True) or {}).get('stok_kodlari') or []
+        if not isinstance(stok_kodlari, list):
+            return jsonify({
+                'success': False,
+                'message': 'stok_kodlari bir liste olmalı'
+            }), 400
+        if not stok_kodlari:
+            return jsonify({
+                'success': False,
+                'message': 'Stok kodu listesi boş'
+            }), 400
+        
+        conn = get_db_connection()
+        wc_client = get_wc_client()
+        product_reader = ProductReader(conn)
+        with WooCommerceSyncManager(wc_client, product_reader) as sync_manager:
+            results = sync_manager.sync_products_by_codes(stok_kodlari)
+        
+        success_count = len([r for r, _ in results if r])
+        total_count = len(results)
+        
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{success_count}/{total_count} ürün senkronize edildi',
+            'results': [{'success': r, 'message': m} for r, m in results]
+        })
+        
+    except Exception as e:
+        logger.error(f"Toplu ürün senkronizasyon hatası: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'Hata: {str(e)}'
+        }), 500
+
 @app.route('/sync/product/<stok_kodu>', methods=['POST'])
 def sync_product(stok_kodu):
     """Tek bir ürünü senkronize et"""
@@ -1174,7 +1276,6 @@ def sync_product(stok_kodu):
         conn = get_db_connection()
         wc_client = get_wc_client()
         product_reader = ProductReader(conn)
-        sync_manager = WooCommerceSyncManager(wc_client, product_reader)
         
         product = product_reader.get_product_by_code(stok_kodu)
         if not product:
@@ -1183,7 +1284,8 @@ def sync_product(stok_kodu):
                 'message': f'Ürün bulunamadı: {stok_kodu}'
             }), 404
         
-        success, message = sync_manager.sync_product(product)
+        with WooCommerceSyncManager(wc_client, product_reader) as sync_manager:
+            success, message = sync_manager.sync_product(product)
         
         conn.close()
         
@@ -1220,4 +1322,5 @@ def get_sync_status_info():
         }), 500
 
 if __name__ == '__main__':
+    socketio.start_background_task(seed_stock_ledger)
     socketio.run(app, host='localhost', debug=False, port=8080)
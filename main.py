@@ -4,10 +4,25 @@ from dotenv import load_dotenv
 from woocommerce import API
 import fdb
 import schedule
+import threading
 import time
 from datetime import datetime
 import requests
 
+from src.core.batch_dispatcher import BatchDispatcher
+from src.core.batch_writer import ProductBatchWriter
+from src.core.category_sync import CategoryTreeSync
+from src.core.order_feed import OrderFeed
+from src.core.woo_fields import with_fields
+from src.database.failed_orders import FailedOrderStore
+from src.database.fingerprints import FingerprintStore, payload_hash
+from wolvox.category_reader import read_category_paths
+from wolvox.connection_pool import get_pool
+from wolvox.orders import OrderWriter, existing_order_numbers
+from wolvox.parallel_reader import ParallelRangeReader, extract_workers
+from wolvox.stock_ledger import StockLedger
+from wolvox.stock_watcher import StockMovementWatcher
+
 # Logging yapılandırması
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +48,7 @@ class WolvoxWooCommerceSync:
         }
         self.last_sync = None
         self.exchange_rates = {}
+        self._stats_lock = threading.Lock()
         
         # WooCommerce API bağlantısı
         self.wcapi = API(
@@ -47,12 +63,29 @@ class WolvoxWooCommerceSync:
         if fb_client_path and os.path.exists(fb_client_path):
             fdb.load_api(fb_client_path)
         
-        self.conn = fdb.connect(
+        # Her görev havuzdan kendi bağlantısını alır ve bitince iade eder;
+        # böylece max_lifetime yenilemesi ve sağlık kontrolü uygulanır
+        self.pool = get_pool(
             database=os.getenv('WOLVOX_DB_PATH'),
             user=os.getenv('WOLVOX_DB_USER'),
             password=os.getenv('WOLVOX_DB_PASSWORD')
         )
-        self.cursor = self.conn.cursor()
+        
+        # sync.db içindeki depo bazlı stok defterinden gönderilemeyen değişiklikler
+        self.pending_stock_changes = {}
+
+        # Stok gönderimleri STOKHR izleyicisi ve dakikalık görev arasında sıralanır;
+        # son gönderilen miktarlar aynı bakiyenin iki yoldan tekrar gönderilmesini önler
+        self.stock_push_lock = threading.Lock()
+        self.pushed_stock_quantities = {}
+
+        # modified_after watermark'ı ile sayfalanan sipariş akışı
+        self.order_feed = OrderFeed(lambda params: self.wcapi.get("orders", params=params))
+        self.failed_orders = FailedOrderStore()
+        
+        # SKU bazlı son gönderilen ürün yükü özetleri
+        self.fingerprints = FingerprintStore()
+        self.batch_dispatcher = BatchDispatcher()
         
         # Döviz kurlarını güncelle
         self.update_exchange_rates()
@@ -82,14 +115,16 @@ class WolvoxWooCommerceSync:
             'orders': self.stats['orders'],
             'categories': self.stats['categories'],
             'last_sync': self.last_sync.isoformat() if self.last_sync else None,
-            'errors': self.stats['errors']
+            'errors': self.stats['errors'],
+            'quarantined_orders': self.failed_orders.quarantined()
         }
 
     def update_stats(self, stat_type, increment=1):
         """İstatistikleri günceller"""
-        if stat_type in self.stats:
-            self.stats[stat_type] += increment
-        self.last_sync = datetime.now()
+        with self._stats_lock:
+            if stat_type in self.stats:
+                self.stats[stat_type] += increment
+            self.last_sync = datetime.now()
 
     def convert_price(self, price, from_currency, to_currency='TRY'):
         """Fiyatı belirtilen para birimine çevirir"""
@@ -113,60 +148,31 @@ class WolvoxWooCommerceSync:
             return price
 
     def sync_categories(self):
-        """Wolvox'tan WooCommerce'e kategori senkronizasyonu"""
-        try:
-            # Wolvox'tan kategorileri çek
-            self.cursor.execute("""
-                SELECT 
-                    s.GRUBU as KATEGORI,
-                    s.UST_GRUBU as UST_KATEGORI
-                FROM STOK s
-                WHERE s.GRUBU IS NOT NULL
-                GROUP BY s.GRUBU, s.UST_GRUBU
-                ORDER BY s.UST_GRUBU, s.GRUBU
-            """)
-            categories = self.cursor.fetchall()
-
-            # Mevcut WooCommerce kategorilerini al
-            existing_categories = {cat['name']: cat['id'] for cat in self.wcapi.get("products/categories").json()}
-            category_map = {}  # Kategori eşleştirme için
-
-            for category in categories:
-                cat_name = category[0].strip()
-                parent_name = category[1].strip() if category[1] else None
-
-                try:
-                    # Kategori verilerini hazırla
-                    category_data = {
-                        'name': cat_name,
-                        'slug': self.slugify_turkish(cat_name)
-                    }
-
-                    # Üst kategori varsa ve daha önce oluşturulduysa
-                    if parent_name and parent_name in category_map:
-                        category_data['parent'] = category_map[parent_name]
-
-                    if cat_name in existing_categories:
-                        # Kategori varsa güncelle
-                        cat_id = existing_categories[cat_name]
-                        self.wcapi.put(f"products/categories/{cat_id}", category_data)
-                        category_map[cat_name] = cat_id
-                        logger.info(f"Kategori güncellendi: {cat_name}")
-                    else:
-                        # Yeni kategori oluştur
-                        response = self.wcapi.post("products/categories", category_data)
-                        cat_id = response.json()['id']
-                        category_map[cat_name] = cat_id
-                        existing_categories[cat_name] = cat_id
-                        logger.info(f"Yeni kategori eklendi: {cat_name}")
+        """Wolvox'tan WooCommerce'e kategori senkronizasyonu
 
-                except Exception as e:
-                    logger.error(f"Kategori işleme hatası ({cat_name}): {str(e)}")
-                    continue
+        GRUP/GRUP_ARA/GRUP_ALT ağacı seviye seviye products/categories/batch
+        ile aktarılır; ağaç son başarılı senkronizasyondan beri değişmediyse
+        adım atlanır.
+        """
+        try:
+            with self.pool.connection() as conn:
+                paths = read_category_paths(conn)
+                CategoryTreeSync(
+                    list_page=lambda page: self.wcapi.get(
+                        "products/categories", params=with_fields({'per_page': 100, 'page': page}, 'category')).json(),
+                    send_batch=self._send_category_batch,
+                    slugify=self.slugify_turkish
+                ).sync(paths)
 
         except Exception as e:
             logger.error(f"Kategori senkronizasyonunda hata: {str(e)}")
 
+    def _send_category_batch(self, data):
+        """Kategori oluşturmalarını products/categories/batch ile gönderir"""
+        response = self.wcapi.post("products/categories/batch", data)
+        response.raise_for_status()
+        return response.json()
+
     def slugify_turkish(self, text):
         """Türkçe karakterleri destekleyen URL dostu string oluşturur"""
         text = text.replace('ı', 'i').replace('İ', 'i')
@@ -181,201 +187,389 @@ class WolvoxWooCommerceSync:
     def sync_products(self):
         """Wolvox'tan WooCommerce'e ürün senkronizasyonu"""
         try:
-            # Wolvox'tan ürünleri çek
-            self.cursor.execute("""
-                SELECT 
-                    s.*,
-                    m.MARKA_ADI,
-                    COALESCE(
-                        (SELECT TOP 1 RESIM FROM STOK_RESIM sr WHERE sr.BLSTKODU = s.BLKODU),
-                        s.RESIM_YOLU
-                    ) as URUN_RESIM
-                FROM STOK s
-                LEFT JOIN MARKALAR m ON m.BLKODU = s.MARKA_BLKODU
-                WHERE s.AKTIF = 1 AND s.WEBDE_GORUNSUN = 1
-            """)
-            products = self.cursor.fetchall()
-
-            for product in products:
-                try:
-                    # Stok miktarını getir
-                    self.cursor.execute("""
-                        SELECT 
-                            COALESCE(SUM(CASE WHEN sh.TUTAR_TURU = 0 THEN sh.MIKTARI ELSE -sh.MIKTARI END), 0) as MIKTAR_KALAN
-                        FROM STOK s
-                        LEFT JOIN STOKHR sh ON sh.BLSTKODU = s.BLKODU
-                        WHERE s.STOKKODU = ?
-                        GROUP BY s.STOKKODU
-                    """, (product[0],))
-                    
-                    stok_miktar = self.cursor.fetchone()
-                    miktar = float(stok_miktar[0]) if stok_miktar else 0
-
-                    # Fiyat bilgilerini getir
-                    self.cursor.execute("""
-                        SELECT 
-                            sf.FIYATI,
-                            sf.DOVIZ_TURU
-                        FROM STOK_FIYAT sf
-                        WHERE sf.BLSTKODU = ? AND sf.FIYAT_NO = 1 AND sf.ALIS_SATIS = 1
-                        ORDER BY sf.FIYAT_NO
-                    """, (product[12],))
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                ledger = StockLedger(conn)
+                # Wolvox'tan ürünleri çek
+                query = """
+                    SELECT 
+                        s.*,
+                        m.MARKA_ADI,
+                        COALESCE(
+                            (SELECT TOP 1 RESIM FROM STOK_RESIM sr WHERE sr.BLSTKODU = s.BLKODU),
+                            s.RESIM_YOLU
+                        ) as URUN_RESIM
+                    FROM STOK s
+                    LEFT JOIN MARKALAR m ON m.BLKODU = s.MARKA_BLKODU
+                    WHERE s.AKTIF = 1 AND s.WEBDE_GORUNSUN = 1
+                """
+                if extract_workers() > 1:
+                    # Katalog BLKODU aralıklarına bölünüp havuzdaki bağlantılarla paralel okunur
+                    products = ParallelRangeReader(self.pool, connection=conn).iter_rows(query, 'STOK')
+                else:
+                    cursor.execute(query)
+                    products = cursor.fetchall()
+
+                def on_success(sku, action, item, fingerprint):
+                    self.fingerprints.save(sku, fingerprint, item['id'])
+                    if action == 'create':
+                        logger.info(f"Yeni ürün eklendi: {item.get('name', sku)}")
+                    else:
+                        logger.info(f"Ürün güncellendi: {item.get('name', sku)}")
+
+                def on_failure(sku, action, message, fingerprint):
+                    logger.error(f"Ürün işleme hatası ({sku}): {message}")
+
+                # Oluşturma/güncellemeler 100'lük products/batch istekleriyle gönderilir
+                writer = ProductBatchWriter(self._send_product_batch, on_success=on_success, on_failure=on_failure,
+                                            dispatcher=self.batch_dispatcher)
+
+                for product in products:
+                    try:
+                        # Stok miktarını defterden al
+                        miktar = ledger.get_stock(product[0].strip())['total']
+
+                        # Fiyat bilgilerini getir
+                        cursor.execute("""
+                            SELECT 
+                                sf.FIYATI,
+                                sf.DOVIZ_TURU
+                            FROM STOK_FIYAT sf
+                            WHERE sf.BLSTKODU = ? AND sf.FIYAT_NO = 1 AND sf.ALIS_SATIS = 1
+                            ORDER BY sf.FIYAT_NO
+                        """, (product[12],))
                     
-                    fiyat_bilgisi = self.cursor.fetchone()
-                    fiyat = float(fiyat_bilgisi[0]) if fiyat_bilgisi else 0
+                        fiyat_bilgisi = cursor.fetchone()
+                        fiyat = float(fiyat_bilgisi[0]) if fiyat_bilgisi else 0
                     
-                    # Ürün özelliklerini getir
-                    self.cursor.execute("""
-                        SELECT 
-                            o.OZELLIK_ADI,
-                            od.DEGER
-                        FROM STOK_OZELLIK_DEGER od
-                        JOIN STOK_OZELLIK o ON o.BLKODU = od.BLOZKODU
-                        WHERE od.BLSTKODU = ?
-                    """, (product[12],))
+                        # Ürün özelliklerini getir
+                        cursor.execute("""
+                            SELECT 
+                                o.OZELLIK_ADI,
+                                od.DEGER
+                            FROM STOK_OZELLIK_DEGER od
+                            JOIN STOK_OZELLIK o ON o.BLKODU = od.BLOZKODU
+                            WHERE od.BLSTKODU = ?
+                        """, (product[12],))
                     
-                    ozellikler = self.cursor.fetchall()
+                        ozellikler = cursor.fetchall()
                     
-                    # Ürün varyantlarını getir
-                    self.cursor.execute("""
-                        SELECT 
-                            v.VARYANT_ADI,
-                            v.BARKOD,
-                            v.STOK_MIKTARI,
-                            v.FIYAT
-                        FROM STOK_VARYANT v
-                        WHERE v.BLSTKODU = ?
-                    """, (product[12],))
+                        # Ürün varyantlarını getir
+                        cursor.execute("""
+                            SELECT 
+                                v.VARYANT_ADI,
+                                v.BARKOD,
+                                v.STOK_MIKTARI,
+                                v.FIYAT
+                            FROM STOK_VARYANT v
+                            WHERE v.BLSTKODU = ?
+                        """, (product[12],))
                     
-                    varyantlar = self.cursor.fetchall()
-
-                    # WooCommerce'de ürün güncelleme/ekleme işlemi
-                    product_data = {
-                        'name': product[1].strip(),
-                        'regular_price': str(fiyat),
-                        'stock_quantity': int(miktar),
-                        'manage_stock': True,
-                        'description': product[7].strip() if product[7] else '',
-                        'short_description': f"Marka: {product[5].strip() if product[5] else ''}\nModel: {product[6].strip() if product[6] else ''}",
-                        'categories': [{'name': product[9].strip()}] if product[9] else [],
-                        'attributes': [
-                            {
-                                'name': ozellik[0].strip(),
-                                'visible': True,
-                                'variation': False,
-                                'options': [ozellik[1].strip()]
-                            } for ozellik in ozellikler
-                        ],
-                        'meta_data': [
-                            {'key': 'marka', 'value': product[-2] if product[-2] else ''},
-                            {'key': 'barkod', 'value': product[2] if product[2] else ''},
-                            {'key': 'kod', 'value': product[0].strip()}
-                        ]
-                    }
-
-                    # Ürün resmi varsa ekle
-                    if product[-1]:
-                        product_data['images'] = [{'src': product[-1]}]
-
-                    # Varyantlar varsa ekle
-                    if varyantlar:
-                        product_data['type'] = 'variable'
-                        product_data['variations'] = []
-                        for varyant in varyantlar:
-                            variation_data = {
-                                'regular_price': str(varyant[3]),
-                                'stock_quantity': int(varyant[2]),
-                                'attributes': [
-                                    {
-                                        'name': varyant[0].strip(),
-                                        'option': varyant[0].strip()
-                                    }
-                                ]
-                            }
-                            product_data['variations'].append(variation_data)
-
-                    # Ürün WooCommerce'de var mı kontrol et
-                    woo_products = self.wcapi.get(f"products?sku={product[0].strip()}").json()
+                        varyantlar = cursor.fetchall()
+
+                        # WooCommerce'de ürün güncelleme/ekleme işlemi
+                        product_data = {
+                            'name': product[1].strip(),
+                            'regular_price': str(fiyat),
+                            'stock_quantity': int(miktar),
+                            'manage_stock': True,
+                            'description': product[7].strip() if product[7] else '',
+                            'short_description': f"Marka: {product[5].strip() if product[5] else ''}\nModel: {product[6].strip() if product[6] else ''}",
+                            'categories': [{'name': product[9].strip()}] if product[9] else [],
+                            'attributes': [
+                                {
+                                    'name': ozellik[0].strip(),
+                                    'visible': True,
+                                    'variation': False,
+                                    'options': [ozellik[1].strip()]
+                                } for ozellik in ozellikler
+                            ],
+                            'meta_data': [
+                                {'key': 'marka', 'value': product[-2] if product[-2] else ''},
+                                {'key': 'barkod', 'value': product[2] if product[2] else ''},
+                                {'key': 'kod', 'value': product[0].strip()}
+                            ]
+                        }
+
+                        # Ürün resmi varsa ekle
+                        if product[-1]:
+                            product_data['images'] = [{'src': product[-1]}]
+
+                        # Varyantlar varsa ekle
+                        if varyantlar:
+                            product_data['type'] = 'variable'
+                            product_data['variations'] = []
+                            for varyant in varyantlar:
+                                variation_data = {
+                                    'regular_price': str(varyant[3]),
+                                    'stock_quantity': int(varyant[2]),
+                                    'attributes': [
+                                        {
+                                            'name': varyant[0].strip(),
+                                            'option': varyant[0].strip()
+                                        }
+                                    ]
+                                }
+                                product_data['variations'].append(variation_data)
+
+                        # Son gönderilen yükle aynıysa WooCommerce'e gidilmez
+                        sku = product[0].strip()
+                        fingerprint = payload_hash(dict(product_data, sku=sku))
+                        if self.fingerprints.matches(sku, fingerprint):
+                            continue
+
+                        # Ürün WooCommerce'de var mı kontrol et
+                        woo_products = self.wcapi.get("products", params=with_fields({'sku': sku}, 'index')).json()
                     
-                    if woo_products:
-                        # Ürün varsa güncelle
-                        self.wcapi.put(f"products/{woo_products[0]['id']}", product_data)
-                        logger.info(f"Ürün güncellendi: {product[1].strip()}")
-                    else:
-                        # Ürün yoksa yeni ekle
-                        product_data['sku'] = product[0].strip()
-                        self.wcapi.post("products", product_data)
-                        logger.info(f"Yeni ürün eklendi: {product[1].strip()}")
+                        if woo_products:
+                            # Ürün varsa güncelle
+                            writer.update(sku, woo_products[0]['id'], product_data, fingerprint)
+                        else:
+                            # Ürün yoksa yeni ekle
+                            product_data['sku'] = sku
+                            writer.create(sku, product_data, fingerprint)
+
+                    except Exception as e:
+                        logger.error(f"Ürün işleme hatası ({product[0].strip()}): {str(e)}")
+                        continue
 
-                except Exception as e:
-                    logger.error(f"Ürün işleme hatası ({product[0].strip()}): {str(e)}")
-                    continue
+                writer.flush()
 
         except Exception as e:
             logger.error(f"Ürün senkronizasyonunda hata: {str(e)}")
+        finally:
+            # Gönderilen özetler tek işlemde yazılır
+            self.fingerprints.commit()
+
+    def _send_product_batch(self, data):
+        """Ürün oluşturma/güncellemelerini products/batch ile gönderir"""
+        response = self.wcapi.post("products/batch", data)
+        response.raise_for_status()
+        return response.json()
+
+    def sync_stock_changes(self):
+        """Son senkronizasyondan bu yana hareket gören ürünlerin stoklarını günceller"""
+        try:
+            # Defter her turda güncellenir; gönderilemeyen değişiklikler bir sonraki tura kalır
+            with self.pool.connection() as conn:
+                self.pending_stock_changes.update(StockLedger(conn).refresh())
+            self._push_pending_stock_changes()
 
-    def sync_orders(self):
-        """WooCommerce'den Wolvox'a sipariş senkronizasyonu"""
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Stok değişikliği senkronizasyonunda hata: {str(e)}")
+
+    def reconcile_stock_ledger(self):
+        """Stok defterini Wolvox ile uzlaştırır ve sapan stokları gönderir
+
+        Watermark ile yakalanamayan değişiklikler (silindi işaretlenen ya da
+        yerinde düzenlenen eski STOKHR hareketleri) defteri saptırır; defter
+        periyodik olarak yeniden oluşturulur ve toplamı değişen stoklar
+        WooCommerce'e gönderilir.
+        """
         try:
-            # Son 24 saatteki siparişleri al
-            orders = self.wcapi.get("orders?status=processing").json()
+            with self.pool.connection() as conn:
+                self.pending_stock_changes.update(StockLedger(conn).reconcile())
+            self._push_pending_stock_changes()
 
-            for order in orders:
-                # Siparişin Wolvox'ta olup olmadığını kontrol et
-                self.cursor.execute("SELECT * FROM SIPARIS WHERE SIPARIS_NO = ?", (str(order['id']),))
-                existing_order = self.cursor.fetchone()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Stok defteri uzlaştırmasında hata: {str(e)}")
+
+    def _push_pending_stock_changes(self):
+        """Bekleyen stok değişikliklerini gönderir; yalnızca reddedilenler bekler"""
+        if not self.pending_stock_changes:
+            return
+
+        failed = self._push_stock_balances(self.pending_stock_changes)
+        self.pending_stock_changes = {
+            blstkodu: balance for blstkodu, balance in self.pending_stock_changes.items()
+            if balance['stok_kodu'] in failed
+        }
 
-                if not existing_order:
-                    try:
-                        # Transaction başlat
-                        self.conn.begin()
-                        
-                        # Sipariş başlığını ekle
-                        order_date = datetime.fromisoformat(order['date_created'].replace('Z', '+00:00'))
-                        self.cursor.execute("""
-                            INSERT INTO SIPARIS (SIPARIS_NO, SIPARIS_TARIHI, MUSTERI_ADI, TOPLAM_TUTAR)
-                            VALUES (?, ?, ?, ?)
-                        """, (str(order['id']), order_date, order['billing']['first_name'] + ' ' + order['billing']['last_name'], float(order['total'])))
-
-                        # Sipariş detaylarını ekle
-                        for item in order['line_items']:
-                            self.cursor.execute("""
-                                INSERT INTO SIPARIS_DETAY (SIPARIS_ID, STOK_KODU, MIKTAR, BIRIM_FIYAT)
-                                VALUES (?, ?, ?, ?)
-                            """, (str(order['id']), item['sku'], float(item['quantity']), float(item['price'])))
-
-                        # Transaction'ı onayla
-                        self.conn.commit()
-                        logger.info(f"Yeni sipariş eklendi: {order['id']}")
-                        
-                    except Exception as e:
-                        # Hata durumunda rollback
-                        self.conn.rollback()
-                        logger.error(f"Sipariş ekleme hatası ({order['id']}): {str(e)}")
-                        continue
+    def push_stock_balances(self, balances):
+        """Stok bakiyelerini products/batch ile WooCommerce'e gönderir
+
+        STOKHR izleyicisinin gönderim fonksiyonudur; bir ürün bile
+        reddedilirse False döner ve izleyici watermark'ı ilerletmez.
+        Başarıyla gönderilen ürünler tekrar denemede atlanır.
+
+        Args:
+            balances: {BLSTKODU: {'stok_kodu': ..., 'bakiye': ...}}
+
+        Returns:
+            Tüm ürünler güncellendiyse True
+        """
+        return not self._push_stock_balances(balances)
+
+    def _push_stock_balances(self, balances):
+        """Stok bakiyelerini gönderir ve reddedilen SKU'ları döndürür
+
+        Ürün ID'leri önce son gönderim kayıtlarından alınır; bulunamayan
+        SKU'lar 50'lik gruplar halinde tek istekte sorgulanır. Yanıttaki
+        update listesi istek sırasıyla döndüğünden her kayıt konumuna göre
+        eşleştirilir; yalnızca 'error' içermeyen kayıtlar gönderilmiş sayılır.
+        İstek başarısız olursa exception fırlatılır. STOKHR izleyicisinin iş
+        parçacığından da çağrıldığından aynı anda tek gönderim yapılır.
+
+        Args:
+            balances: {BLSTKODU: {'stok_kodu': ..., 'bakiye': ...}}
+
+        Returns:
+            WooCommerce'in reddettiği stok kodları
+        """
+        with self.stock_push_lock:
+            stocks = {
+                b['stok_kodu']: int(b['bakiye']) for b in balances.values()
+                if b['stok_kodu'] and self.pushed_stock_quantities.get(b['stok_kodu']) != int(b['bakiye'])
+            }
+            ids = {sku: self.fingerprints.get_woo_id(sku) for sku in stocks}
+
+            # URL uzunluğu sınırı için gruplu SKU sorgusu başına 50 SKU
+            missing = [sku for sku, woo_id in ids.items() if not woo_id]
+            for i in range(0, len(missing), 50):
+                params = with_fields({'sku': ','.join(missing[i:i + 50]), 'per_page': 100}, 'index')
+                for product in self.wcapi.get("products", params=params).json():
+                    if product.get('sku') in ids:
+                        ids[product['sku']] = product['id']
+
+            updates = [
+                (sku, {'id': ids[sku], 'manage_stock': True, 'stock_quantity': quantity})
+                for sku, quantity in stocks.items() if ids.get(sku)
+            ]
+            failed = set()
+            for i in range(0, len(updates), 100):
+                chunk = updates[i:i + 100]
+                items = self._send_product_batch({'update': [data for _, data in chunk]}).get('update') or []
+                for position, (sku, data) in enumerate(chunk):
+                    item = items[position] if position < len(items) else {'error': {'message': 'Yanıtta kayıt yok'}}
+                    if item.get('error'):
+                        failed.add(sku)
+                        logger.error(f"Stok güncellenemedi ({sku}): {item['error'].get('message')}")
+                    else:
+                        self.pushed_stock_quantities[sku] = data['stock_quantity']
+
+            self.update_stats('products', len(updates) - len(failed))
+            logger.info(f"Stok değişiklikleri senkronize edildi: {len(updates) - len(failed)} ürün"
+                        + (f", {len(failed)} ürün reddedildi" if failed else ""))
+            return failed
+
+    def sync_orders(self):
+        """WooCommerce'den Wolvox'a sipariş senkronizasyonu
+
+        Son başarılı turdan bu yana değişen siparişler sayfa sayfa okunur;
+        her sayfanın Wolvox'taki kayıtları tek IN sorgusuyla kontrol edilir
+        ve yeni siparişler tek işlemde yazılır. Aktarılan siparişler tarama
+        bittikten sonra orders/batch ile işaretlenir; işaretleme siparişleri
+        durum filtresinden çıkardığından tarama sırasında yapılırsa sonraki
+        sayfalar kayar ve siparişler atlanır. Bir sipariş eklenemez ya da
+        işaretlenemezse watermark ilerletilmez ve aralık bir sonraki turda
+        tekrar okunur (eklenmiş siparişler atlanır). Art arda
+        WOO_ORDER_MAX_ATTEMPTS turda aktarılamayan sipariş karantinaya alınır
+        ve watermark'ı artık tutmaz; karantinadaki siparişler get_stats ile
+        raporlanır.
+        """
+        try:
+            with self.pool.connection() as conn:
+                order_writer = OrderWriter(conn)
+                errors = {}
+                imported = []
+                for orders in self.order_feed.pages():
+                    existing = existing_order_numbers(conn, (order['id'] for order in orders))
+                    written, _ = order_writer.write(
+                        [order for order in orders if str(order['id']) not in existing]
+                    )
+                    errors.update(order_writer.errors)
+
+                    # Önceki turda eklenip işaretlenemeyen siparişler de işaretlenir
+                    imported += [order['id'] for order in orders if str(order['id']) in existing] + written
+
+                if imported:
+                    errors.update(self._mark_orders_imported(imported))
+
+                self.failed_orders.clear(order_id for order_id in imported if order_id not in errors)
+
+                # Karantinadaki siparişler watermark'ı tutmaz
+                blocking = set(errors) - self.failed_orders.record_failures(errors)
+                if blocking:
+                    logger.warning(f"{len(blocking)} sipariş aktarılamadı, sipariş watermark'ı ilerletilmedi")
+                else:
+                    self.order_feed.commit()
 
         except Exception as e:
             logger.error(f"Sipariş senkronizasyonunda hata: {str(e)}")
 
+    def _mark_orders_imported(self, order_ids):
+        """Wolvox'a aktarılan siparişlerin durumunu orders/batch ile günceller
+
+        İsteğe bağlıdır: WOO_ORDER_IMPORTED_STATUS boşsa (varsayılan) durum
+        değiştirilmez. 'completed' müşteriye tamamlandı e-postası gönderir ve
+        kargolanmamış siparişi kapatır; özel bir durum (ör. 'wolvox-aktarildi')
+        tercih edilmelidir.
+
+        Returns:
+            Durumu güncellenemeyen siparişler {sipariş ID: hata mesajı}
+        """
+        status = os.getenv('WOO_ORDER_IMPORTED_STATUS', '')
+        if not status or status == self.order_feed.status:
+            return {}
+        errors = {}
+        for i in range(0, len(order_ids), 100):
+            chunk = order_ids[i:i + 100]
+            try:
+                response = self.wcapi.post("orders/batch", {
+                    'update': [{'id': order_id, 'status': status} for order_id in chunk]
+                })
+                response.raise_for_status()
+                items = response.json().get('update', [])
+            except Exception as e:
+                logger.error(f"Sipariş durumları güncellenemedi: {str(e)}")
+                errors.update((order_id, f"Durum güncellenemedi: {str(e)}") for order_id in chunk)
+                continue
+
+            # Yanıttaki kayıtlar istek sırasıyla döner
+            for position, order_id in enumerate(chunk):
+                item = items[position] if position < len(items) else {'error': {'message': 'Yanıtta kayıt yok'}}
+                if item.get('error'):
+                    message = item['error'].get('message')
+                    errors[order_id] = f"Durum güncellenemedi: {message}"
+                    logger.error(f"Sipariş durumu güncellenemedi ({order_id}): {message}")
+        return errors
+
+    def start_stock_watcher(self):
+        """STOKHR hareketlerini birkaç saniyede bir WooCommerce'e aktaran izleyiciyi başlat"""
+        self.stock_watcher = StockMovementWatcher(self.pool, self.push_stock_balances)
+        self.stock_watcher.start()
+
     def close_connections(self):
-        """Veritabanı bağlantılarını kapat"""
-        if hasattr(self, 'cursor') and self.cursor:
-            self.cursor.close()
-        if hasattr(self, 'conn') and self.conn:
-            self.conn.close()
+        """Arka plan izleyicisini ve toplu istek havuzunu kapat"""
+        if getattr(self, 'stock_watcher', None):
+            self.stock_watcher.stop()
+        if hasattr(self, 'batch_dispatcher'):
+            self.batch_dispatcher.close()
 
 def main():
     sync = WolvoxWooCommerceSync()
 
     # Periyodik senkronizasyon görevlerini planla
     schedule.every(30).minutes.do(sync.sync_products)  # Her 30 dakikada bir ürün senkronizasyonu
+    schedule.every(1).minutes.do(sync.sync_stock_changes)  # Her dakika yalnızca değişen stoklar
     schedule.every(15).minutes.do(sync.sync_orders)    # Her 15 dakikada bir sipariş senkronizasyonu
     schedule.every(60).minutes.do(sync.sync_categories)  # Her 60 dakikada bir kategori senkronizasyonu
 
+    # Stok defteri silinen/düzenlenen hareketlerden doğan sapmalara karşı periyodik yeniden oluşturulur
+    reconcile_hours = int(os.getenv('STOCK_LEDGER_RECONCILE_HOURS', '6'))
+    if reconcile_hours > 0:
+        schedule.every(reconcile_hours).hours.do(sync.reconcile_stock_ledger)
+
+    # Stok hareketleri birkaç saniye içinde aktarılır; dakikalık görev yedek olarak kalır
+    if os.getenv('STOCK_WATCHER_ENABLED', '1') != '0':
+        sync.start_stock_watcher()
+
     try:
         while True:
             schedule.run_pending()
-            time.sleep(60)
+            time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Program sonlandırılıyor...")
         sync.close_connections()
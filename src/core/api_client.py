@@ -11,6 +11,8 @@ from urllib.parse import urlencode
 import logging
 
 from src.config.settings import Settings
+from src.core.http_transport import IDEMPOTENT_METHODS
+from src.core.rate_limiter import BACKPRESSURE_STATUSES, get_rate_limiter, parse_retry_after
 from src.utils.logger import setup_logger
 
 class APIClient:
@@ -29,20 +31,26 @@ class APIClient:
         # Session oluştur
         self.session = self._create_session()
         
-        # Rate limiting
+        # Rate limiting (tüm APIClient örnekleri aynı kovayı paylaşır)
         self.rate_limit = api_config['rate_limit']
         self.rate_limit_period = api_config['rate_limit_period']
-        self.request_times = []
+        self.rate_limiter = get_rate_limiter(
+            'api_client',
+            rate=self.rate_limit / self.rate_limit_period,
+            capacity=self.rate_limit
+        )
     
     def _create_session(self) -> requests.Session:
         """Yeni bir HTTP session oluştur"""
         session = requests.Session()
         
-        # Retry stratejisi
+        # Retry stratejisi; 429/503 adapter'da tekrar denenmez, yanıt önce hız
+        # sınırlayıcıya ulaşır ve request içinde Retry-After ile tekrar denenir
         retry_strategy = Retry(
             total=self.max_retries,
             backoff_factor=self.retry_delay,
-            status_forcelist=[429, 500, 502, 503, 504]
+            status_forcelist=[500, 502, 504],
+            raise_on_status=False
         )
         
         # HTTP adapter'ı yapılandır
@@ -53,21 +61,8 @@ class APIClient:
         return session
     
     def _check_rate_limit(self):
-        """Rate limit kontrolü yap"""
-        current_time = time.time()
-        
-        # Eski istekleri temizle
-        self.request_times = [t for t in self.request_times 
-                            if current_time - t < self.rate_limit_period]
-        
-        # Rate limit kontrolü
-        if len(self.request_times) >= self.rate_limit:
-            sleep_time = self.request_times[0] + self.rate_limit_period - current_time
-            if sleep_time > 0:
-                self.logger.warning(f"Rate limit aşıldı. {sleep_time:.2f} saniye bekleniyor...")
-                time.sleep(sleep_time)
-        
-        self.request_times.append(current_time)
+        """Rate limit kontrolü yap (gerekirse token alınana kadar bekler)"""
+        self.rate_limiter.acquire()
     
     def _prepare_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """HTTP başlıklarını hazırla"""
@@ -136,25 +131,42 @@ class APIClient:
             signature = self._sign_request(method, url, kwargs.get('json'), sign_key)
             headers['X-Signature'] = signature
         
+        # 429/503 yanıtları idempotent isteklerde en fazla max_retries kez tekrar denenir
+        retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+        
         try:
-            start_time = time.time()
-            response = self.session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=self.timeout,
-                **kwargs
-            )
-            end_time = time.time()
-            
-            # İstek logla
-            self.logger.info(
-                f"API İsteği: {method} {url} "
-                f"(Süre: {(end_time - start_time):.2f}s, "
-                f"Durum: {response.status_code})"
-            )
-            
-            return self._handle_response(response)
+            attempt = 0
+            while True:
+                start_time = time.time()
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    **kwargs
+                )
+                end_time = time.time()
+                
+                # 429/503 ve Retry-After paylaşılan hızı düşürür
+                retry_after = response.headers.get('Retry-After')
+                self.rate_limiter.on_response(response.status_code, retry_after)
+                
+                # İstek logla
+                self.logger.info(
+                    f"API İsteği: {method} {url} "
+                    f"(Süre: {(end_time - start_time):.2f}s, "
+                    f"Durum: {response.status_code})"
+                )
+                
+                if response.status_code not in BACKPRESSURE_STATUSES or attempt >= retries:
+                    return self._handle_response(response)
+                
+                delay = max(self.retry_delay * (2 ** attempt), parse_retry_after(retry_after) or 0.0)
+                self.logger.warning(f"{method} {url} HTTP {response.status_code}, "
+                                    f"{delay:.1f} sn sonra tekrar denenecek")
+                attempt += 1
+                time.sleep(delay)
+                self._check_rate_limit()
             
         except requests.exceptions.Timeout:
             self.logger.error(f"İstek zaman aşımına uğradı: {url}")
@@ -0,0 +1,148 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .concurrency import AIMDController
+
+logger = logging.getLogger(__name__)
+
+def batch_concurrency() -> int:
+    """Eşzamanlı toplu istek sayısı (WOO_BATCH_CONCURRENCY, varsayılan 4)"""
+    return max(1, int(os.getenv('WOO_BATCH_CONCURRENCY', '4')))
+
+class BatchDispatcher:
+    def __init__(self, max_in_flight: Optional[int] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 controller: Optional[AIMDController] = None):
+        """Toplu WooCommerce isteklerini iş parçacığı havuzunda yürüten dağıtıcı
+
+        Aynı anda en fazla max_in_flight istek yürütülür; sınır doluyken
+        submit yer açılana kadar bekler. Sonuçlar gönderim sırasıyla alınır.
+        Her istek tamamlandığında on_progress (tamamlanan, gönderilen) istek
+        sayılarıyla çağrılır.
+
+        controller verilirse sınır sabit değil, denetleyicinin penceresidir
+        ve aynı denetleyiciyi kullanan tüm dağıtıcılar için ortaktır; her
+        isteğin süresi ve başarısı denetleyiciye bildirilir.
+
+        Args:
+            max_in_flight: Eşzamanlı istek sayısı (None ise WOO_BATCH_CONCURRENCY)
+            on_progress: İlerleme bildirimi için geri çağrı
+            controller: Uyarlanır eşzamanlılık denetleyicisi
+        """
+        self._max_in_flight = max(1, max_in_flight or batch_concurrency())
+        self.controller = controller
+        self.on_progress = on_progress
+        self.submitted = 0
+        self.completed = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self._max_in_flight)
+
+    @property
+    def max_in_flight(self) -> int:
+        """Şu anki eşzamanlı istek sınırı"""
+        if self.controller is not None:
+            return self.controller.window
+        return self._max_in_flight
+
+    def submit(self, fn: Callable, *args, check: Optional[Callable[[Any], bool]] = None) -> Future:
+        """İsteği havuza gönder
+
+        Uçuştaki istek sayısı sınıra ulaştıysa bir istek tamamlanana kadar
+        bekler; yer istek tamamlandığında (ya da iptal edildiğinde) bırakılır.
+
+        Args:
+            fn: Çalıştırılacak fonksiyon
+            *args: fn parametreleri
+            check: Sonucun başarılı olup olmadığını söyleyen fonksiyon
+                (verilmezse exception fırlatmayan her istek başarılıdır)
+        """
+        self._acquire()
+        try:
+            with self._lock:
+                if self._executor is None:
+                    workers = self.controller.max_window if self.controller else self._max_in_flight
+                    self._executor = ThreadPoolExecutor(max_workers=workers,
+                                                        thread_name_prefix='woo-batch')
+                executor = self._executor
+            future = executor.submit(self._run, fn, args, check)
+        except Exception:
+            self._release()
+            raise
+        with self._lock:
+            self.submitted += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def _acquire(self):
+        if self.controller is not None:
+            self.controller.acquire()
+        else:
+            self._slots.acquire()
+
+    def _release(self):
+        if self.controller is not None:
+            self.controller.release()
+        else:
+            self._slots.release()
+
+    def _run(self, fn: Callable, args: tuple, check: Optional[Callable[[Any], bool]]):
+        start = time.time()
+        try:
+            result = fn(*args)
+        except Exception:
+            if self.controller:
+                self.controller.record(time.time() - start, success=False)
+            raise
+        if self.controller:
+            self.controller.record(time.time() - start, success=check(result) if check else True)
+        return result
+
+    def _done(self, future: Future):
+        self._release()
+        with self._lock:
+            self.completed += 1
+            completed, submitted = self.completed, self.submitted
+        if self.on_progress:
+            try:
+                self.on_progress(completed, submitted)
+            except Exception as e:
+                logger.error(f"İlerleme bildirimi hatası: {str(e)}")
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        """fn'i öğelere eşzamanlı uygula, sonuçları öğe sırasıyla döndür
+
+        Öğeler tembel okunur; aynı anda en fazla max_in_flight istek
+        bekler. Bir istek hata verirse exception sonucunun sırası
+        geldiğinde fırlatılır.
+        """
+        pending = deque()
+        try:
+            for item in items:
+                pending.append(self.submit(fn, item))
+                if len(pending) >= self.max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """Havuzu kapat (bekleyen istekler tamamlanır)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,178 @@
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .batch_dispatcher import BatchDispatcher
+
+logger = logging.getLogger(__name__)
+
+# WooCommerce batch uç noktalarının istek başına kabul ettiği en fazla kayıt
+MAX_BATCH_SIZE = 100
+
+class ProductBatchWriter:
+    def __init__(self, send_batch: Callable[[Dict], Optional[Dict]], batch_size: int = MAX_BATCH_SIZE,
+                 on_success: Optional[Callable[[str, str, Dict, Any], None]] = None,
+                 on_failure: Optional[Callable[[str, str, str, Any], None]] = None,
+                 dispatcher: Optional[BatchDispatcher] = None):
+        """WooCommerce ürün oluşturma/güncellemelerini toplu gönderen yazıcı
+
+        Kuyruğa alınan kayıtlar batch_size'a ulaşınca tek bir products/batch
+        isteğiyle gönderilir. Yanıttaki create/update listeleri istek
+        sırasıyla döndüğünden her kayıt konumuna göre SKU'suyla eşleştirilir;
+        'error' içeren kayıtlar yalnızca o ürün için başarısız sayılır.
+        Sonuçlar kayıtların kuyruğa alındığı sırayla döner.
+
+        dispatcher verilirse dolan gruplar beklenmeden dağıtıcıya gönderilir;
+        eşzamanlı istek sınırına ulaşıldığında en eski istek beklenir ve
+        sonuçları işlenir. Geri çağrılar her zaman çağıran iş parçacığında
+        çalışır.
+
+        Args:
+            send_batch: {'create': [...], 'update': [...]} yükünü gönderip
+                WooCommerce yanıtını döndüren fonksiyon (hata durumunda None
+                döndürebilir ya da exception fırlatabilir)
+            batch_size: İstek başına en fazla kayıt sayısı (en fazla 100)
+            on_success: Başarılı her kayıt için (sku, işlem, yanıt, meta) ile çağrılır
+            on_failure: Başarısız her kayıt için (sku, işlem, hata, meta) ile çağrılır
+            dispatcher: Grupları eşzamanlı göndermek için dağıtıcı
+        """
+        self.send_batch = send_batch
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.results: List[Tuple[bool, str]] = []
+        self.dispatcher = dispatcher
+        self._pending: List[Tuple[str, str, Dict, Any]] = []  # (işlem, sku, veri, meta)
+        self._in_flight = deque()  # (kayıtlar, future)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def create(self, sku: str, data: Dict, meta: Any = None) -> List[Tuple[bool, str]]:
+        """Yeni ürünü kuyruğa al
+
+        Args:
+            sku: Ürün stok kodu
+            data: WooCommerce ürün verisi
+            meta: Geri çağrılara aynen iletilecek ek bilgi
+
+        Returns:
+            Kuyruk dolduysa gönderilen grubun sonuçları, aksi halde boş liste
+        """
+        self._pending.append(('create', sku, data, meta))
+        return self._flush_if_full()
+
+    def update(self, sku: str, product_id: int, data: Dict, meta: Any = None) -> List[Tuple[bool, str]]:
+        """Mevcut ürünün güncellemesini kuyruğa al
+
+        Args:
+            sku: Ürün stok kodu
+            product_id: WooCommerce ürün ID'si
+            data: Güncellenecek alanlar
+            meta: Geri çağrılara aynen iletilecek ek bilgi
+
+        Returns:
+            Kuyruk dolduysa gönderilen grubun sonuçları, aksi halde boş liste
+        """
+        self._pending.append(('update', sku, dict(data, id=product_id), meta))
+        return self._flush_if_full()
+
+    def _flush_if_full(self) -> List[Tuple[bool, str]]:
+        if len(self) < self.batch_size:
+            return []
+        if self.dispatcher is None:
+            return self.flush()
+
+        pending, self._pending = self._pending, []
+        self._in_flight.append((pending, self.dispatcher.submit(self._send, pending, check=self._succeeded)))
+        results = []
+        while len(self._in_flight) >= self.dispatcher.max_in_flight:
+            results.extend(self._collect())
+        return results
+
+    def flush(self) -> List[Tuple[bool, str]]:
+        """Kuyruktaki kayıtları gönder ve yürütülen istekleri bekle
+
+        Returns:
+            Gönderilen kayıtların [(başarı durumu, mesaj), ...] listesi
+        """
+        results = []
+        if self._pending:
+            pending, self._pending = self._pending, []
+            if self.dispatcher is None:
+                response, error = self._send(pending)
+                results.extend(self._map_results(pending, response, error))
+            else:
+                self._in_flight.append((pending, self.dispatcher.submit(self._send, pending, check=self._succeeded)))
+        while self._in_flight:
+            results.extend(self._collect())
+        return results
+
+    def _collect(self) -> List[Tuple[bool, str]]:
+        pending, future = self._in_flight.popleft()
+        response, error = future.result()
+        return self._map_results(pending, response, error)
+
+    @staticmethod
+    def _succeeded(sent: Tuple[Optional[Dict], Optional[str]]) -> bool:
+        return sent[1] is None
+
+    def _send(self, pending: List[Tuple[str, str, Dict, Any]]) -> Tuple[Optional[Dict], Optional[str]]:
+        payload = {}
+        for action, _, data, _ in pending:
+            payload.setdefault(action, []).append(data)
+
+        try:
+            response = self.send_batch(payload)
+        except Exception as e:
+            logger.error(f"Toplu ürün isteği başarısız: {str(e)}")
+            return None, str(e)
+        if response is None:
+            return None, "Yanıt alınamadı"
+        return response, None
+
+    def _map_results(self, pending: List[Tuple[str, str, Dict, Any]], response: Optional[Dict],
+                     error: Optional[str]) -> List[Tuple[bool, str]]:
+        results = []
+        positions = {'create': 0, 'update': 0}
+        for action, sku, _, meta in pending:
+            items = (response or {}).get(action) or []
+            position = positions[action]
+            positions[action] += 1
+            item = items[position] if position < len(items) else None
+            if item is None:
+                results.append(self._failed(sku, action, error or "Yanıtta kayıt yok", meta))
+            elif 'error' in item:
+                message = (item['error'] or {}).get('message') or str(item['error'])
+                results.append(self._failed(sku, action, message, meta))
+            else:
+                self._notify(self.on_success, sku, action, item, meta)
+                if action == 'create':
+                    results.append((True, f"Yeni ürün oluşturuldu: {sku}"))
+                else:
+                    results.append((True, f"Ürün güncellendi: {sku}"))
+
+        self.results.extend(results)
+        return results
+
+    def _notify(self, callback, *args):
+        # Geri çağrı hatası diğer kayıtların sonuçlarını etkilemez
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Toplu ürün sonucu işlenirken hata ({args[0]}): {str(e)}")
+
+    def _failed(self, sku: str, action: str, message: str, meta: Any) -> Tuple[bool, str]:
+        self._notify(self.on_failure, sku, action, message, meta)
+        if action == 'create':
+            return False, f"Ürün oluşturulamadı: {sku} ({message})"
+        return False, f"Ürün güncellenemedi: {sku} ({message})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.database.sync_state import get_sync_state, set_sync_state
+
+logger = logging.getLogger(__name__)
+
+def normalize_name(name: str) -> str:
+    """Kategori adını Türkçe kurallarıyla küçük harfe çevirip boşlukları sadeleştir
+
+    'I' -> 'ı' ve 'İ' -> 'i' dönüşümü str.lower'dan önce yapılır; böylece
+    'IŞIK' ile 'ışık', 'İZMİR' ile 'izmir' aynı anahtara düşer.
+    """
+    name = (name or '').replace('I', 'ı').replace('İ', 'i')
+    return ' '.join(name.lower().split())
+
+class CategoryTreeSync:
+    STATE_KEY = 'category_tree.hash'
+
+    def __init__(self, list_page: Callable[[int], Optional[List[Dict]]],
+                 send_batch: Callable[[Dict], Optional[Dict]], batch_size: int = 100,
+                 slugify: Optional[Callable[[str], str]] = None):
+        """Wolvox kategori ağacını WooCommerce'e seviye seviye aktaran senkronizör
+
+        Wolvox ağacı (ad yolları) WooCommerce ağacıyla karşılaştırılır; eksik
+        düğümler önce kök seviyede, sonra her alt seviyede
+        products/categories/batch istekleriyle oluşturulur. Bir seviyede
+        oluşturulan kategorilerin ID'leri bir sonraki seviyenin üst ID'si
+        olur. Ağacın özeti sync.db'de saklanır; ağaç değişmemişse WooCommerce'e
+        hiç gidilmez.
+
+        Args:
+            list_page: Sayfa numarası alıp o sayfadaki kategorileri (100'lük)
+                döndüren fonksiyon
+            send_batch: {'create': [...]} yükünü gönderip WooCommerce
+                yanıtını döndüren fonksiyon
+            batch_size: İstek başına en fazla kategori
+            slugify: Verilirse yeni kategorilerin slug'ı bu fonksiyonla üretilir
+        """
+        self.list_page = list_page
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.slugify = slugify
+
+    @staticmethod
+    def tree_hash(paths: Iterable[Tuple[str, ...]]) -> str:
+        """Ağacın normalize edilmiş ad yollarından özet"""
+        normalized = sorted({tuple(normalize_name(name) for name in path) for path in paths})
+        return hashlib.sha256(json.dumps(normalized, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def _read_woo_tree(self) -> Dict[Tuple[int, str], int]:
+        tree = {}
+        page = 1
+        while True:
+            categories = self.list_page(page)
+            if categories is None:
+                raise Exception(f"Kategori listesi alınamadı (sayfa {page})")
+            for category in sorted(categories, key=lambda c: c['id']):
+                tree.setdefault((category.get('parent') or 0, normalize_name(category['name'])), category['id'])
+            if len(categories) < 100:
+                break
+            page += 1
+        return tree
+
+    def sync(self, paths: List[Tuple[str, ...]], force: bool = False) -> Dict:
+        """Ağacı senkronize et
+
+        Args:
+            paths: Wolvox ad yolları (bkz. wolvox.category_reader.read_category_paths)
+            force: Ağaç özeti aynı olsa da WooCommerce ile karşılaştır
+
+        Returns:
+            {'skipped', 'created', 'existing', 'failed', 'ids': {yol: kategori ID}}
+        """
+        digest = self.tree_hash(paths)
+        if not force and get_sync_state(self.STATE_KEY) == digest:
+            logger.info("Kategori ağacı değişmemiş, senkronizasyon atlandı")
+            return {'skipped': True, 'created': 0, 'existing': 0, 'failed': 0, 'ids': {}}
+
+        tree = self._read_woo_tree()
+        ids: Dict[Tuple[str, ...], int] = {}
+        created = existing = failed = 0
+
+        for depth in range(1, max((len(path) for path in paths), default=0) + 1):
+            missing = []  # (yol, üst ID)
+            for path in sorted(path for path in paths if len(path) == depth):
+                parent_id = ids.get(path[:-1]) if depth > 1 else 0
+                if parent_id is None:
+                    # Üst kategori oluşturulamadıysa alt kategori de atlanır
+                    failed += 1
+                    continue
+                category_id = tree.get((parent_id, normalize_name(path[-1])))
+                if category_id:
+                    ids[path] = category_id
+                    existing += 1
+                else:
+                    missing.append((path, parent_id))
+
+            for i in range(0, len(missing), self.batch_size):
+                chunk = missing[i:i + self.batch_size]
+                for (path, parent_id), category_id in zip(chunk, self._create(chunk)):
+                    if category_id:
+                        ids[path] = category_id
+                        tree[(parent_id, normalize_name(path[-1]))] = category_id
+                        created += 1
+                    else:
+                        failed += 1
+
+        if not failed:
+            set_sync_state(self.STATE_KEY, digest)
+        logger.info(f"Kategori senkronizasyonu: {created} yeni, {existing} mevcut, {failed} hatalı")
+        return {'skipped': False, 'created': created, 'existing': existing, 'failed': failed, 'ids': ids}
+
+    def _create(self, chunk: List[Tuple[Tuple[str, ...], int]]) -> List[Optional[int]]:
+        """Bir grup kategoriyi oluştur, yanıtları istek sırasıyla ID'ye çevir"""
+        data = {'create': []}
+        for path, parent_id in chunk:
+            category = {'name': path[-1], 'parent': parent_id}
+            if self.slugify:
+                category['slug'] = self.slugify(path[-1])
+            data['create'].append(category)
+        try:
+            response = self.send_batch(data)
+        except Exception as e:
+            logger.error(f"Toplu kategori isteği başarısız: {str(e)}")
+            response = None
+        items = (response or {}).get('create') or []
+
+        ids = []
+        for position, (path, _) in enumerate(chunk):
+            item = items[position] if position < len(items) else None
+            if item is None:
+                ids.append(None)
+            elif 'error' in item:
+                error = item['error'] or {}
+                # Aynı üst kategoride aynı adla kategori varsa mevcut ID kullanılır
+                resource_id = (error.get('data') or {}).get('resource_id')
+                if error.get('code') == 'term_exists' and resource_id:
+                    ids.append(resource_id)
+                else:
+                    logger.error(f"Kategori oluşturulamadı ({' > '.join(path)}): {error.get('message')}")
+                    ids.append(None)
+            else:
+                ids.append(item.get('id'))
+        return ids
@@ -0,0 +1,133 @@
+import os
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class AIMDController:
+    def __init__(self, initial: int = 2, min_window: int = 1, max_window: int = 8,
+                 latency_tolerance: float = 1.5, decrease_factor: float = 0.5):
+        """Toplu istekler için uyarlanır (AIMD) eşzamanlılık penceresi
+
+        Her başarılı istekte pencere 1/pencere kadar büyür; yani gecikme
+        sabit kaldıkça bir tam pencere tamamlandığında pencere 1 artar.
+        Hata, 429/503 ya da taban gecikmenin latency_tolerance katını aşan
+        gecikme tıkanma sayılır ve pencere decrease_factor ile çarpılır.
+        Aynı anda uçuşta olan isteklerin sonuçları pencereyi art arda
+        küçültmesin diye bir azaltmadan sonra en az bir pencere kadar
+        istek tamamlanmadan tekrar azaltılmaz.
+
+        Taban gecikme tıkanmasız isteklerin en düşük değerine yavaşça
+        yaklaşan hareketli ortalamadır (sunucu hızlandığında hemen,
+        yavaşladığında kademeli güncellenir).
+
+        Pencere acquire/release ile uygulanır: denetleyiciyi paylaşan tüm
+        dağıtıcı ve yazıcıların uçuştaki istekleri toplamda pencereyi aşmaz.
+
+        Args:
+            initial: Başlangıç penceresi
+            min_window: En küçük pencere
+            max_window: En büyük pencere
+            latency_tolerance: Tıkanma sayılan gecikme / taban gecikme oranı
+            decrease_factor: Tıkanmada pencere çarpanı
+        """
+        self.min_window = max(1, min_window)
+        self.max_window = max(self.min_window, max_window)
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self._window = float(min(self.max_window, max(self.min_window, initial)))
+        self._baseline: Optional[float] = None
+        self._last_latency: Optional[float] = None
+        self._since_decrease = 0
+        self._completed = 0
+        self._congestions = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Condition()
+
+    @property
+    def window(self) -> int:
+        """Şu anki eşzamanlı istek sınırı"""
+        return int(self._window)
+
+    def acquire(self):
+        """Pencerede yer açılana kadar bekle ve bir istek yeri al"""
+        with self._slots:
+            while self._in_flight >= self.window:
+                self._slots.wait()
+            self._in_flight += 1
+
+    def release(self):
+        """Tamamlanan isteğin yerini bırak"""
+        with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def record(self, latency: float, success: bool = True):
+        """Tamamlanan bir isteğin sonucunu işle
+
+        Args:
+            latency: İstek süresi (saniye)
+            success: İstek başarılı mı (hata/429/503 için False)
+        """
+        with self._lock:
+            self._completed += 1
+            self._since_decrease += 1
+            self._last_latency = latency
+
+            slow = (self._baseline is not None
+                    and latency > self._baseline * self.latency_tolerance)
+            if success and not slow:
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    self._baseline += (latency - self._baseline) * 0.05
+                self._window = min(self.max_window, self._window + 1 / self._window)
+                return
+
+            if success:
+                # Yavaşlama kalıcıysa taban gecikme yeni seviyeye kayar
+                self._baseline += (latency - self._baseline) * 0.05
+            if self._since_decrease < self._window:
+                return
+            self._congestions += 1
+            self._since_decrease = 0
+            old = self.window
+            self._window = max(self.min_window, self._window * self.decrease_factor)
+            new = self.window
+        logger.warning(f"Tıkanma algılandı ({'hata' if not success else f'{latency:.1f} sn gecikme'}), "
+                       f"eşzamanlılık {old} -> {new}")
+
+    def metrics(self) -> Dict:
+        """Pencere ve gecikme ölçümleri"""
+        with self._lock:
+            return {
+                'window': self.window,
+                'in_flight': self._in_flight,
+                'min_window': self.min_window,
+                'max_window': self.max_window,
+                'baseline_latency': self._baseline,
+                'last_latency': self._last_latency,
+                'completed': self._completed,
+                'congestions': self._congestions
+            }
+
+_controllers: Dict[str, AIMDController] = {}
+_controllers_lock = threading.Lock()
+
+def get_concurrency_controller(name: str = 'woocommerce') -> AIMDController:
+    """Ada göre paylaşılan eşzamanlılık denetleyicisini getir
+
+    Pencere süreç boyunca korunur; her senkronizasyon önceki turun
+    öğrendiği değerden başlar. Başlangıç ve üst sınır
+    WOO_BATCH_CONCURRENCY ve WOO_BATCH_MAX_CONCURRENCY ile ayarlanır.
+    """
+    with _controllers_lock:
+        controller = _controllers.get(name)
+        if controller is None:
+            controller = _controllers[name] = AIMDController(
+                initial=int(os.getenv('WOO_BATCH_CONCURRENCY', '4')),
+                max_window=int(os.getenv('WOO_BATCH_MAX_CONCURRENCY', '8'))
+            )
+        return controller
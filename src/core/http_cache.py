@@ -0,0 +1,181 @@
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Önbellekte saklanan yanıt başlıkları
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date', 'X-WP-Total', 'X-WP-TotalPages', 'Link')
+
+# modified_after filtresini destekleyen WooCommerce listeleri
+PROBE_COLLECTIONS = re.compile(r'/wp-json/wc/v3/(products|products/\d+/variations|orders)/?$')
+
+# Yoklamada filtre sayılmayan sayfalama/seçim parametreleri
+PAGING_PARAMS = frozenset(['page', 'per_page', 'offset', 'orderby', 'order', '_fields'])
+
+class ResponseCache:
+    def __init__(self, store, probe_ttl: float = 60.0):
+        """GET yanıtları için koşullu istek önbelleği
+
+        Kayıtlı yanıtı olan isteklere If-None-Match / If-Modified-Since
+        eklenir; 304 yanıtında gövde yerel kayıttan verilir. 'probe'
+        kipinde modified_after destekleyen listelerde (ürünler, varyasyonlar,
+        siparişler) önce aynı filtrelerle iki küçük yoklama yapılır: toplam
+        kayıt sayısı değişmemiş ve sayfanın alındığı zamandan beri
+        değiştirilen kayıt yoksa sayfa hiç istenmeden kayıttan verilir.
+        Yoklama sonucu probe_ttl saniye boyunca aynı listenin bütün
+        sayfaları için kullanılır.
+
+        Args:
+            store: get/put/touch metotlarını sağlayan kalıcı depo
+                (bkz. src.database.http_cache.HttpCacheStore)
+            probe_ttl: Yoklama sonucunun geçerli kaldığı süre (saniye)
+        """
+        self.store = store
+        self.probe_ttl = probe_ttl
+        self.stats = {'not_modified': 0, 'probe_hits': 0, 'misses': 0}
+        self._probes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict]) -> str:
+        """URL ve parametrelerden önbellek anahtarı"""
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return hashlib.sha256(json.dumps([url, items]).encode('utf-8')).hexdigest()
+
+    def lookup(self, url: str, params: Optional[Dict]) -> Optional[Dict]:
+        try:
+            return self.store.get(self.key(url, params))
+        except Exception as e:
+            logger.error(f"HTTP önbelleği okunamadı: {str(e)}")
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def _fetched_at(response: requests.Response) -> datetime:
+        """Yanıtın sunucu saatine göre alınma zamanı (UTC)"""
+        try:
+            date = parsedate_to_datetime(response.headers['Date'])
+            return date.replace(tzinfo=None) - (date.utcoffset() or timedelta(0))
+        except (KeyError, TypeError, ValueError):
+            return datetime.utcnow()
+
+    def save(self, url: str, params: Optional[Dict], response: requests.Response):
+        """200 yanıtını kaydet"""
+        try:
+            self.store.put(self.key(url, params), {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'headers': {h: response.headers[h] for h in CACHED_HEADERS if h in response.headers},
+                'body': response.content,
+                'fetched_at': self._fetched_at(response)
+            })
+        except Exception as e:
+            logger.error(f"HTTP önbelleğine yazılamadı: {str(e)}")
+
+    def not_modified(self, url: str, params: Optional[Dict], entry: Dict,
+                     response: requests.Response) -> requests.Response:
+        """304 yanıtında kayıtlı yanıtı döndür"""
+        try:
+            self.store.touch(self.key(url, params), self._fetched_at(response))
+        except Exception as e:
+            logger.error(f"HTTP önbelleği güncellenemedi: {str(e)}")
+        with self._lock:
+            self.stats['not_modified'] += 1
+        return self.replay(url, entry)
+
+    def miss(self):
+        with self._lock:
+            self.stats['misses'] += 1
+
+    @staticmethod
+    def replay(url: str, entry: Dict) -> requests.Response:
+        """Kayıtlı yanıttan requests.Response oluştur"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+        response._content = entry['body']
+        response.encoding = 'utf-8'
+        response.from_cache = True
+        return response
+
+    def unchanged(self, url: str, params: Optional[Dict], entry: Dict,
+                  fetch: Callable[[Dict], requests.Response]) -> bool:
+        """modified_after yoklamasıyla kayıtlı sayfanın hâlâ geçerli olup olmadığını bul
+
+        Args:
+            url: Liste URL'si
+            params: Sayfa isteğinin parametreleri
+            entry: Sayfanın kayıtlı yanıtı
+            fetch: Aynı URL'ye verilen parametrelerle GET isteği gönderen fonksiyon
+
+        Returns:
+            Sayfa kayıttan verilebilirse True
+        """
+        collection = self._collection(url, params)
+        total = (entry.get('headers') or {}).get('X-WP-Total')
+        if collection is None or total is None or entry.get('fetched_at') is None:
+            return False
+
+        filters, probe_key = collection
+        with self._lock:
+            probe = self._probes.get(probe_key)
+        if (probe is None or time.time() - probe['checked_at'] > self.probe_ttl
+                or probe['since'] > entry['fetched_at']):
+            probe = self._probe(filters, entry['fetched_at'], fetch)
+            if probe is None:
+                return False
+            with self._lock:
+                self._probes[probe_key] = probe
+
+        if probe['changed'] == 0 and probe['total'] == total:
+            with self._lock:
+                self.stats['probe_hits'] += 1
+            return True
+        return False
+
+    def _collection(self, url: str, params: Optional[Dict]) -> Optional[Tuple[Dict, str]]:
+        if not PROBE_COLLECTIONS.search(urlparse(url).path):
+            return None
+        filters = {k: v for k, v in (params or {}).items() if k not in PAGING_PARAMS}
+        return filters, self.key(url, filters)
+
+    @staticmethod
+    def _probe(filters: Dict, fetched_at: datetime, fetch: Callable[[Dict], requests.Response]) -> Optional[Dict]:
+        # Aynı saniyede yapılan değişiklikler kaçmasın diye 1 sn geriden başlanır
+        since = fetched_at - timedelta(seconds=1)
+        probe = dict(filters, per_page=1, _fields='id')
+        try:
+            total = fetch(probe)
+            changed = fetch(dict(probe, modified_after=since.strftime('%Y-%m-%dT%H:%M:%S'), dates_are_gmt='true'))
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Değişiklik yoklaması başarısız: {str(e)}")
+            return None
+        if total.status_code != 200 or changed.status_code != 200:
+            return None
+        return {
+            'checked_at': time.time(),
+            'since': since,
+            'total': total.headers.get('X-WP-Total'),
+            'changed': int(changed.headers.get('X-WP-Total') or 0)
+        }
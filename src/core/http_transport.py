@@ -0,0 +1,220 @@
+import os
+import re
+import time
+import random
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import ResponseCache
+from .rate_limiter import BACKPRESSURE_STATUSES, TokenBucket, get_rate_limiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Tekrar gönderilmesi güvenli (idempotent) HTTP metotları
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+# Tekrar denenecek HTTP durum kodları
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+class HttpTransport:
+    def __init__(self, pool_size: int = 10, connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 max_retries: int = 3, backoff: float = 0.5, rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[ResponseCache] = None):
+        """WooCommerce istemcilerinin ortak HTTP katmanı
+
+        Tek bir requests.Session üzerinden bağlantılar keep-alive ile yeniden
+        kullanılır; her istekte TCP/TLS el sıkışması yapılmaz. Her isteğe
+        bağlantı ve okuma zaman aşımı uygulanır. Idempotent istekler bağlantı
+        hatalarında ve RETRY_STATUSES yanıtlarında rastgele (jitter) eklenen
+        üstel beklemelerle tekrar denenir; POST istekleri tekrarlanmaz.
+        Uç nokta başına istek süreleri tutulur.
+
+        rate_limiter verilirse her deneme öncesi token alınır; 429/503
+        yanıtları ve Retry-After başlığı paylaşılan hızı düşürür ve tekrar
+        beklemesi Retry-After süresinden kısa olmaz.
+
+        cache verilirse cache parametresiyle işaretlenen GET istekleri
+        koşullu gönderilir ve yanıtları saklanır (bkz. ResponseCache).
+
+        Args:
+            pool_size: Sunucu başına havuzdaki en fazla bağlantı
+            connect_timeout: Bağlantı zaman aşımı (saniye)
+            read_timeout: Okuma zaman aşımı (saniye)
+            max_retries: Idempotent istekler için en fazla tekrar sayısı
+            backoff: İlk tekrar için temel bekleme süresi (saniye)
+            rate_limiter: Paylaşılan hız sınırlayıcı
+            cache: Yanıt önbelleği
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._timings: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        """İstatistik anahtarı: API yolundan sonraki kısım, ID'ler {id} ile"""
+        path = urlparse(url).path
+        if '/wp-json/' in path:
+            path = path.split('/wp-json/', 1)[1]
+        return re.sub(r'/\d+(?=/|$)', '/{id}', path)
+
+    def _record(self, method: str, url: str, elapsed: float):
+        key = (method, self._endpoint(url))
+        with self._lock:
+            stats = self._timings.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0})
+            stats['count'] += 1
+            stats['total'] += elapsed
+            stats['max'] = max(stats['max'], elapsed)
+
+    def _retry_delay(self, attempt: int) -> float:
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def request(self, method: str, url: str, cache: Union[bool, str] = False, **kwargs) -> requests.Response:
+        """HTTP isteği gönder
+
+        Args:
+            method: HTTP metodu
+            url: Tam URL
+            cache: GET yanıtı önbellekten doğrulansın mı: True koşullu istek
+                (ETag/Last-Modified), 'probe' ek olarak modified_after
+                yoklaması; önbellek yoksa yok sayılır
+            **kwargs: requests.Session.request parametreleri (timeout verilmezse
+                varsayılan bağlantı/okuma süreleri kullanılır)
+
+        Returns:
+            Son denemenin yanıtı (hata durum kodları için exception fırlatılmaz;
+            önbellekten verilen yanıtlarda from_cache True'dur)
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        if not cache or self.cache is None or method != 'GET':
+            return self._send(method, url, **kwargs)
+
+        params = kwargs.get('params')
+        entry = self.cache.lookup(url, params)
+        if entry is not None:
+            if cache == 'probe' and self.cache.unchanged(
+                    url, params, entry, lambda probe: self._send(method, url, **dict(kwargs, params=probe))):
+                return self.cache.replay(url, entry)
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **self.cache.conditional_headers(entry))
+
+        response = self._send(method, url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            return self.cache.not_modified(url, params, entry, response)
+        if response.status_code == 200:
+            self.cache.miss()
+            self.cache.save(url, params, response)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            start = time.time()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(method, url, time.time() - start)
+                if attempt >= retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"{method} {self._endpoint(url)} başarısız ({str(e)}), {delay:.1f} sn sonra tekrar denenecek")
+            else:
+                self._record(method, url, time.time() - start)
+                retry_after = response.headers.get('Retry-After')
+                if self.rate_limiter:
+                    self.rate_limiter.on_response(response.status_code, retry_after)
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                delay = self._retry_delay(attempt)
+                if response.status_code in BACKPRESSURE_STATUSES:
+                    delay = max(delay, parse_retry_after(retry_after) or 0.0)
+                logger.warning(f"{method} {self._endpoint(url)} HTTP {response.status_code}, {delay:.1f} sn sonra tekrar denenecek")
+            attempt += 1
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Uç nokta başına istek sayısı, ortalama ve en uzun süre"""
+        with self._lock:
+            return {
+                f"{method} {endpoint}": {
+                    'count': int(stats['count']),
+                    'avg': stats['total'] / stats['count'],
+                    'max': stats['max']
+                }
+                for (method, endpoint), stats in self._timings.items()
+            }
+
+    def log_timings(self):
+        """Uç nokta sürelerini ve önbellek isabetlerini logla"""
+        for endpoint, stats in sorted(self.timings().items()):
+            logger.info(f"{endpoint}: {stats['count']} istek, ortalama {stats['avg']:.2f} sn, en uzun {stats['max']:.2f} sn")
+        if self.cache is not None:
+            stats = self.cache.stats
+            logger.info(f"HTTP önbelleği: {stats['not_modified']} 304, {stats['probe_hits']} yoklama isabeti, "
+                        f"{stats['misses']} tam yanıt")
+
+    def close(self):
+        self.session.close()
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+def woo_rate_limiter() -> TokenBucket:
+    """WooCommerce istemcilerinin paylaştığı hız sınırlayıcı (WOO_RATE_LIMIT istek/sn, varsayılan 10)"""
+    return get_rate_limiter('woocommerce', rate=float(os.getenv('WOO_RATE_LIMIT', '10')))
+
+def get_transport() -> HttpTransport:
+    """Süreç genelinde paylaşılan HTTP katmanını getir
+
+    Ayarlar ortam değişkenlerinden okunur: WOO_HTTP_POOL_SIZE,
+    WOO_HTTP_CONNECT_TIMEOUT, WOO_HTTP_READ_TIMEOUT, WOO_HTTP_RETRIES,
+    WOO_RATE_LIMIT, WOO_HTTP_CACHE (0 ise önbellek kapalı),
+    WOO_HTTP_CACHE_PROBE_TTL.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            cache = None
+            if os.getenv('WOO_HTTP_CACHE', '1') != '0':
+                from src.database.http_cache import HttpCacheStore
+                cache = ResponseCache(HttpCacheStore(),
+                                      probe_ttl=float(os.getenv('WOO_HTTP_CACHE_PROBE_TTL', '60')))
+            _transport = HttpTransport(
+                pool_size=int(os.getenv('WOO_HTTP_POOL_SIZE', '10')),
+                connect_timeout=float(os.getenv('WOO_HTTP_CONNECT_TIMEOUT', '5')),
+                read_timeout=float(os.getenv('WOO_HTTP_READ_TIMEOUT', '60')),
+                max_retries=int(os.getenv('WOO_HTTP_RETRIES', '3')),
+                rate_limiter=woo_rate_limiter(),
+                cache=cache
+            )
+        return _transport
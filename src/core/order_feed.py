@@ -0,0 +1,119 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from src.database.sync_state import get_sync_state, set_sync_state
+from .woo_fields import with_fields
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+class OrderFeed:
+    STATE_KEY = 'woo_orders.modified_after'
+
+    def __init__(self, fetch: Callable[[Dict], requests.Response], status: str = 'processing',
+                 per_page: int = 100, workers: Optional[int] = None, overlap: int = 60,
+                 state_key: str = STATE_KEY):
+        """modified_after watermark'ı ile sayfalanan WooCommerce sipariş akışı
+
+        Son başarılı turdan bu yana değişen siparişler sayfa sayfa okunur.
+        İlk sayfanın X-WP-TotalPages başlığından sayfa sayısı alınır, kalan
+        sayfalar eşzamanlı istenir ve sırayla döndürülür. Sıralama sipariş
+        ID'sine göre yapıldığından tur sırasında değişen siparişler sayfa
+        kaymasıyla atlanmaz; en fazla iki kez okunur.
+
+        Yeni watermark ilk yanıtın sunucu saatinden overlap saniye geri
+        alınır ve commit çağrılana kadar kalıcı yazılmaz. İlk çalıştırmada
+        (watermark yokken) durumdaki tüm siparişler okunur.
+
+        Args:
+            fetch: Verilen parametrelerle orders listesine GET isteği gönderen fonksiyon
+            status: Okunacak sipariş durumu
+            per_page: Sayfa başına sipariş (WooCommerce sınırı 100)
+            workers: Eşzamanlı sayfa isteği (None ise WOO_ORDER_PAGE_WORKERS, varsayılan 4)
+            overlap: Saat farkı ve geç kaydedilen değişiklikler için geri kayma (saniye)
+            state_key: sync.db'deki watermark anahtarı
+        """
+        self.fetch = fetch
+        self.status = status
+        self.per_page = min(per_page, 100)
+        self.workers = max(1, workers or int(os.getenv('WOO_ORDER_PAGE_WORKERS', '4')))
+        self.overlap = overlap
+        self.state_key = state_key
+        self.pending_watermark = None
+
+    def get_watermark(self) -> Optional[str]:
+        """Kalıcı watermark değerini getir (GMT, ISO 8601)"""
+        return get_sync_state(self.state_key)
+
+    def _params(self, page: int, watermark: Optional[str]) -> Dict:
+        params = {
+            'status': self.status,
+            'per_page': self.per_page,
+            'page': page,
+            'orderby': 'id',
+            'order': 'asc'
+        }
+        if watermark:
+            params['modified_after'] = watermark
+            params['dates_are_gmt'] = 'true'
+        return with_fields(params, 'order')
+
+    def _get_page(self, page: int, watermark: Optional[str]) -> requests.Response:
+        response = self.fetch(self._params(page, watermark))
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _server_time(response: requests.Response) -> datetime:
+        """Yanıtın sunucu saati (UTC)"""
+        try:
+            date = parsedate_to_datetime(response.headers['Date'])
+            return date.replace(tzinfo=None) - (date.utcoffset() or timedelta(0))
+        except (KeyError, TypeError, ValueError):
+            return datetime.utcnow()
+
+    def pages(self) -> Iterator[List[Dict]]:
+        """Değişen siparişleri sayfa sayfa getir
+
+        Tüm sayfalar okunduğunda pending_watermark hazırlanır; sayfalar
+        işlendikten sonra commit ile kalıcı yazılmalıdır.
+
+        Yields:
+            Sayfadaki siparişler
+        """
+        watermark = self.get_watermark()
+        self.pending_watermark = None
+
+        first = self._get_page(1, watermark)
+        started_at = self._server_time(first)
+        total_pages = int(first.headers.get('X-WP-TotalPages') or 1)
+        logger.info(f"Sipariş akışı ({self.status}, {watermark or 'başlangıç'} sonrası): "
+                    f"{first.headers.get('X-WP-Total', '?')} sipariş, {total_pages} sayfa")
+
+        yield first.json()
+
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, total_pages - 1),
+                                    thread_name_prefix='woo-orders') as executor:
+                for response in executor.map(lambda page: self._get_page(page, watermark),
+                                             range(2, total_pages + 1)):
+                    yield response.json()
+
+        self.pending_watermark = (started_at - timedelta(seconds=self.overlap)).strftime(WATERMARK_FORMAT)
+
+    def commit(self):
+        """Okunan siparişleri kalıcı olarak işaretle
+
+        Yalnızca sayfalardaki siparişler başarıyla işlendikten sonra
+        çağrılmalı; aksi halde aynı aralık bir sonraki turda tekrar okunur.
+        """
+        if self.pending_watermark is not None:
+            set_sync_state(self.state_key, self.pending_watermark)
+            self.pending_watermark = None
@@ -0,0 +1,128 @@
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Sunucunun yavaşlama istediğini bildiren durum kodları
+BACKPRESSURE_STATUSES = frozenset([429, 503])
+
+def parse_retry_after(value: Optional[Union[str, int, float]]) -> Optional[float]:
+    """Retry-After başlığını saniyeye çevir (saniye veya HTTP tarihi)"""
+    if value in (None, ''):
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: Optional[float] = None,
+                 backoff_factor: float = 0.5, recovery_step: float = 0.05):
+        """Paylaşılabilir token bucket hız sınırlayıcı
+
+        Kova saniyede rate token ile dolar, en fazla capacity token birikir;
+        her istek bir token harcar. 429/503 yanıtlarında hız backoff_factor
+        ile çarpılarak düşürülür ve Retry-After süresi boyunca hiç istek
+        gönderilmez. Sonraki her başarılı yanıtta hız, temel hızın
+        recovery_step kadarı artırılarak kademeli olarak geri kazanılır.
+
+        İş parçacıkları acquire, coroutine'ler acquire_async kullanır; kilit
+        yalnızca hesaplama sırasında tutulur, bekleme kilit dışında yapılır.
+
+        Args:
+            rate: Saniyedeki istek sayısı
+            capacity: Kova kapasitesi (None ise rate, en az 1)
+            min_rate: Geri basınçta düşülebilecek en düşük hız
+            backoff_factor: Geri basınçta hız çarpanı
+            recovery_step: Başarılı yanıt başına temel hızın geri kazanılan oranı
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.min_rate = min_rate or rate / 20
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Token ayır ve beklenmesi gereken süreyi döndür"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, tokens: float = 1):
+        """Token alınana kadar bekle (iş parçacığı güvenli)"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """Token alınana kadar bekle (olay döngüsünü bloklamaz)"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_response(self, status_code: int, retry_after: Optional[Union[str, int, float]] = None):
+        """Yanıt durumuna göre hızı ayarla
+
+        Args:
+            status_code: HTTP durum kodu
+            retry_after: Retry-After başlığının değeri
+        """
+        if status_code in BACKPRESSURE_STATUSES:
+            self.slow_down(parse_retry_after(retry_after))
+        elif status_code < 400:
+            self._recover()
+
+    def slow_down(self, retry_after: Optional[float] = None):
+        """Hızı düşür; retry_after verilirse o süre boyunca istek gönderme"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            rate = self.rate
+        logger.warning(f"Sunucu yavaşlama istedi, hız {rate:.2f} istek/sn"
+                       + (f", {retry_after:.1f} sn bekleniyor" if retry_after else ""))
+
+    def _recover(self):
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * self.recovery_step)
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, rate: float, capacity: Optional[float] = None) -> TokenBucket:
+    """Ada göre paylaşılan hız sınırlayıcıyı getir
+
+    Aynı adla oluşturulan tüm istemciler aynı kovayı kullanır; sınırlayıcı
+    ilk çağrıdaki ayarlarla oluşturulur.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = TokenBucket(rate, capacity)
+        return limiter
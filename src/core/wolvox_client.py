@@ -1,17 +1,23 @@
-import fdb
 from sqlalchemy import create_engine
 from config.settings import Settings
 from utils.logger import setup_logger
+from wolvox.connection_pool import get_pool
+from wolvox.product import WolvoxProduct
+from wolvox.stock_ledger import get_stock_ledger
 
 class WolvoxClient:
     def __init__(self):
         self.settings = Settings()
         self.logger = setup_logger("wolvox_client")
-        self.connection = None
+        self.pool = None
         self.connect()
     
     def connect(self):
-        """Veritabanı bağlantısını kur"""
+        """Veritabanı bağlantı havuzunu hazırla
+
+        Bağlantı burada tutulmaz; her sorgu havuzdan bağlantı alıp iş
+        bitince iade eder.
+        """
         try:
             # Bağlantı bilgileri
             host = self.settings.get("wolvox.host", "localhost")
@@ -19,8 +25,7 @@ class WolvoxClient:
             user = self.settings.get("wolvox.user", "SYSDBA")
             password = self.settings.get("wolvox.password", "masterkey")
             
-            # Bağlantı kur
-            self.connection = fdb.connect(
+            self.pool = get_pool(
                 host=host,
                 database=database,
                 user=user,
@@ -28,43 +33,72 @@ class WolvoxClient:
                 charset="UTF8"
             )
             
-            self.logger.info("Wolvox veritabanı bağlantısı başarıyla kuruldu")
+            self.logger.info("Wolvox veritabanı bağlantı havuzu hazır")
             
         except Exception as e:
             self.logger.error(f"Wolvox veritabanı bağlantısı kurulamadı: {str(e)}")
             raise
     
     def disconnect(self):
-        """Veritabanı bağlantısını kapat"""
-        if self.connection:
-            try:
-                self.connection.close()
-                self.connection = None
-            except Exception as e:
-                self.logger.error(f"Bağlantı kapatılırken hata: {str(e)}")
+        """Havuz referansını bırak (bağlantılar sorgu sonunda zaten iade edilir)"""
+        self.pool = None
     
     def execute_query(self, query, params=None):
-        """SQL sorgusu çalıştır"""
+        """SQL sorgusu çalıştır
+
+        Bağlantı sorgu süresince havuzdan alınır; sonuçlar okunduktan
+        sonra iade edilir.
+
+        Returns:
+            Sonuç satırlarının listesi, hata durumunda None
+        """
         try:
-            if not self.connection:
+            if not self.pool:
                 self.connect()
             
             # Sorguyu çalıştır
-            cursor = self.connection.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            
-            return cursor
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                    return cursor.fetchall()
+                finally:
+                    cursor.close()
             
         except Exception as e:
             self.logger.error(f"Sorgu çalıştırılırken hata: {str(e)}")
             return None
     
+    def get_warehouse_balances(self):
+        """Depo bazlı stok bakiyelerini sync.db stok defterinden getir
+
+        Returns:
+            {BLSTKODU: {DEPO_ADI: KALAN_MIKTAR}} sözlüğü
+        """
+        try:
+            return get_stock_ledger(self.pool).get_depot_balances()
+        except Exception as e:
+            self.logger.error(f"Depo bakiyeleri alınırken hata: {str(e)}")
+            return {}
+    
     def get_products(self):
         """Ürünleri getir"""
         try:
+            # Aktif depolar (sıralı)
+            depo_rows = self.execute_query("""
+                SELECT d.DEPO_ADI
+                FROM DEPO d
+                WHERE d.AKTIF = 1
+                ORDER BY d.DEPO_ADI
+            """)
+            depolar = [row[0].strip() for row in depo_rows] if depo_rows else []
+            
+            # Depo bakiyeleri stok defterinden tek seferde alınıp bellekte ürünlere dağıtılır
+            balances = self.get_warehouse_balances()
+            
             # Ana sorgu
             query = """
                 SELECT 
@@ -88,60 +122,37 @@ class WolvoxClient:
             """
             
             # Sorguyu çalıştır
-            cursor = self.execute_query(query)
-            if not cursor:
+            rows = self.execute_query(query)
+            if not rows:
                 return []
             
             # Sonuçları dön
             products = []
             seen_skus = set()  # Yinelenen ürünleri kontrol etmek için
+            build = WolvoxProduct.row_factory((
+                'stok_kodu', 'stok_adi', 'barkod', 'satis_fiyati', 'kdv_dahil_fiyat',
+                'kdv_orani', 'marka', 'kategori', 'alt_kategori', 'blkodu'
+            ))
             
-            for row in cursor:
-                sku = row[0]
-                if sku in seen_skus:
+            for row in rows:
+                product = build(row)
+                if product.stok_kodu in seen_skus:
                     continue
                     
-                seen_skus.add(sku)
+                seen_skus.add(product.stok_kodu)
                 
                 # Depo bazlı stok miktarları
-                depo_query = """
-                    SELECT 
-                        d.DEPO_ADI,
-                        CAST((SELECT -COALESCE(SUM(
-                            CASE 
-                                WHEN sh.TUTAR_TURU = 0 THEN sh.MIKTARI 
-                                ELSE -sh.MIKTARI 
-                            END), 0)
-                        FROM STOKHR sh 
-                        WHERE sh.DEPO_ADI = d.DEPO_ADI 
-                        AND sh.BLSTKODU = ?
-                        AND sh.SILINDI = 0) AS DECIMAL(15,2)) as KALAN_MIKTAR
-                    FROM DEPO d
-                    WHERE d.AKTIF = 1
-                    ORDER BY d.DEPO_ADI
-                """
-                depo_cursor = self.execute_query(depo_query, (row[9],))
+                product_balances = balances.get(product.blkodu, {})
                 depo_miktarlar = []
                 toplam_stok = 0
-                if depo_cursor:
-                    for depo in depo_cursor:
-                        if float(depo[1] or 0) != 0:
-                            depo_miktarlar.append(f"{depo[0]}: {float(depo[1] or 0):.2f}")
-                            toplam_stok += float(depo[1] or 0)
+                for depo_adi in depolar:
+                    miktar = product_balances.get(depo_adi, 0)
+                    if miktar != 0:
+                        depo_miktarlar.append(f"{depo_adi}: {miktar:.2f}")
+                        toplam_stok += miktar
                 
-                product = {
-                    "sku": sku,
-                    "name": row[1],
-                    "barcode": row[2],
-                    "price": float(row[3] or 0),
-                    "price_with_tax": float(row[4] or 0),
-                    "tax_rate": float(row[5] or 0),
-                    "brand": row[6],
-                    "category": row[7],
-                    "subcategory": row[8],
-                    "stock": toplam_stok,
-                    "warehouse_distribution": ", ".join(depo_miktarlar)
-                }
+                product.bakiye = toplam_stok
+                product.depo_dagilimi = ", ".join(depo_miktarlar)
                 products.append(product)
             
             return products
@@ -168,22 +179,21 @@ class WolvoxClient:
             WHERE STK.STK_KOD = ?
         """
         
-        cursor = self.execute_query(query, (product_code,))
-        if cursor:
-            row = cursor.fetchone()
-            if row:
-                return {
-                    "code": row[0],
-                    "name": row[1],
-                    "price1": float(row[2] or 0),
-                    "price2": float(row[3] or 0),
-                    "vat": float(row[4] or 0),
-                    "unit": row[5],
-                    "description": row[6],
-                    "category_code": row[7],
-                    "is_active": bool(row[8]),
-                    "stock": float(row[9] or 0)
-                }
+        rows = self.execute_query(query, (product_code,))
+        if rows:
+            row = rows[0]
+            return {
+                "code": row[0],
+                "name": row[1],
+                "price1": float(row[2] or 0),
+                "price2": float(row[3] or 0),
+                "vat": float(row[4] or 0),
+                "unit": row[5],
+                "description": row[6],
+                "category_code": row[7],
+                "is_active": bool(row[8]),
+                "stock": float(row[9] or 0)
+            }
         return None
     
     def get_categories(self):
@@ -197,10 +207,10 @@ class WolvoxClient:
             ORDER BY GRP.GRUP_KOD
         """
         
-        cursor = self.execute_query(query)
-        if cursor:
+        rows = self.execute_query(query)
+        if rows is not None:
             categories = []
-            for row in cursor:
+            for row in rows:
                 categories.append({
                     "code": row[0],
                     "name": row[1],
@@ -220,15 +230,14 @@ class WolvoxClient:
             WHERE GRP.GRUP_KOD = ?
         """
         
-        cursor = self.execute_query(query, (category_code,))
-        if cursor:
-            row = cursor.fetchone()
-            if row:
-                return {
-                    "code": row[0],
-                    "name": row[1],
-                    "parent_code": row[2]
-                }
+        rows = self.execute_query(query, (category_code,))
+        if rows:
+            row = rows[0]
+            return {
+                "code": row[0],
+                "name": row[1],
+                "parent_code": row[2]
+            }
         return None
     
     def get_tables(self):
@@ -242,12 +251,12 @@ class WolvoxClient:
                 ORDER BY RDB$RELATION_NAME
             """
             
-            cursor = self.execute_query(query)
-            if not cursor:
+            rows = self.execute_query(query)
+            if not rows:
                 return []
             
             tables = []
-            for row in cursor:
+            for row in rows:
                 tables.append(row[0].strip())
             
             return tables
@@ -260,8 +269,8 @@ class WolvoxClient:
         """Wolvox veritabanı bağlantısını test et"""
         try:
             # Test sorgusu çalıştır
-            cursor = self.execute_query("SELECT 1 FROM RDB$DATABASE")
-            if cursor:
+            rows = self.execute_query("SELECT 1 FROM RDB$DATABASE")
+            if rows:
                 self.logger.info("Wolvox bağlantı testi başarılı")
                 return True
             
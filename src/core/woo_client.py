@@ -1,6 +1,8 @@
 from woocommerce import API
 from config.settings import Settings
 from utils.logger import setup_logger
+from .http_transport import get_transport
+from .woo_fields import with_fields
 
 class WooClient:
     def __init__(self):
@@ -23,19 +25,29 @@ class WooClient:
             verify=False,  # SSL sertifikası olmayan siteler için
             timeout=30
         )
+        
+        # Katalog taramaları önbellekli ortak HTTP katmanından yapılır
+        self.api_url = f"{url.rstrip('/')}/wp-json/{self.settings.get('woo.version', 'wc/v3')}"
+        self.auth = (self.settings.get("woo.key"), self.settings.get("woo.secret"))
     
-    def get_products(self):
-        """Ürünleri getir"""
+    def get_products(self, fields='full'):
+        """Ürünleri getir
+
+        Args:
+            fields: WooCommerce _fields seçimi ('index', 'stock_price', 'full'
+                ya da alan adları listesi); dönüşümde olmayan alanlar boş kalır
+        """
         try:
             self.logger.info("WooCommerce'den ürünler getiriliyor...")
             
             # WooCommerce'den ürünleri getir
-            response = self.client.get("products", params={
+            # Katalog değişmediyse yanıt yerel önbellekten verilir
+            response = get_transport().get(f"{self.api_url}/products", auth=self.auth, verify=False, params=with_fields({
                 "per_page": 100,
                 "status": "publish",  # Sadece yayınlanmış ürünler
                 "orderby": "date",    # Tarihe göre sırala
                 "order": "desc"       # Yeniden eskiye
-            })
+            }, fields), cache='probe')
             
             self.logger.info(f"WooCommerce yanıt kodu: {response.status_code}")
             self.logger.info(f"WooCommerce yanıt başlıkları: {response.headers}")
@@ -76,15 +88,15 @@ class WooClient:
                     item = {
                         "id": product["id"],
                         "sku": sku,
-                        "name": product["name"],
+                        "name": product.get("name", ""),
                         "price": float(product.get("price", 0) or 0),
                         "stock": int(product.get("stock_quantity", 0) or 0),
-                        "status": product["status"],
+                        "status": product.get("status", ""),
                         "description": product.get("description", ""),
                         "short_description": product.get("short_description", ""),
                         "category": ", ".join([cat["name"] for cat in product.get("categories", [])]),
                         "tags": ", ".join([tag["name"] for tag in product.get("tags", [])]),
-                        "visibility": "Görünür" if product["status"] == "publish" else "Gizli"
+                        "visibility": "Görünür" if product.get("status") == "publish" else "Gizli"
                     }
                     result.append(item)
                 except Exception as e:
@@ -0,0 +1,52 @@
+from typing import Dict, Optional, Sequence, Union
+
+# Ürün ID eşleştirmesi için gereken alanlar (SKU -> ürün/varyasyon ID)
+INDEX_FIELDS = ('id', 'sku', 'type', 'parent_id')
+
+# Stok/fiyat karşılaştırması ve listeleme ekranları için gereken alanlar
+STOCK_PRICE_FIELDS = INDEX_FIELDS + (
+    'name', 'status', 'price', 'regular_price', 'sale_price',
+    'manage_stock', 'stock_quantity', 'stock_status'
+)
+
+# Kategori ağacı için gereken alanlar
+CATEGORY_FIELDS = ('id', 'name', 'parent')
+
+# Sipariş aktarımı için gereken alanlar
+ORDER_FIELDS = ('id', 'status', 'date_created', 'date_modified_gmt', 'total', 'billing', 'line_items')
+
+FIELD_PRESETS = {
+    'index': INDEX_FIELDS,
+    'stock_price': STOCK_PRICE_FIELDS,
+    'category': CATEGORY_FIELDS,
+    'order': ORDER_FIELDS,
+    'full': None
+}
+
+Fields = Union[str, Sequence[str], None]
+
+def fields_param(fields: Fields) -> Optional[str]:
+    """Alan seçimini WooCommerce _fields parametresine çevir
+
+    Args:
+        fields: Hazır seçim adı ('index', 'stock_price', 'category', 'order', 'full'),
+            alan adları listesi ya da None (tüm alanlar)
+
+    Returns:
+        Virgülle ayrılmış alan listesi; tüm alanlar isteniyorsa None
+    """
+    if isinstance(fields, str):
+        if fields not in FIELD_PRESETS:
+            raise ValueError(f"Bilinmeyen alan seçimi: {fields}")
+        fields = FIELD_PRESETS[fields]
+    if not fields:
+        return None
+    return ','.join(fields)
+
+def with_fields(params: Optional[Dict], fields: Fields) -> Dict:
+    """İstek parametrelerine _fields ekle (tüm alanlar isteniyorsa eklenmez)"""
+    params = dict(params or {})
+    projection = fields_param(fields)
+    if projection:
+        params['_fields'] = projection
+    return params
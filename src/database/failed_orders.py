@@ -0,0 +1,84 @@
+import os
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from .connection import DatabaseManager
+from .models import FailedOrder
+
+logger = logging.getLogger(__name__)
+
+class FailedOrderStore:
+    def __init__(self, max_attempts: Optional[int] = None):
+        """sync.db içindeki aktarılamayan WooCommerce siparişleri
+
+        Her başarısız turda siparişin deneme sayısı artırılır; max_attempts
+        denemeye ulaşan sipariş karantinaya alınır ve sipariş watermark'ını
+        artık tutmaz. Karantinadaki sipariş WooCommerce'de değiştirilip
+        akışta tekrar görünürse yeniden denenir; aktarıldığında kaydı silinir.
+
+        Args:
+            max_attempts: Karantinadan önceki deneme sayısı (None ise
+                WOO_ORDER_MAX_ATTEMPTS, varsayılan 3)
+        """
+        self.db = DatabaseManager()
+        self.max_attempts = max(1, max_attempts or int(os.getenv('WOO_ORDER_MAX_ATTEMPTS', '3')))
+
+    def record_failures(self, errors: Dict[int, str]) -> Set[int]:
+        """Başarısız siparişlerin deneme sayılarını artır
+
+        Args:
+            errors: {sipariş ID: hata mesajı}
+
+        Returns:
+            Karantinadaki sipariş ID'leri (bu turda alınanlar dahil)
+        """
+        quarantined = set()
+        if not errors:
+            return quarantined
+
+        ids = list(errors)
+        now = datetime.now()
+        with self.db.session_scope() as session:
+            rows = {}
+            for i in range(0, len(ids), 500):
+                for row in session.query(FailedOrder).filter(FailedOrder.order_id.in_(ids[i:i + 500])).all():
+                    rows[row.order_id] = row
+            for order_id, error in errors.items():
+                row = rows.get(order_id)
+                if row is None:
+                    row = FailedOrder(order_id=order_id, attempts=0, first_failed_at=now)
+                    session.add(row)
+                row.attempts = (row.attempts or 0) + 1
+                row.last_error = error
+                row.last_failed_at = now
+                if row.attempts >= self.max_attempts:
+                    if not row.quarantined:
+                        logger.error(f"Sipariş karantinaya alındı ({order_id}, {row.attempts} deneme): {error}")
+                    row.quarantined = True
+                    quarantined.add(order_id)
+        return quarantined
+
+    def clear(self, order_ids: Iterable[int]):
+        """Aktarılan siparişlerin kayıtlarını sil"""
+        ids = list(order_ids)
+        with self.db.session_scope() as session:
+            for i in range(0, len(ids), 500):
+                session.query(FailedOrder).filter(
+                    FailedOrder.order_id.in_(ids[i:i + 500])
+                ).delete(synchronize_session=False)
+
+    def quarantined(self) -> List[Dict]:
+        """Karantinadaki siparişler (senkronizasyon durumu için)"""
+        with self.db.session_scope() as session:
+            return [
+                {
+                    'order_id': row.order_id,
+                    'attempts': row.attempts,
+                    'last_error': row.last_error,
+                    'last_failed_at': row.last_failed_at.isoformat() if row.last_failed_at else None
+                }
+                for row in session.query(FailedOrder).filter(FailedOrder.quarantined.is_(True)).order_by(
+                    FailedOrder.order_id
+                ).all()
+            ]
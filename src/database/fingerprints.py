@@ -0,0 +1,123 @@
+import json
+import hashlib
+import threading
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from .connection import DatabaseManager
+from .models import ProductFingerprint
+
+def _normalize(value: Any) -> Any:
+    """Aynı içerikli yüklerin aynı özeti vermesi için değeri sadeleştir"""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, Decimal):
+        value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def payload_hash(payload: Dict) -> str:
+    """WooCommerce ürün yükünün kararlı SHA-256 özeti
+
+    Anahtar sırası, metin kenar boşlukları ve 5 / 5.0 gibi sayı yazımları
+    özeti değiştirmez.
+    """
+    normalized = json.dumps(_normalize(payload), sort_keys=True, ensure_ascii=False,
+                            separators=(',', ':'), default=str)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+class FingerprintStore:
+    def __init__(self):
+        """sync.db içindeki SKU bazlı ürün yükü özetleri
+
+        Her SKU için son gönderilen yükün özeti, WooCommerce ürün ID'si ve
+        gönderim zamanı saklanır. Özetler ilk kullanımda tek sorguyla belleğe
+        alınır. save ile yapılan kayıtlar bellekte tutulur ve commit ile tek
+        işlemde yazılır.
+        """
+        self.db = DatabaseManager()
+        self._entries: Optional[Dict[str, Tuple[str, Optional[int]]]] = None
+        self._dirty: Dict[str, Tuple[str, Optional[int], datetime]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Tuple[str, Optional[int]]]:
+        if self._entries is None:
+            with self.db.session_scope() as session:
+                self._entries = {
+                    sku: (digest, woo_id)
+                    for sku, digest, woo_id in session.query(
+                        ProductFingerprint.sku,
+                        ProductFingerprint.payload_hash,
+                        ProductFingerprint.woo_id
+                    ).all()
+                }
+        return self._entries
+
+    def matches(self, sku: str, fingerprint: str) -> bool:
+        """Yük son gönderilenle aynı mı"""
+        entry = self._load().get(sku)
+        return entry is not None and entry[0] == fingerprint
+
+    def get_woo_id(self, sku: str) -> Optional[int]:
+        """Son gönderimde kaydedilen WooCommerce ürün ID'si"""
+        entry = self._load().get(sku)
+        return entry[1] if entry else None
+
+    def save(self, sku: str, fingerprint: str, woo_id: Optional[int] = None):
+        """Başarılı gönderimden sonra özeti kaydet (commit ile yazılır)
+
+        Args:
+            sku: Ürün stok kodu
+            fingerprint: payload_hash ile hesaplanan özet
+            woo_id: WooCommerce ürün ID'si
+        """
+        entries = self._load()
+        with self._lock:
+            if woo_id is None:
+                woo_id = (entries.get(sku) or (None, None))[1]
+            entries[sku] = (fingerprint, woo_id)
+            self._dirty[sku] = (fingerprint, woo_id, datetime.now())
+
+    def commit(self) -> int:
+        """Bekleyen kayıtları tek işlemde yaz
+
+        Returns:
+            Yazılan SKU sayısı
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return 0
+
+        skus = list(dirty)
+        with self.db.session_scope() as session:
+            rows = {}
+            for i in range(0, len(skus), 500):
+                for row in session.query(ProductFingerprint).filter(
+                    ProductFingerprint.sku.in_(skus[i:i + 500])
+                ).all():
+                    rows[row.sku] = row
+            for sku, (fingerprint, woo_id, pushed_at) in dirty.items():
+                row = rows.get(sku)
+                if row is None:
+                    row = ProductFingerprint(sku=sku)
+                    session.add(row)
+                row.payload_hash = fingerprint
+                if woo_id is not None:
+                    row.woo_id = woo_id
+                row.pushed_at = pushed_at
+        return len(dirty)
+
+    def forget(self, sku: str):
+        """SKU'nun özetini sil (bir sonraki senkronizasyonda yeniden gönderilir)"""
+        self._load().pop(sku, None)
+        with self._lock:
+            self._dirty.pop(sku, None)
+        with self.db.session_scope() as session:
+            session.query(ProductFingerprint).filter_by(sku=sku).delete(synchronize_session=False)
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from .connection import DatabaseManager
+from .models import HttpCacheEntry
+
+class HttpCacheStore:
+    def __init__(self):
+        """sync.db içindeki HTTP yanıt önbelleği
+
+        Her URL + parametre anahtarı için son 200 yanıtının gövdesi, seçili
+        başlıkları (ETag, Last-Modified, X-WP-Total...) ve alındığı zaman
+        saklanır.
+        """
+        self.db = DatabaseManager()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Anahtarın kayıtlı yanıtını getir"""
+        with self.db.session_scope() as session:
+            row = session.query(HttpCacheEntry).filter_by(key=key).first()
+            if row is None:
+                return None
+            return {
+                'url': row.url,
+                'etag': row.etag,
+                'last_modified': row.last_modified,
+                'headers': row.headers or {},
+                'body': row.body,
+                'fetched_at': row.fetched_at
+            }
+
+    def put(self, key: str, entry: Dict):
+        """Yanıtı kaydet (aynı anahtardaki eski yanıtın yerine)"""
+        with self.db.session_scope() as session:
+            row = session.query(HttpCacheEntry).filter_by(key=key).first()
+            if row is None:
+                row = HttpCacheEntry(key=key)
+                session.add(row)
+            row.url = entry['url']
+            row.etag = entry.get('etag')
+            row.last_modified = entry.get('last_modified')
+            row.headers = entry.get('headers') or {}
+            row.body = entry['body']
+            row.fetched_at = entry.get('fetched_at') or datetime.utcnow()
+
+    def touch(self, key: str, fetched_at: datetime):
+        """304 yanıtından sonra kaydın alınma zamanını güncelle"""
+        with self.db.session_scope() as session:
+            session.query(HttpCacheEntry).filter_by(key=key).update(
+                {'fetched_at': fetched_at}, synchronize_session=False
+            )
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        with self.db.session_scope() as session:
+            session.query(HttpCacheEntry).delete(synchronize_session=False)
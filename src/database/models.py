@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Table
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, LargeBinary, Table, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -158,3 +158,75 @@ class ActivityLog(Base):
     ip_address = Column(String)
     user_agent = Column(String)
     created_at = Column(DateTime, default=func.now())
+
+class SyncState(Base):
+    __tablename__ = 'sync_state'
+    
+    id = Column(Integer, primary_key=True)
+    key = Column(String, unique=True)
+    value = Column(JSON)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class StockBalance(Base):
+    __tablename__ = 'stock_balances'
+    __table_args__ = (UniqueConstraint('blstkodu', 'depo_adi'),)
+    
+    id = Column(Integer, primary_key=True)
+    blstkodu = Column(Integer, index=True)
+    stok_kodu = Column(String(100), index=True)
+    depo_adi = Column(String)
+    miktar = Column(Float)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class ProductFingerprint(Base):
+    __tablename__ = 'product_fingerprints'
+    
+    id = Column(Integer, primary_key=True)
+    sku = Column(String(100), unique=True)
+    payload_hash = Column(String(64))
+    woo_id = Column(Integer)
+    pushed_at = Column(DateTime, default=func.now())
+
+class PushedStockPrice(Base):
+    __tablename__ = 'pushed_stock_prices'
+    
+    id = Column(Integer, primary_key=True)
+    sku = Column(String(100), unique=True)
+    regular_price = Column(String(50))
+    stock_quantity = Column(Integer)
+    stock_status = Column(String(20))
+    pushed_at = Column(DateTime, default=func.now())
+
+class WooProductIndex(Base):
+    __tablename__ = 'woo_product_index'
+    
+    id = Column(Integer, primary_key=True)
+    sku = Column(String(100), unique=True)
+    product_id = Column(Integer)
+    variation_id = Column(Integer)
+    parent_id = Column(Integer)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class FailedOrder(Base):
+    __tablename__ = 'failed_orders'
+    
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, unique=True)
+    attempts = Column(Integer, default=0)
+    last_error = Column(String)
+    quarantined = Column(Boolean, default=False)
+    first_failed_at = Column(DateTime, default=func.now())
+    last_failed_at = Column(DateTime, default=func.now())
+
+class HttpCacheEntry(Base):
+    __tablename__ = 'http_cache'
+    
+    id = Column(Integer, primary_key=True)
+    key = Column(String(64), unique=True)
+    url = Column(String)
+    etag = Column(String)
+    last_modified = Column(String)
+    headers = Column(JSON)
+    body = Column(LargeBinary)
+    fetched_at = Column(DateTime)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
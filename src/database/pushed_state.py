@@ -0,0 +1,121 @@
+import threading
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+
+from .connection import DatabaseManager
+from .models import PushedStockPrice
+
+# Hızlı şeritte karşılaştırılan WooCommerce alanları
+STOCK_PRICE_FIELDS = ('regular_price', 'stock_quantity', 'stock_status')
+
+def _format_price(price: Any) -> str:
+    """Fiyatı WooCommerce'in döndürdüğü biçime getir (100.0 -> '100', 99.90 -> '99.9')"""
+    if price is None or price == '':
+        return ''
+    try:
+        return format(Decimal(str(price)).normalize(), 'f')
+    except InvalidOperation:
+        return str(price)
+
+def stock_price_values(price: Any, quantity: Any) -> Dict[str, Any]:
+    """Wolvox fiyat ve bakiyesinden WooCommerce stok/fiyat alanları"""
+    quantity = int(quantity or 0)
+    return {
+        'regular_price': _format_price(price),
+        'stock_quantity': quantity,
+        'stock_status': 'instock' if quantity > 0 else 'outofstock'
+    }
+
+class PushedStockPriceStore:
+    def __init__(self):
+        """sync.db içindeki SKU bazlı son gönderilen stok/fiyat değerleri
+
+        Değerler ilk kullanımda tek sorguyla belleğe alınır. record ile
+        yapılan değişiklikler bellekte tutulur ve commit ile tek işlemde
+        yazılır.
+        """
+        self.db = DatabaseManager()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            with self.db.session_scope() as session:
+                self._entries = {
+                    sku: {
+                        'regular_price': regular_price,
+                        'stock_quantity': stock_quantity,
+                        'stock_status': stock_status
+                    }
+                    for sku, regular_price, stock_quantity, stock_status in session.query(
+                        PushedStockPrice.sku,
+                        PushedStockPrice.regular_price,
+                        PushedStockPrice.stock_quantity,
+                        PushedStockPrice.stock_status
+                    ).all()
+                }
+        return self._entries
+
+    def get(self, sku: str) -> Optional[Dict[str, Any]]:
+        """SKU için son gönderilen değerler"""
+        entry = self._load().get(sku)
+        return dict(entry) if entry else None
+
+    def changes(self, sku: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Son gönderilenden farklı olan alanlar (hiç gönderilmemişse hepsi)"""
+        entry = self._load().get(sku) or {}
+        return {field: value for field, value in values.items() if entry.get(field) != value}
+
+    def record(self, sku: str, values: Dict[str, Any]):
+        """Gönderilen değerleri kaydet (commit ile yazılır)
+
+        Args:
+            sku: Ürün stok kodu
+            values: STOCK_PRICE_FIELDS alanlarından gönderilenler; WooCommerce
+                yanıtı da verilebilir, diğer alanlar yok sayılır
+        """
+        values = {field: values[field] for field in STOCK_PRICE_FIELDS if field in values}
+        if 'regular_price' in values:
+            values['regular_price'] = _format_price(values['regular_price'])
+        if not values:
+            return
+        entries = self._load()
+        with self._lock:
+            entry = entries.setdefault(sku, {})
+            if all(entry.get(field) == value for field, value in values.items()):
+                return
+            entry.update(values)
+            self._dirty[sku] = dict(entry)
+
+    def commit(self) -> int:
+        """Bekleyen kayıtları tek işlemde yaz
+
+        Returns:
+            Yazılan SKU sayısı
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return 0
+
+        skus = list(dirty)
+        now = datetime.now()
+        with self.db.session_scope() as session:
+            rows = {}
+            for i in range(0, len(skus), 500):
+                for row in session.query(PushedStockPrice).filter(
+                    PushedStockPrice.sku.in_(skus[i:i + 500])
+                ).all():
+                    rows[row.sku] = row
+            for sku, values in dirty.items():
+                row = rows.get(sku)
+                if row is None:
+                    row = PushedStockPrice(sku=sku)
+                    session.add(row)
+                row.regular_price = values.get('regular_price')
+                row.stock_quantity = values.get('stock_quantity')
+                row.stock_status = values.get('stock_status')
+                row.pushed_at = now
+        return len(dirty)
@@ -0,0 +1,21 @@
+from typing import Any
+
+from .connection import DatabaseManager
+from .models import SyncState
+
+def get_sync_state(key: str, default: Any = None) -> Any:
+    """Kalıcı senkronizasyon durum değerini getir (watermark vb.)"""
+    with DatabaseManager().session_scope() as session:
+        state = session.query(SyncState).filter_by(key=key).first()
+        if state is None or state.value is None:
+            return default
+        return state.value
+
+def set_sync_state(key: str, value: Any):
+    """Kalıcı senkronizasyon durum değerini kaydet"""
+    with DatabaseManager().session_scope() as session:
+        state = session.query(SyncState).filter_by(key=key).first()
+        if state is None:
+            session.add(SyncState(key=key, value=value))
+        else:
+            state.value = value
@@ -0,0 +1,138 @@
+import sys
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database.connection import DatabaseManager
+
+# Wolvox tablolarının testlerde kullanılan sütunları
+WOLVOX_SCHEMA = """
+    CREATE TABLE "RDB$DATABASE" (X INTEGER);
+    INSERT INTO "RDB$DATABASE" VALUES (1);
+    CREATE TABLE STOK (BLKODU INTEGER PRIMARY KEY, STOKKODU TEXT);
+    CREATE TABLE STOKHR (
+        BLKODU INTEGER PRIMARY KEY,
+        BLSTKODU INTEGER,
+        DEPO_ADI TEXT,
+        TUTAR_TURU INTEGER,
+        MIKTARI REAL,
+        SILINDI INTEGER DEFAULT 0
+    );
+"""
+
+class FakeFirebirdConnection:
+    """fdb bağlantısı yerine sqlite3 üzerinde çalışan sahte bağlantı
+
+    Havuzun kullandığı cursor/commit/rollback/close ve closed özelliklerini
+    sağlar; aynı dosyaya açılan bağlantılar aynı veriyi görür. queries
+    çalıştırılan SQL metinlerini tutar.
+    """
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.closed = False
+        self.healthy = True
+        self.queries = []
+
+    def cursor(self):
+        if self.closed:
+            raise sqlite3.ProgrammingError("Bağlantı kapalı")
+        return _FakeCursor(self)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self.closed = True
+        self._conn.close()
+
+class _FakeCursor:
+    def __init__(self, connection: FakeFirebirdConnection):
+        self._connection = connection
+        self._cursor = connection._conn.cursor()
+
+    def execute(self, sql, params=()):
+        if not self._connection.healthy:
+            raise sqlite3.OperationalError("Bağlantı koptu")
+        self._connection.queries.append(sql)
+        self._cursor.execute(sql, tuple(params))
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+class FakeWolvox:
+    """Test başına sqlite dosyasında tutulan sahte Wolvox veritabanı"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connections = []
+        conn = sqlite3.connect(str(path))
+        try:
+            conn.executescript(WOLVOX_SCHEMA)
+        finally:
+            conn.close()
+
+    def connect(self, **kwargs) -> FakeFirebirdConnection:
+        connection = FakeFirebirdConnection(self.path)
+        self.connections.append(connection)
+        return connection
+
+    def execute(self, sql, params=()):
+        conn = sqlite3.connect(str(self.path))
+        try:
+            with conn:
+                conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def add_stock(self, blkodu: int, stok_kodu: str):
+        self.execute("INSERT INTO STOK (BLKODU, STOKKODU) VALUES (?, ?)", (blkodu, stok_kodu))
+
+    def add_movement(self, blkodu: int, blstkodu: int, depo_adi: str, miktar: float, giris: bool = True):
+        # STOK_BAKIYE_SQL işaret kuralı: TUTAR_TURU 0 ise düşer, diğerlerinde artar
+        self.execute(
+            "INSERT INTO STOKHR (BLKODU, BLSTKODU, DEPO_ADI, TUTAR_TURU, MIKTARI) VALUES (?, ?, ?, ?, ?)",
+            (blkodu, blstkodu, depo_adi, 1 if giris else 0, miktar)
+        )
+
+    @property
+    def queries(self):
+        return [sql for connection in self.connections for sql in connection.queries]
+
+@pytest.fixture(autouse=True)
+def sync_db(tmp_path, monkeypatch):
+    """Her test boş bir data/sync.db ile çalışır"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(DatabaseManager, '_instance', None)
+    db = DatabaseManager()
+    yield db
+    db.dispose()
+
+@pytest.fixture
+def wolvox(tmp_path):
+    return FakeWolvox(tmp_path / 'wolvox.db')
+
+@pytest.fixture
+def pool(wolvox, monkeypatch):
+    from wolvox.connection_pool import FirebirdConnectionPool
+
+    pool = FirebirdConnectionPool(size=3, timeout=0.2)
+    monkeypatch.setattr(pool, '_connect', wolvox.connect)
+    yield pool
+    pool.close()
@@ -0,0 +1,110 @@
+from src.core.batch_writer import ProductBatchWriter
+
+class FakeBatchEndpoint:
+    """products/batch yerine geçen sahte uç nokta
+
+    Gönderilen yükleri saklar; errors içindeki SKU'lar için kayıt yerine
+    WooCommerce hata nesnesi döner.
+    """
+
+    def __init__(self, errors=None, response=True):
+        self.errors = errors or {}
+        self.response = response
+        self.payloads = []
+
+    def __call__(self, payload):
+        self.payloads.append(payload)
+        if self.response is not True:
+            return self.response
+        result = {}
+        for action, items in payload.items():
+            result[action] = [
+                {'id': 0, 'error': {'code': 'invalid', 'message': self.errors[item['sku']]}}
+                if item['sku'] in self.errors else dict(item, id=item.get('id', 100 + i))
+                for i, item in enumerate(items)
+            ]
+        return result
+
+def make_writer(endpoint, **kwargs):
+    events = []
+    writer = ProductBatchWriter(
+        endpoint,
+        on_success=lambda sku, action, item, meta: events.append(('ok', sku, action, item['id'], meta)),
+        on_failure=lambda sku, action, message, meta: events.append(('fail', sku, action, message, meta)),
+        **kwargs
+    )
+    return writer, events
+
+def test_results_are_mapped_by_position_in_queue_order():
+    endpoint = FakeBatchEndpoint(errors={'B': 'Geçersiz SKU'})
+    writer, events = make_writer(endpoint)
+
+    writer.update('A', 1, {'sku': 'A'}, meta='fa')
+    writer.create('B', {'sku': 'B'}, meta='fb')
+    writer.create('C', {'sku': 'C'}, meta='fc')
+    results = writer.flush()
+
+    assert endpoint.payloads == [{
+        'update': [{'sku': 'A', 'id': 1}],
+        'create': [{'sku': 'B'}, {'sku': 'C'}]
+    }]
+    assert results == [
+        (True, "Ürün güncellendi: A"),
+        (False, "Ürün oluşturulamadı: B (Geçersiz SKU)"),
+        (True, "Yeni ürün oluşturuldu: C")
+    ]
+    assert events == [
+        ('ok', 'A', 'update', 1, 'fa'),
+        ('fail', 'B', 'create', 'Geçersiz SKU', 'fb'),
+        ('ok', 'C', 'create', 101, 'fc')
+    ]
+
+def test_missing_response_fails_every_item():
+    writer, events = make_writer(FakeBatchEndpoint(response=None))
+    writer.update('A', 1, {'sku': 'A'})
+    writer.create('B', {'sku': 'B'})
+
+    assert writer.flush() == [
+        (False, "Ürün güncellenemedi: A (Yanıt alınamadı)"),
+        (False, "Ürün oluşturulamadı: B (Yanıt alınamadı)")
+    ]
+    assert [event[0] for event in events] == ['fail', 'fail']
+
+def test_short_response_fails_only_unanswered_items():
+    writer, _ = make_writer(FakeBatchEndpoint(response={'update': [{'id': 1, 'sku': 'A'}]}))
+    writer.update('A', 1, {'sku': 'A'})
+    writer.update('B', 2, {'sku': 'B'})
+
+    assert writer.flush() == [
+        (True, "Ürün güncellendi: A"),
+        (False, "Ürün güncellenemedi: B (Yanıtta kayıt yok)")
+    ]
+
+def test_send_exception_fails_batch_with_message():
+    def send(payload):
+        raise ConnectionError("bağlantı koptu")
+
+    writer, _ = make_writer(send)
+    writer.create('A', {'sku': 'A'})
+    assert writer.flush() == [(False, "Ürün oluşturulamadı: A (bağlantı koptu)")]
+
+def test_full_batch_is_sent_immediately():
+    endpoint = FakeBatchEndpoint()
+    writer, _ = make_writer(endpoint, batch_size=2)
+
+    assert writer.create('A', {'sku': 'A'}) == []
+    assert len(writer.create('B', {'sku': 'B'})) == 2
+    assert len(endpoint.payloads) == 1
+    writer.create('C', {'sku': 'C'})
+    assert len(writer.flush()) == 1
+    assert len(writer.results) == 3
+
+def test_callback_error_does_not_affect_other_items():
+    def on_success(sku, action, item, meta):
+        if sku == 'A':
+            raise ValueError("indeks yazılamadı")
+
+    writer = ProductBatchWriter(FakeBatchEndpoint(), on_success=on_success)
+    writer.create('A', {'sku': 'A'})
+    writer.create('B', {'sku': 'B'})
+    assert [ok for ok, _ in writer.flush()] == [True, True]
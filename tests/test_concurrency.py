@@ -0,0 +1,60 @@
+import threading
+import time
+
+from src.core.concurrency import AIMDController
+
+def test_window_grows_by_about_one_per_full_window():
+    controller = AIMDController(initial=2, max_window=8)
+    controller.record(1.0)
+    controller.record(1.0)
+    assert controller.window == 2
+    controller.record(1.0)
+    assert controller.window == 3
+
+def test_failure_halves_window_once_per_window():
+    controller = AIMDController(initial=8, max_window=8)
+    for _ in range(8):
+        controller.record(1.0)
+    controller.record(1.0, success=False)
+    assert controller.window == 4
+
+    # Aynı anda uçuştaki isteklerin hataları pencereyi tekrar küçültmez
+    controller.record(1.0, success=False)
+    assert controller.window == 4
+    assert controller.metrics()['congestions'] == 1
+
+def test_latency_spike_counts_as_congestion():
+    controller = AIMDController(initial=4, max_window=4)
+    for _ in range(4):
+        controller.record(1.0)
+    controller.record(2.0)
+    assert controller.window == 2
+
+def test_window_stays_within_bounds():
+    controller = AIMDController(initial=2, min_window=1, max_window=3)
+    for _ in range(50):
+        controller.record(1.0)
+    assert controller.window == 3
+    for _ in range(50):
+        controller.record(1.0, success=False)
+    assert controller.window == 1
+
+def test_acquire_blocks_at_window():
+    controller = AIMDController(initial=1, max_window=1)
+    controller.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        controller.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+
+    controller.release()
+    assert acquired.wait(1)
+    controller.release()
+    thread.join()
+    assert controller.metrics()['in_flight'] == 0
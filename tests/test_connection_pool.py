@@ -0,0 +1,110 @@
+import threading
+
+import fdb
+import pytest
+
+def test_released_connection_is_reused(pool, wolvox):
+    conn = pool.acquire()
+    assert pool.in_use == 1
+    conn.close()
+    assert pool.in_use == 0
+
+    with pool.connection():
+        pass
+    assert len(wolvox.connections) == 1
+
+def test_released_connection_is_rolled_back(pool, wolvox):
+    wolvox.add_stock(1, 'A')
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM STOK")
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM STOK")
+        assert cursor.fetchone()[0] == 1
+
+def test_context_manager_releases_on_error(pool):
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("sorgu hatası")
+    assert pool.in_use == 0
+
+def test_released_wrapper_cannot_be_used(pool):
+    conn = pool.acquire()
+    conn.release()
+    with pytest.raises(fdb.ProgrammingError):
+        conn.cursor()
+
+def test_scoped_close_does_not_release(pool):
+    conn = pool.acquire(scoped=True)
+    conn.close()
+    assert pool.in_use == 1
+    conn.release()
+    assert pool.in_use == 0
+
+def test_acquire_times_out_when_exhausted(pool):
+    held = [pool.acquire() for _ in range(pool.size)]
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    for conn in held:
+        conn.release()
+    assert pool.in_use == 0
+
+def test_waiting_acquire_gets_released_connection(pool):
+    held = [pool.acquire() for _ in range(pool.size)]
+    timer = threading.Timer(0.05, held[0].release)
+    timer.start()
+    conn = pool.acquire(timeout=1)
+    timer.join()
+    assert conn._connection is held[0]._connection
+    for other in [conn] + held[1:]:
+        other.release()
+
+def test_closed_connection_is_discarded_on_release(pool, wolvox):
+    conn = pool.acquire()
+    conn._connection.close()
+    conn.release()
+    assert pool.in_use == 0
+    assert not pool._idle
+
+    with pool.connection():
+        pass
+    assert len(wolvox.connections) == 2
+
+def test_unhealthy_idle_connection_is_replaced(pool, wolvox):
+    pool.health_check_interval = 0
+    with pool.connection():
+        pass
+    wolvox.connections[0].healthy = False
+
+    with pool.connection() as conn:
+        assert conn._connection is wolvox.connections[1]
+    assert wolvox.connections[0].closed
+    assert pool.in_use == 0
+
+def test_expired_connection_is_replaced(pool, wolvox):
+    pool.max_lifetime = 0
+    with pool.connection():
+        pass
+    with pool.connection() as conn:
+        assert conn._connection is wolvox.connections[1]
+    assert wolvox.connections[0].closed
+
+def test_failed_connect_frees_slot(pool, monkeypatch):
+    def fail(**kwargs):
+        raise fdb.DatabaseError("sunucuya ulaşılamıyor")
+
+    monkeypatch.setattr(pool, '_connect', fail)
+    for _ in range(pool.size + 1):
+        with pytest.raises(fdb.DatabaseError):
+            pool.acquire()
+    assert pool._open_count == 0
+
+def test_closed_pool_refuses_and_closes_returned_connections(pool, wolvox):
+    conn = pool.acquire()
+    pool.close()
+    with pytest.raises(fdb.ProgrammingError):
+        pool.acquire()
+    conn.release()
+    assert wolvox.connections[0].closed
+    assert pool._open_count == 0
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.core.http_cache import ResponseCache
+from src.core.http_transport import HttpTransport
+from src.core.rate_limiter import TokenBucket
+from src.database.http_cache import HttpCacheStore
+
+URL = 'https://shop.example/wp-json/wc/v3/products'
+
+def make_response(status=200, headers=None, body=b'[]'):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response.url = URL
+    return response
+
+class FakeSession:
+    """requests.Session yerine sırayla hazır yanıt dönen sahte oturum"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        response = self.responses.pop(0)
+        return response(method, url, kwargs) if callable(response) else response
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr('src.core.http_transport.time.sleep', calls.append)
+    return calls
+
+def make_transport(session, **kwargs):
+    transport = HttpTransport(backoff=0, **kwargs)
+    transport.session = session
+    return transport
+
+def test_get_is_retried_after_retry_after(sleeps):
+    limiter = TokenBucket(rate=1000)
+    session = FakeSession(make_response(429, {'Retry-After': '2'}), make_response(503), make_response(200))
+    transport = make_transport(session, rate_limiter=limiter)
+
+    assert transport.get(URL).status_code == 200
+    assert len(session.requests) == 3
+    assert sleeps[0] == 2.0
+    assert limiter.rate < 1000
+
+def test_post_is_not_retried(sleeps):
+    session = FakeSession(make_response(429, {'Retry-After': '1'}))
+    transport = make_transport(session)
+
+    assert transport.post(URL, json={}).status_code == 429
+    assert len(session.requests) == 1
+    assert sleeps == []
+
+def test_retries_are_bounded(sleeps):
+    session = FakeSession(*[make_response(503) for _ in range(3)])
+    transport = make_transport(session, max_retries=2)
+
+    assert transport.get(URL).status_code == 503
+    assert len(session.requests) == 3
+
+def test_connection_error_is_retried_for_get(sleeps):
+    def fail(method, url, kwargs):
+        raise requests.exceptions.ConnectionError("bağlantı reddedildi")
+
+    session = FakeSession(fail, make_response(200))
+    assert make_transport(session).get(URL).status_code == 200
+
+def test_etag_revalidation_replays_cached_body(sleeps):
+    session = FakeSession(
+        make_response(200, {'ETag': '"v1"', 'X-WP-Total': '1'}, b'[{"id": 1}]'),
+        make_response(304)
+    )
+    cache = ResponseCache(HttpCacheStore())
+    transport = make_transport(session, cache=cache)
+
+    assert transport.get(URL, cache=True).json() == [{'id': 1}]
+    replayed = transport.get(URL, cache=True)
+
+    assert session.requests[1][2]['headers']['If-None-Match'] == '"v1"'
+    assert replayed.json() == [{'id': 1}]
+    assert replayed.from_cache
+    assert cache.stats['not_modified'] == 1
+
+def test_probe_skips_unchanged_page(sleeps):
+    date = (datetime.utcnow() - timedelta(minutes=5)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+    session = FakeSession(
+        make_response(200, {'X-WP-Total': '1', 'Date': date}, b'[{"id": 1}]'),
+        make_response(200, {'X-WP-Total': '1'}),
+        make_response(200, {'X-WP-Total': '0'})
+    )
+    cache = ResponseCache(HttpCacheStore())
+    transport = make_transport(session, cache=cache)
+    params = {'page': 1, 'per_page': 100}
+
+    transport.get(URL, params=params, cache='probe')
+    assert transport.get(URL, params=params, cache='probe').json() == [{'id': 1}]
+    # Sayfa yerine iki küçük yoklama yapıldı
+    probes = [kwargs['params'] for _, _, kwargs in session.requests[1:]]
+    assert all(p['per_page'] == 1 for p in probes)
+    assert 'modified_after' in probes[1]
+    assert cache.stats['probe_hits'] == 1
+
+def test_probe_refetches_changed_page(sleeps):
+    date = (datetime.utcnow() - timedelta(minutes=5)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+    session = FakeSession(
+        make_response(200, {'X-WP-Total': '1', 'Date': date}, b'[{"id": 1}]'),
+        make_response(200, {'X-WP-Total': '1'}),
+        make_response(200, {'X-WP-Total': '1'}),
+        make_response(200, {'X-WP-Total': '1'}, b'[{"id": 1, "name": "yeni"}]')
+    )
+    transport = make_transport(session, cache=ResponseCache(HttpCacheStore()))
+
+    transport.get(URL, cache='probe')
+    assert transport.get(URL, cache='probe').json() == [{'id': 1, 'name': 'yeni'}]
+    assert len(session.requests) == 4
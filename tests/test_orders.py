@@ -0,0 +1,66 @@
+import json
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.core.order_feed import OrderFeed
+from src.database.failed_orders import FailedOrderStore
+
+SERVER_DATE = 'Sat, 17 Oct 2026 10:00:00 GMT'
+
+class FakeOrders:
+    """WooCommerce orders listesi yerine sayfalanmış sahte yanıtlar"""
+
+    def __init__(self, order_ids, per_page):
+        self.pages = [order_ids[i:i + per_page] for i in range(0, len(order_ids), per_page)] or [[]]
+        self.params = []
+
+    def __call__(self, params):
+        self.params.append(params)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({
+            'Date': SERVER_DATE,
+            'X-WP-Total': str(sum(len(page) for page in self.pages)),
+            'X-WP-TotalPages': str(len(self.pages))
+        })
+        response._content = json.dumps([{'id': i} for i in self.pages[params['page'] - 1]]).encode()
+        return response
+
+def test_feed_yields_pages_in_order_and_commits_watermark():
+    fetch = FakeOrders(list(range(1, 8)), per_page=3)
+    feed = OrderFeed(fetch, per_page=3, workers=2, overlap=60)
+
+    pages = [[order['id'] for order in page] for page in feed.pages()]
+    assert pages == [[1, 2, 3], [4, 5, 6], [7]]
+    assert 'modified_after' not in fetch.params[0]
+    assert all(params['orderby'] == 'id' for params in fetch.params)
+
+    # commit çağrılmadan watermark yazılmaz
+    assert feed.pending_watermark == '2026-10-17T09:59:00'
+    assert feed.get_watermark() is None
+    feed.commit()
+    assert feed.get_watermark() == '2026-10-17T09:59:00'
+
+    list(OrderFeed(fetch, per_page=3).pages())
+    assert fetch.params[-1]['modified_after'] == '2026-10-17T09:59:00'
+
+def test_failing_order_is_quarantined_after_max_attempts():
+    store = FailedOrderStore(max_attempts=3)
+
+    assert store.record_failures({5: 'Stok kodu yok', 6: 'Cari yok'}) == set()
+    assert store.record_failures({5: 'Stok kodu yok'}) == set()
+    assert store.record_failures({5: 'Stok kodu hâlâ yok'}) == {5}
+
+    quarantined = store.quarantined()
+    assert [(row['order_id'], row['attempts'], row['last_error']) for row in quarantined] == [
+        (5, 3, 'Stok kodu hâlâ yok')
+    ]
+
+def test_imported_order_is_cleared():
+    store = FailedOrderStore(max_attempts=1)
+    store.record_failures({5: 'Stok kodu yok'})
+    store.clear([5])
+
+    assert store.quarantined() == []
+    assert store.record_failures({5: 'Stok kodu yok'}) == {5}
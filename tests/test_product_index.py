@@ -0,0 +1,55 @@
+from woocommerce.product_index import ProductIndex
+
+class FakeWooClient:
+    """ProductIndex'in kullandığı WooCommerceClient metodlarının sahtesi"""
+
+    def __init__(self, products=None, variations=None):
+        self.products = products or []
+        self.variations = variations or {}
+        self.sku_lookups = []
+
+    def list_products(self, page=1, per_page=100, **kwargs):
+        return self.products[(page - 1) * per_page:page * per_page]
+
+    def list_product_variations(self, product_id, page=1, per_page=100, **kwargs):
+        return self.variations.get(product_id, [])[(page - 1) * per_page:page * per_page]
+
+    def get_products_by_skus(self, skus, **kwargs):
+        self.sku_lookups.append(list(skus))
+        return [p for p in self.products + sum(self.variations.values(), []) if p.get('sku') in skus]
+
+def test_build_indexes_products_and_variations():
+    wc = FakeWooClient(
+        products=[{'id': 1, 'sku': 'A', 'type': 'simple'}, {'id': 5, 'sku': 'V', 'type': 'variable'}],
+        variations={5: [{'id': 11, 'sku': 'V-K', 'type': 'variation', 'parent_id': 5}]}
+    )
+    index = ProductIndex(wc)
+
+    assert index.build() == 3
+    assert index.get('A') == {'product_id': 1, 'variation_id': None, 'parent_id': None}
+    assert index.get('V-K') == {'product_id': 5, 'variation_id': 11, 'parent_id': 5}
+    # Kalıcı kayıt yeni örnekte de okunur
+    assert ProductIndex(wc).get('V-K') == index.get('V-K')
+
+def test_resolve_stores_variation_hits_under_parent():
+    wc = FakeWooClient(variations={5: [{'id': 11, 'sku': 'V-K', 'type': 'variation', 'parent_id': 5}]})
+    index = ProductIndex(wc)
+
+    assert index.resolve(['V-K']) == {'V-K': {'product_id': 5, 'variation_id': 11, 'parent_id': 5}}
+
+def test_missing_skus_are_not_looked_up_again_within_ttl():
+    wc = FakeWooClient(products=[{'id': 1, 'sku': 'A', 'type': 'simple'}])
+    index = ProductIndex(wc)
+
+    assert index.resolve(['A', 'YOK']) == {'A': {'product_id': 1, 'variation_id': None, 'parent_id': None}}
+    assert index.resolve(['A', 'YOK']) == {'A': {'product_id': 1, 'variation_id': None, 'parent_id': None}}
+    assert wc.sku_lookups == [['A', 'YOK']]
+
+def test_batch_response_updates_only_successful_items():
+    index = ProductIndex(FakeWooClient())
+    index.update_from_batch({
+        'create': [{'id': 2, 'sku': 'B'}, {'id': 0, 'sku': 'C', 'error': {'message': 'Geçersiz'}}]
+    })
+
+    assert index.get_product_id('B') == 2
+    assert index.get('C') is None
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.core.rate_limiter import TokenBucket, get_rate_limiter, parse_retry_after
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(2) == 2.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('yarın') is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 28 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+def test_bucket_spends_capacity_then_waits():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket._reserve(1) == 0
+    assert bucket._reserve(1) == 0
+    assert bucket._reserve(1) == pytest.approx(0.1, abs=0.01)
+
+def test_backpressure_halves_rate_and_honours_retry_after():
+    bucket = TokenBucket(rate=10)
+    bucket.on_response(429, '2')
+
+    assert bucket.rate == 5
+    assert bucket._reserve(1) == pytest.approx(2.0, abs=0.05)
+
+def test_rate_never_drops_below_min_rate():
+    bucket = TokenBucket(rate=10, min_rate=2)
+    for _ in range(10):
+        bucket.on_response(503)
+    assert bucket.rate == 2
+
+def test_successful_responses_recover_rate_gradually():
+    bucket = TokenBucket(rate=10, recovery_step=0.1)
+    bucket.on_response(429)
+    bucket.on_response(200)
+    assert bucket.rate == pytest.approx(6)
+
+    bucket.on_response(404)
+    assert bucket.rate == pytest.approx(6)
+
+    for _ in range(10):
+        bucket.on_response(200)
+    assert bucket.rate == 10
+
+def test_named_limiter_is_shared():
+    first = get_rate_limiter('test-paylasilan', rate=5)
+    assert get_rate_limiter('test-paylasilan', rate=50) is first
+    assert first.rate == 5
@@ -0,0 +1,102 @@
+import pytest
+
+from src.database.sync_state import get_sync_state
+from wolvox.stock_changes import StockChangeTracker
+from wolvox.stock_ledger import StockLedger, get_stock_ledger
+
+@pytest.fixture
+def stocks(wolvox):
+    wolvox.add_stock(1, 'A')
+    wolvox.add_stock(2, 'B')
+    wolvox.add_movement(10, 1, 'MERKEZ', 5)
+    wolvox.add_movement(11, 1, 'SUBE', 2)
+    wolvox.add_movement(12, 2, 'MERKEZ', 7)
+    wolvox.add_movement(13, 2, 'MERKEZ', 3, giris=False)
+    return wolvox
+
+def balance_queries(wolvox):
+    return [sql for sql in wolvox.queries if 'GROUP BY sh.BLSTKODU' in sql]
+
+def test_seed_builds_ledger_and_commits_watermark(pool, stocks):
+    ledger = StockLedger(pool=pool)
+    ledger.seed()
+
+    assert get_sync_state(StockChangeTracker.STATE_KEY) == 13
+    assert ledger.get_totals() == {'A': 7.0, 'B': 4.0}
+    assert ledger.get_stock('A') == {'total': 7.0, 'depots': {'MERKEZ': 5.0, 'SUBE': 2.0}}
+    assert pool.in_use == 0
+
+def test_unseeded_ledger_reads_live_without_seeding(pool, stocks):
+    ledger = StockLedger(pool=pool)
+
+    assert ledger.get_totals(['B']) == {'B': 4.0}
+    assert ledger.get_depot_balances()[1] == {'MERKEZ': 5.0, 'SUBE': 2.0}
+    assert not ledger.is_seeded()
+
+def test_overlay_replaces_ledger_rows_of_changed_stocks(pool, stocks):
+    ledger = StockLedger(pool=pool)
+    ledger.seed()
+    stocks.add_movement(14, 1, 'SUBE', 1, giris=False)
+
+    assert ledger.get_stock('A') == {'total': 6.0, 'depots': {'MERKEZ': 5.0, 'SUBE': 1.0}}
+    assert ledger.get_totals(['A', 'B']) == {'A': 6.0, 'B': 4.0}
+    assert ledger.get_depot_balances() == {1: {'MERKEZ': 5.0, 'SUBE': 1.0}, 2: {'MERKEZ': 4.0}}
+    # Okuma watermark'ı ilerletmez
+    assert get_sync_state(StockChangeTracker.STATE_KEY) == 13
+
+def test_overlay_is_shared_for_max_age(pool, stocks, monkeypatch):
+    ledger = StockLedger(pool=pool, max_age=30)
+    ledger.seed()
+    stocks.add_movement(14, 1, 'MERKEZ', 1)
+    seeded = len(balance_queries(stocks))
+
+    for _ in range(5):
+        assert ledger.get_totals(['A'])['A'] == 8.0
+    assert len(balance_queries(stocks)) == seeded + 1
+
+    monkeypatch.setattr('wolvox.stock_ledger.time.monotonic', lambda: 1e12)
+    ledger.get_totals(['A'])
+    assert len(balance_queries(stocks)) == seeded + 2
+
+def test_refresh_returns_only_changed_totals(pool, stocks):
+    ledger = StockLedger(pool=pool)
+    ledger.seed()
+    stocks.add_movement(14, 2, 'SUBE', 1)
+
+    assert ledger.refresh() == {2: {'stok_kodu': 'B', 'bakiye': 5.0}}
+    assert get_sync_state(StockChangeTracker.STATE_KEY) == 14
+    # Lookback aralığı tekrar taranır ama bakiyesi değişmeyen stok dönmez
+    assert ledger.refresh() == {}
+
+def test_refresh_catches_late_commit_below_watermark(pool, stocks, monkeypatch):
+    monkeypatch.setenv('STOKHR_LOOKBACK_ROWS', '5')
+    ledger = StockLedger(pool=pool)
+    ledger.seed()
+    stocks.add_movement(20, 2, 'MERKEZ', 1)
+    ledger.refresh()
+
+    # BLKODU işlem başında alınır; geç onaylanan hareket watermark'ın altında kalır
+    stocks.add_movement(18, 1, 'MERKEZ', 4)
+    assert ledger.refresh() == {1: {'stok_kodu': 'A', 'bakiye': 11.0}}
+
+def test_reconcile_fixes_deleted_movement_outside_lookback(pool, stocks, monkeypatch):
+    monkeypatch.setenv('STOKHR_LOOKBACK_ROWS', '0')
+    ledger = StockLedger(pool=pool)
+    ledger.seed()
+    stocks.execute("UPDATE STOKHR SET SILINDI = 1 WHERE BLKODU = 10")
+
+    assert ledger.refresh() == {}
+    assert ledger.reconcile() == {1: {'stok_kodu': 'A', 'bakiye': 2.0}}
+    assert ledger.get_totals(['A']) == {'A': 2.0}
+
+def test_balances_are_read_in_in_chunks(pool, wolvox):
+    for blkodu in range(1, 1201):
+        wolvox.add_stock(blkodu, f'S{blkodu}')
+    with pool.connection() as conn:
+        balances = StockChangeTracker(conn).get_balances(range(1, 1201))
+    assert len(balances) == 1200
+    assert sum('IN (' in sql for sql in wolvox.queries) == 3
+
+def test_get_stock_ledger_is_shared_per_pool(pool):
+    assert get_stock_ledger(pool) is get_stock_ledger(pool)
+    assert get_stock_ledger(pool).pool is pool
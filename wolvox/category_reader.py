@@ -0,0 +1,60 @@
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+GRUP_QUERY = """
+    SELECT GRUP_ADI
+    FROM GRUP
+    WHERE WEBDE_GORUNSUN = 1 AND MODUL = 'STOK'
+"""
+
+GRUP_ARA_QUERY = """
+    SELECT UST_GRUP_ADI, GRUP_ADI
+    FROM GRUP_ARA
+    WHERE WEBDE_GORUNSUN = 1 AND MODUL = 'STOK'
+"""
+
+GRUP_ALT_QUERY = """
+    SELECT UST_GRUP_ADI, UST_GRUP_ADI2, GRUP_ADI
+    FROM GRUP_ALT
+    WHERE WEBDE_GORUNSUN = 1 AND MODUL = 'STOK'
+"""
+
+def _clean(value) -> str:
+    return value.strip() if value else ''
+
+def read_category_paths(connection) -> List[Tuple[str, ...]]:
+    """Web'de görünen GRUP/GRUP_ARA/GRUP_ALT hiyerarşisini ad yolları olarak oku
+
+    Her seviye tek sorguyla okunur. Üst grubu web'de görünmeyen ara/alt
+    gruplar atlanır.
+
+    Args:
+        connection: Wolvox veritabanı bağlantısı
+
+    Returns:
+        Sıralı ad yolları: (grup,), (grup, ara grup), (grup, ara grup, alt grup)
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(GRUP_QUERY)
+        groups = {_clean(row[0]) for row in cursor.fetchall()} - {''}
+
+        cursor.execute(GRUP_ARA_QUERY)
+        middles = {
+            (_clean(parent), _clean(name)) for parent, name in cursor.fetchall()
+            if _clean(name) and _clean(parent) in groups
+        }
+
+        cursor.execute(GRUP_ALT_QUERY)
+        leaves = {
+            (_clean(parent), _clean(middle), _clean(name)) for parent, middle, name in cursor.fetchall()
+            if _clean(name) and (_clean(parent), _clean(middle)) in middles
+        }
+    finally:
+        cursor.close()
+
+    paths = sorted({(group,) for group in groups} | middles | leaves)
+    logger.info(f"Wolvox kategori ağacı okundu: {len(groups)} grup, {len(middles)} ara grup, {len(leaves)} alt grup")
+    return paths
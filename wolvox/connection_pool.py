@@ -0,0 +1,246 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import fdb
+
+from .statement_cache import StatementCache
+
+logger = logging.getLogger(__name__)
+
+class PooledConnection:
+    """Havuzdan ödünç alınmış Firebird bağlantısı
+
+    fdb bağlantısının tüm özelliklerini aktarır. close() bağlantıyı kapatmaz,
+    havuza iade eder. scoped=True ile alınan bağlantılarda close() etkisizdir;
+    bağlantı kapsamın sahibi tarafından release() ile iade edilir (ör. Flask
+    isteğinin sonunda). statements, fiziksel bağlantıyla birlikte yaşayan
+    hazırlanmış sorgu önbelleğidir.
+    """
+
+    def __init__(self, pool: 'FirebirdConnectionPool', connection, created_at: float,
+                 statements: StatementCache, scoped: bool = False):
+        self._pool = pool
+        self._connection = connection
+        self._created_at = created_at
+        self._scoped = scoped
+        self._released = False
+        self.statements = statements
+
+    @property
+    def pool(self) -> 'FirebirdConnectionPool':
+        """Bağlantının ait olduğu havuz"""
+        return self._pool
+
+    def __getattr__(self, name):
+        if self._released:
+            raise fdb.ProgrammingError("Bağlantı havuza iade edilmiş")
+        return getattr(self._connection, name)
+
+    def release(self):
+        """Bağlantıyı havuza iade et"""
+        if not self._released:
+            self._released = True
+            self._pool._release(self._connection, self._created_at, self.statements)
+
+    def close(self):
+        """Bağlantıyı havuza iade et (kapsamlı bağlantılarda etkisiz)"""
+        if not self._scoped:
+            self.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+class FirebirdConnectionPool:
+    def __init__(self, size: int = 5, max_lifetime: float = 1800, timeout: float = 30,
+                 health_check_interval: float = 30, **connect_kwargs):
+        """Thread-safe Firebird bağlantı havuzu
+
+        Boşta bekleyen bağlantılar son kullanımdan health_check_interval
+        saniye sonra ödünç verilirken kontrol edilir; max_lifetime süresini
+        aşan bağlantılar kapatılıp yenisiyle değiştirilir.
+
+        Args:
+            size: Havuzdaki en fazla bağlantı sayısı
+            max_lifetime: Bir bağlantının en uzun kullanım süresi (saniye)
+            timeout: Boş bağlantı beklerken en uzun süre (saniye)
+            health_check_interval: Sağlık kontrolü yapılmadan ödünç verilebilecek boşta kalma süresi
+            **connect_kwargs: fdb.connect parametreleri
+        """
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.connect_kwargs = connect_kwargs
+
+        self._idle = deque()  # (bağlantı, oluşturulma zamanı, iade zamanı, sorgu önbelleği)
+        self._open_count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        """Şu anda ödünç verilmiş bağlantı sayısı"""
+        with self._cond:
+            return self._open_count - len(self._idle)
+
+    def _connect(self):
+        return fdb.connect(**self.connect_kwargs)
+
+    def _discard(self, connection, statements: Optional[StatementCache] = None):
+        try:
+            if statements is not None:
+                statements.clear()
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Havuz bağlantısı kapatılırken hata: {str(e)}")
+
+    def _is_healthy(self, connection) -> bool:
+        """Bağlantının hala kullanılabilir olduğunu kontrol et"""
+        try:
+            if connection.closed:
+                return False
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1 FROM RDB$DATABASE")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            connection.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"Havuz bağlantısı sağlık kontrolünden geçemedi: {str(e)}")
+            return False
+
+    def acquire(self, timeout: Optional[float] = None, scoped: bool = False) -> PooledConnection:
+        """Havuzdan bağlantı ödünç al
+
+        Args:
+            timeout: Bekleme süresi (None ise havuz varsayılanı)
+            scoped: True ise close() bağlantıyı iade etmez; release() gerekir
+
+        Returns:
+            Havuz bağlantısı
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise fdb.ProgrammingError("Bağlantı havuzu kapatılmış")
+                if self._idle:
+                    connection, created_at, released_at, statements = self._idle.pop()
+                    break
+                if self._open_count < self.size:
+                    self._open_count += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Bağlantı havuzunda boş bağlantı yok (boyut: {self.size})")
+                self._cond.wait(remaining)
+
+        now = time.monotonic()
+        if connection is not None:
+            expired = now - created_at > self.max_lifetime
+            if expired or (now - released_at > self.health_check_interval
+                           and not self._is_healthy(connection)):
+                # Yeri açılan bağlantı yenisiyle değiştirilir
+                self._discard(connection, statements)
+                connection = None
+
+        if connection is None:
+            try:
+                connection = self._connect()
+                created_at = time.monotonic()
+                statements = StatementCache(connection)
+            except Exception:
+                with self._cond:
+                    self._open_count -= 1
+                    self._cond.notify()
+                raise
+
+        return PooledConnection(self, connection, created_at, statements, scoped=scoped)
+
+    def _release(self, connection, created_at: float, statements: StatementCache):
+        # Açık işlem bir sonraki kullanıcıya taşınmasın
+        try:
+            connection.rollback()
+            reusable = not connection.closed
+        except Exception as e:
+            logger.warning(f"Havuz bağlantısı iade edilirken hata: {str(e)}")
+            reusable = False
+
+        with self._cond:
+            keep = reusable and not self._closed
+            if keep:
+                self._idle.append((connection, created_at, time.monotonic(), statements))
+            else:
+                self._open_count -= 1
+            self._cond.notify()
+
+        if not keep:
+            self._discard(connection, statements)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """with bloğu boyunca bağlantı ödünç al"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            conn.release()
+
+    def close(self):
+        """Boştaki bağlantıları kapat; ödünçtekiler iade edilince kapanır"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open_count -= len(idle)
+            self._cond.notify_all()
+
+        for connection, _, _, statements in idle:
+            self._discard(connection, statements)
+
+_pools: Dict[tuple, FirebirdConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(**connect_kwargs) -> FirebirdConnectionPool:
+    """Bağlantı parametrelerine göre paylaşılan havuzu getir
+
+    Aynı parametrelerle çağıran web uygulaması, GUI pencereleri ve
+    senkronizasyon işleri aynı havuzu kullanır. Havuz ayarları ortam
+    değişkenlerinden okunur: WOLVOX_POOL_SIZE, WOLVOX_POOL_MAX_LIFETIME,
+    WOLVOX_POOL_TIMEOUT.
+
+    Args:
+        **connect_kwargs: fdb.connect parametreleri
+    """
+    key = tuple(sorted(connect_kwargs.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = FirebirdConnectionPool(
+                size=int(os.getenv('WOLVOX_POOL_SIZE', '5')),
+                max_lifetime=float(os.getenv('WOLVOX_POOL_MAX_LIFETIME', '1800')),
+                timeout=float(os.getenv('WOLVOX_POOL_TIMEOUT', '30')),
+                **connect_kwargs
+            )
+            _pools[key] = pool
+        return pool
+
+def close_pools():
+    """Tüm havuzları kapat"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,147 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .stock_changes import chunked
+
+logger = logging.getLogger(__name__)
+
+ORDER_HEADER_SQL = """
+    INSERT INTO SIPARIS (SIPARIS_NO, SIPARIS_TARIHI, MUSTERI_ADI, TOPLAM_TUTAR)
+    VALUES (?, ?, ?, ?)
+"""
+
+ORDER_LINE_SQL = """
+    INSERT INTO SIPARIS_DETAY (SIPARIS_ID, STOK_KODU, MIKTAR, BIRIM_FIYAT)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Sipariş başına geri alınabilir nokta (aynı adla yeniden tanımlanınca eskisi bırakılır)
+ORDER_SAVEPOINT = 'SIPARIS_YAZ'
+
+def existing_order_numbers(connection, order_numbers: Iterable[str]) -> Set[str]:
+    """Wolvox'ta zaten kayıtlı olan sipariş numaralarını getir
+
+    Her sipariş için ayrı sorgu yerine numaralar IN sorgularıyla
+    (500'lük parçalar) kontrol edilir.
+
+    Args:
+        connection: Wolvox veritabanı bağlantısı
+        order_numbers: Kontrol edilecek SIPARIS_NO değerleri
+
+    Returns:
+        SIPARIS tablosunda bulunan numaralar
+    """
+    numbers = list(dict.fromkeys(str(n) for n in order_numbers))
+    existing = set()
+    if not numbers:
+        return existing
+
+    cursor = connection.cursor()
+    try:
+        for chunk in chunked(numbers):
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f"SELECT SIPARIS_NO FROM SIPARIS WHERE SIPARIS_NO IN ({placeholders})", chunk)
+            existing.update(str(row[0]).strip() for row in cursor.fetchall())
+        return existing
+
+    finally:
+        cursor.close()
+
+def order_rows(order: Dict) -> Tuple[tuple, List[tuple]]:
+    """WooCommerce siparişinden SIPARIS ve SIPARIS_DETAY satırları"""
+    order_no = str(order['id'])
+    order_date = datetime.fromisoformat(order['date_created'].replace('Z', '+00:00'))
+    billing = order.get('billing') or {}
+    header = (
+        order_no,
+        order_date,
+        f"{billing.get('first_name', '')} {billing.get('last_name', '')}".strip(),
+        float(order['total'])
+    )
+    lines = [
+        (order_no, item['sku'], float(item['quantity']), float(item['price']))
+        for item in order.get('line_items', [])
+    ]
+    return header, lines
+
+class OrderWriter:
+    def __init__(self, connection):
+        """Sipariş sayfalarını tek Firebird işleminde yazan toplu yazıcı
+
+        Bir sayfanın tüm başlıkları ve satırları executemany ile tek
+        işlemde eklenir. Toplu ekleme hata verirse işlem geri alınır ve
+        sayfa aynı işlem içinde sipariş başına SAVEPOINT ile tekrar yazılır;
+        hatalı sipariş yalnızca kendi noktasına geri alınır, diğerleri
+        sayfayla birlikte onaylanır.
+
+        Son write çağrısında eklenemeyen siparişlerin hata mesajları
+        errors içinde tutulur.
+
+        Args:
+            connection: Wolvox veritabanı bağlantısı
+        """
+        self.conn = connection
+        self.errors: Dict[int, str] = {}
+
+    def write(self, orders: List[Dict]) -> Tuple[List[int], List[int]]:
+        """Siparişleri ekle
+
+        Args:
+            orders: Wolvox'ta olmayan WooCommerce siparişleri
+
+        Returns:
+            (eklenen sipariş ID'leri, eklenemeyen sipariş ID'leri)
+        """
+        rows = []
+        failed = []
+        self.errors = {}
+        for order in orders:
+            try:
+                rows.append((order['id'], *order_rows(order)))
+            except (KeyError, TypeError, ValueError) as e:
+                failed.append(order['id'])
+                self.errors[order['id']] = f"Sipariş verisi hatalı: {str(e)}"
+                logger.error(f"Sipariş verisi hatalı ({order['id']}): {str(e)}")
+        if not rows:
+            return [], failed
+
+        cursor = self.conn.cursor()
+        try:
+            try:
+                cursor.executemany(ORDER_HEADER_SQL, [header for _, header, _ in rows])
+                lines = [line for _, _, order_lines in rows for line in order_lines]
+                if lines:
+                    cursor.executemany(ORDER_LINE_SQL, lines)
+                self.conn.commit()
+                logger.info(f"{len(rows)} sipariş toplu olarak eklendi")
+                return [order_id for order_id, _, _ in rows], failed
+
+            except Exception as e:
+                self.conn.rollback()
+                logger.warning(f"Toplu sipariş ekleme başarısız, siparişler tek tek yazılacak: {str(e)}")
+
+            written = []
+            for order_id, header, order_lines in rows:
+                cursor.execute(f"SAVEPOINT {ORDER_SAVEPOINT}")
+                try:
+                    cursor.execute(ORDER_HEADER_SQL, header)
+                    if order_lines:
+                        cursor.executemany(ORDER_LINE_SQL, order_lines)
+                    written.append(order_id)
+                except Exception as e:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {ORDER_SAVEPOINT}")
+                    failed.append(order_id)
+                    self.errors[order_id] = str(e)
+                    logger.error(f"Sipariş ekleme hatası ({order_id}): {str(e)}")
+
+            self.conn.commit()
+            logger.info(f"{len(written)} sipariş eklendi, {len(rows) - len(written)} sipariş eklenemedi")
+            return written, failed
+
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        finally:
+            cursor.close()
@@ -0,0 +1,145 @@
+import os
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from .connection_pool import FirebirdConnectionPool
+
+logger = logging.getLogger(__name__)
+
+def extract_workers() -> int:
+    """Paralel okuma iş parçacığı sayısı (WOLVOX_EXTRACT_WORKERS, varsayılan 1)"""
+    return max(1, int(os.getenv('WOLVOX_EXTRACT_WORKERS', '1')))
+
+class ParallelRangeReader:
+    def __init__(self, pool: FirebirdConnectionPool, workers: Optional[int] = None,
+                 partitions_per_worker: int = 4, connection=None):
+        """BLKODU aralıklarına bölünmüş paralel katalog okuyucu
+
+        Tablo, anahtar kolonun MIN/MAX değerleri arasında eşit genişlikte
+        aralıklara bölünür. Her aralık havuzdan alınan ayrı bir bağlantıyla
+        okunur; sonuçlar aralık sırasıyla tek bir akış olarak döner. Aynı anda
+        en fazla workers + 1 aralık bellekte tutulur.
+
+        Eşzamanlı okuma sayısı okuma başında havuzdaki boş bağlantılarla
+        sınırlanır; web istekleri ve STOKHR izleyicisi gibi diğer kullanıcılar
+        bağlantı beklemez. İkiden az boş bağlantı varsa sorgu çağıranın
+        bağlantısıyla tek seferde okunur.
+
+        Args:
+            pool: Wolvox bağlantı havuzu
+            workers: Eşzamanlı okuma sayısı (None ise WOLVOX_EXTRACT_WORKERS)
+            partitions_per_worker: İş parçacığı başına aralık sayısı
+            connection: Çağıranın bağlantısı (MIN/MAX ve tek bağlantılı okuma
+                için; None ise havuzdan alınır)
+        """
+        self.pool = pool
+        self.workers = max(1, workers or extract_workers())
+        self.partitions_per_worker = partitions_per_worker
+        self.conn = connection
+
+    @contextmanager
+    def _connection(self):
+        """Çağıranın bağlantısını ya da havuzdan bir bağlantıyı kullan"""
+        if self.conn is not None:
+            yield self.conn
+        else:
+            with self.pool.connection() as conn:
+                yield conn
+
+    def _free_workers(self) -> int:
+        """Havuzda şu anda boş olan bağlantılarla sınırlanmış okuma sayısı"""
+        free = self.pool.size - self.pool.in_use
+        if self.conn is None:
+            # MIN/MAX ve tek bağlantılı okuma için havuzdan alınacak bağlantı
+            free -= 1
+        return min(self.workers, free)
+
+    def _key_range(self, table: str, key_column: str) -> Optional[Tuple[int, int]]:
+        column = key_column.split('.')[-1]
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+                low, high = cursor.fetchone()
+            finally:
+                cursor.close()
+        if low is None:
+            return None
+        return low, high
+
+    def _read_serial(self, sql: str, params: tuple) -> Iterator[tuple]:
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                yield from cursor
+            finally:
+                cursor.close()
+
+    def _partitions(self, low: int, high: int, workers: int) -> List[Tuple[int, int]]:
+        count = workers * self.partitions_per_worker
+        step = max(1, -(-(high - low + 1) // count))
+        return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+    def _read_partition(self, sql: str, params: tuple) -> List[tuple]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def iter_rows(self, query: str, table: str, key_column: str = 's.BLKODU',
+                  params: tuple = ()) -> Iterator[tuple]:
+        """Sorgu sonucunu aralıklar halinde paralel oku
+
+        Sorgu bir WHERE koşulu içermeli ve ORDER BY içermemelidir; aralık
+        koşulu AND ile eklenir ve satırlar anahtar kolona göre sıralı döner.
+
+        Args:
+            query: WHERE koşullu SELECT sorgusu
+            table: MIN/MAX değerlerinin okunacağı tablo
+            key_column: Bölümleme kolonu (sorgudaki takma adıyla)
+            params: Sorgu parametreleri
+
+        Yields:
+            Sorgu satırları
+        """
+        workers = self._free_workers()
+        if workers < 2:
+            logger.info(f"Havuzda yeterli boş bağlantı yok, {table} tek bağlantıyla okunuyor")
+            yield from self._read_serial(f"{query} ORDER BY {key_column}", tuple(params))
+            return
+
+        bounds = self._key_range(table, key_column)
+        if bounds is None:
+            return
+
+        sql = f"{query} AND {key_column} BETWEEN ? AND ? ORDER BY {key_column}"
+        partitions = deque(self._partitions(*bounds, workers))
+        logger.info(f"{table} {len(partitions)} aralıkta {workers} bağlantıyla okunuyor")
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = deque()
+
+        def submit_next():
+            low, high = partitions.popleft()
+            pending.append(executor.submit(self._read_partition, sql, tuple(params) + (low, high)))
+
+        try:
+            while partitions and len(pending) < workers:
+                submit_next()
+            while pending:
+                future = pending.popleft()
+                # Baştaki aralık tüketilirken diğer bağlantılar okumaya devam eder
+                if partitions:
+                    submit_next()
+                yield from future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -0,0 +1,198 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+def _to_float(value) -> float:
+    return float(value) if value else 0.0
+
+def _strip(value):
+    return value.strip() if isinstance(value, str) else value
+
+class WolvoxProduct:
+    """Wolvox okuyucularının ortak ürün kaydı
+
+    Satır başına sözlük yerine __slots__ kullanır. Okuyucuların eski anahtar
+    yazımları (STOK_KODU, sku, stok_kodu, ...) aynı alana eşlenir; böylece
+    product['STOK_KODU'], product.get('sku') ve product.stok_kodu aynı
+    değeri döndürür.
+    """
+
+    __slots__ = (
+        'blkodu',
+        'stok_kodu',
+        'stok_adi',
+        'barkod',
+        'birim',
+        'kdv_orani',
+        'grup_kodu',
+        'ara_grup_kodu',
+        'alt_grup_kodu',
+        'marka_kodu',
+        'model_kodu',
+        'kategori',
+        'alt_kategori',
+        'marka',
+        'model',
+        'aciklama',
+        'resim_yolu',
+        'resimler',
+        'satis_fiyati',
+        'satis_fiyati2',
+        'kdv_dahil_fiyat',
+        'kdv_haric_fiyat',
+        'bakiye',
+        'depo_dagilimi',
+        'webde_gorunsun',
+        'aktif',
+    )
+
+    # Okuyucuların kullandığı anahtar yazımları (küçük harf) -> alan
+    ALIASES = {
+        'bl_code': 'blkodu',
+        'stokkodu': 'stok_kodu',
+        'sku': 'stok_kodu',
+        'name': 'stok_adi',
+        'urun_adi': 'stok_adi',
+        'barkodu': 'barkod',
+        'barcode': 'barkod',
+        'birimi': 'birim',
+        'stok_birimi': 'birim',
+        'unit': 'birim',
+        'tax_rate': 'kdv_orani',
+        'grup_ara_kodu': 'ara_grup_kodu',
+        'grup_alt_kodu': 'alt_grup_kodu',
+        'grup_adi': 'kategori',
+        'grubu': 'kategori',
+        'group': 'kategori',
+        'category': 'kategori',
+        'alt_grubu': 'alt_kategori',
+        'subcategory': 'alt_kategori',
+        'markasi': 'marka',
+        'marka_adi': 'marka',
+        'brand': 'marka',
+        'modeli': 'model',
+        'model_adi': 'model',
+        'description': 'aciklama',
+        'eticaret_aciklama': 'aciklama',
+        'image_path': 'resim_yolu',
+        'images': 'resimler',
+        'satis_fiyati1': 'satis_fiyati',
+        'liste_fiyati': 'satis_fiyati',
+        'price': 'satis_fiyati',
+        'price_with_tax': 'kdv_dahil_fiyat',
+        'fiyat_kdv_dahil': 'kdv_dahil_fiyat',
+        'fiyat_kdv_haric': 'kdv_haric_fiyat',
+        'stock': 'bakiye',
+        'stok_miktar': 'bakiye',
+        'stok_miktari': 'bakiye',
+        'warehouse_distribution': 'depo_dagilimi',
+        'web_durum': 'webde_gorunsun',
+        'show_on_web': 'webde_gorunsun',
+        'active': 'aktif',
+    }
+
+    # Alan bazlı varsayılan dönüştürücüler
+    CONVERTERS = {
+        'kdv_orani': _to_float,
+        'satis_fiyati': _to_float,
+        'satis_fiyati2': _to_float,
+        'kdv_dahil_fiyat': _to_float,
+        'kdv_haric_fiyat': _to_float,
+        'bakiye': _to_float,
+    }
+
+    def __init__(self, **values):
+        for slot in self.__slots__:
+            setattr(self, slot, None)
+        for key, value in values.items():
+            setattr(self, self.field_name(key, strict=True), value)
+
+    @classmethod
+    def field_name(cls, key: str, strict: bool = False) -> Optional[str]:
+        """Anahtar yazımını alan adına çevir"""
+        name = key.lower()
+        if name in cls.__slots__:
+            return name
+        name = cls.ALIASES.get(name)
+        if name is None and strict:
+            raise KeyError(key)
+        return name
+
+    @classmethod
+    def row_factory(cls, columns: Sequence[str],
+                    converters: Optional[Dict[str, Callable]] = None) -> Callable[[Sequence], 'WolvoxProduct']:
+        """Sütun sırasına göre satırdan kayıt üreten fonksiyon döndür
+
+        Sütun -> alan eşlemesi bir kez çözülür; satır başına yalnızca indeks
+        okuması ve atama yapılır. None verilen sütunlar atlanır.
+
+        Args:
+            columns: Satırdaki sütunların alan adları (veya eski anahtar yazımları)
+            converters: Varsayılanları ezen alan bazlı dönüştürücüler
+        """
+        all_converters = dict(cls.CONVERTERS)
+        if converters:
+            all_converters.update(converters)
+
+        plan = []
+        for index, column in enumerate(columns):
+            if column is None:
+                continue
+            field = cls.field_name(column, strict=True)
+            plan.append((index, field, all_converters.get(field, _strip)))
+        assigned = {field for _, field, _ in plan}
+        unset = tuple(slot for slot in cls.__slots__ if slot not in assigned)
+        plan = tuple(plan)
+        new = cls.__new__
+
+        def build(row: Sequence) -> 'WolvoxProduct':
+            product = new(cls)
+            for index, field, convert in plan:
+                setattr(product, field, convert(row[index]))
+            for field in unset:
+                setattr(product, field, None)
+            return product
+
+        return build
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], columns: Sequence[str],
+                  converters: Optional[Dict[str, Callable]] = None) -> Iterator['WolvoxProduct']:
+        """Satırları kayıtlara çevir"""
+        build = cls.row_factory(columns, converters)
+        for row in rows:
+            yield build(row)
+
+    def __getitem__(self, key: str) -> Any:
+        field = self.field_name(key)
+        if field is None:
+            raise KeyError(key)
+        return getattr(self, field)
+
+    def __setitem__(self, key: str, value: Any):
+        setattr(self, self.field_name(key, strict=True), value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.field_name(key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Sözlük uyumlu okuma; değer yoksa varsayılanı döndür"""
+        field = self.field_name(key)
+        if field is None:
+            return default
+        value = getattr(self, field)
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return list(self.__slots__)
+
+    def to_dict(self, keys: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Kaydı sözlüğe çevir (JSON yanıtları için)
+
+        Args:
+            keys: Çıktıdaki anahtar yazımları (None ise alan adları)
+        """
+        if keys is None:
+            return {slot: getattr(self, slot) for slot in self.__slots__}
+        return {key: self[key] for key in keys}
+
+    def __repr__(self) -> str:
+        return f"WolvoxProduct(stok_kodu={self.stok_kodu!r}, stok_adi={self.stok_adi!r})"
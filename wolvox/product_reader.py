@@ -3,7 +3,13 @@ import fdb
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .connection_pool import get_pool
+from .parallel_reader import ParallelRangeReader, extract_workers
+from .product import WolvoxProduct
+from .statement_cache import get_statement_cache
+from .stock_changes import chunked
 
 # Logging ayarları
 logging.basicConfig(
@@ -18,26 +24,7 @@ logging.basicConfig(
 logger = logging.getLogger('WolvoxProduct')
 
 class ProductReader:
-    def __init__(self, connection):
-        """Wolvox ürün okuyucu
-
-        Args:
-            connection: Veritabanı bağlantısı
-        """
-        self.conn = connection
-
-    def get_all_products(self) -> Optional[List[Dict]]:
-        """Tüm ürünleri getir
-
-        Returns:
-            Ürün listesi veya None
-        """
-        try:
-            cursor = self.conn.cursor()
-            
-            # Ana ürün bilgilerini al
-            cursor.execute("""
-                SELECT 
+    PRODUCT_FIELDS = """
                     s.STOK_KODU,
                     s.STOK_ADI,
                     s.BARKOD,
@@ -51,41 +38,85 @@ class ProductReader:
                     s.AKTIF,
                     g.GRUP_ADI,
                     m.MARKA_ADI,
-                    md.MODEL_ADI
+                    md.MODEL_ADI"""
+    PRODUCT_JOINS = """
                 FROM STOKLAR s
                 LEFT JOIN STOK_GRUPLARI g ON s.GRUP_KODU = g.GRUP_KODU
                 LEFT JOIN STOK_MARKALARI m ON s.MARKA_KODU = m.MARKA_KODU
                 LEFT JOIN STOK_MODELLERI md ON s.MODEL_KODU = md.MODEL_KODU
+    """
+    PRODUCT_QUERY = """
+                SELECT """ + PRODUCT_FIELDS + PRODUCT_JOINS
+    PRODUCT_COLUMNS = (
+        'stok_kodu', 'stok_adi', 'barkod', 'grup_kodu', 'marka_kodu', 'model_kodu',
+        'aciklama', 'satis_fiyati', 'bakiye', 'webde_gorunsun', 'aktif',
+        'kategori', 'marka', 'model'
+    )
+    STOCK_PRICE_COLUMNS = ('stok_kodu', 'satis_fiyati', 'bakiye')
+
+    def __init__(self, connection, batch_size: int = 500, workers: Optional[int] = None):
+        """Wolvox ürün okuyucu
+
+        Args:
+            connection: Veritabanı bağlantısı
+            batch_size: fetchmany ile tek seferde okunacak satır sayısı
+            workers: Tam katalog okumasında eşzamanlı bağlantı sayısı
+                (None ise WOLVOX_EXTRACT_WORKERS; yalnızca havuz bağlantılarında)
+        """
+        self.conn = connection
+        self.batch_size = batch_size
+        self.workers = workers or extract_workers()
+        self.pool = getattr(connection, 'pool', None)
+        self.statements = get_statement_cache(connection)
+        self._product_from_row = WolvoxProduct.row_factory(self.PRODUCT_COLUMNS)
+        self._stock_price_from_row = WolvoxProduct.row_factory(self.STOCK_PRICE_COLUMNS)
+
+    def _iter_rows(self, query: str, params: tuple = ()) -> Iterator[tuple]:
+        """Sorgu sonucunu fetchmany ile parça parça döndür"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def iter_products(self) -> Iterator[WolvoxProduct]:
+        """Tüm ürünleri akış olarak getir
+
+        Havuz bağlantısıyla ve workers > 1 iken katalog BLKODU aralıklarına
+        bölünüp paralel okunur. Okuma hataları çağırana iletilir.
+
+        Yields:
+            Ürün bilgileri
+        """
+        query = self.PRODUCT_QUERY + """
                 WHERE s.WEB_DURUM = 1 AND s.AKTIF = 1
-            """)
-            
-            products = []
-            for row in cursor.fetchall():
-                product = {
-                    'STOK_KODU': row[0],
-                    'STOK_ADI': row[1],
-                    'BARKOD': row[2],
-                    'GRUP_KODU': row[3],
-                    'MARKA_KODU': row[4],
-                    'MODEL_KODU': row[5],
-                    'ACIKLAMA': row[6],
-                    'SATIS_FIYATI1': float(row[7]) if row[7] else 0.0,
-                    'BAKIYE': float(row[8]) if row[8] else 0.0,
-                    'WEB_DURUM': row[9],
-                    'AKTIF': row[10],
-                    'KATEGORI': row[11],  # GRUP_ADI
-                    'MARKA': row[12],     # MARKA_ADI
-                    'MODEL': row[13]      # MODEL_ADI
-                }
-                products.append(product)
-                
-            return products
+        """
+        if self.pool is not None and self.workers > 1:
+            rows = ParallelRangeReader(self.pool, self.workers, connection=self.conn).iter_rows(query, 'STOKLAR')
+        else:
+            rows = self._iter_rows(query)
+        for row in rows:
+            yield self._product_from_row(row)
+
+    def get_all_products(self) -> Optional[List[WolvoxProduct]]:
+        """Tüm ürünleri getir
+
+        Returns:
+            Ürün listesi veya None
+        """
+        try:
+            return list(self.iter_products())
             
         except Exception as e:
             logger.error(f"Ürün okuma hatası: {str(e)}")
             return None
 
-    def get_product_by_code(self, stok_kodu: str) -> Optional[Dict]:
+    def get_product_by_code(self, stok_kodu: str) -> Optional[WolvoxProduct]:
         """Stok koduna göre ürün getir
 
         Args:
@@ -95,28 +126,7 @@ class ProductReader:
             Ürün bilgileri veya None
         """
         try:
-            cursor = self.conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    s.STOK_KODU,
-                    s.STOK_ADI,
-                    s.BARKOD,
-                    s.GRUP_KODU,
-                    s.MARKA_KODU,
-                    s.MODEL_KODU,
-                    s.ACIKLAMA,
-                    s.SATIS_FIYATI1,
-                    s.BAKIYE,
-                    s.WEB_DURUM,
-                    s.AKTIF,
-                    g.GRUP_ADI,
-                    m.MARKA_ADI,
-                    md.MODEL_ADI
-                FROM STOKLAR s
-                LEFT JOIN STOK_GRUPLARI g ON s.GRUP_KODU = g.GRUP_KODU
-                LEFT JOIN STOK_MARKALARI m ON s.MARKA_KODU = m.MARKA_KODU
-                LEFT JOIN STOK_MODELLERI md ON s.MODEL_KODU = md.MODEL_KODU
+            cursor = self.statements.execute(self.PRODUCT_QUERY + """
                 WHERE s.STOK_KODU = ? AND s.WEB_DURUM = 1 AND s.AKTIF = 1
             """, (stok_kodu,))
             
@@ -124,55 +134,88 @@ class ProductReader:
             if not row:
                 return None
                 
-            return {
-                'STOK_KODU': row[0],
-                'STOK_ADI': row[1],
-                'BARKOD': row[2],
-                'GRUP_KODU': row[3],
-                'MARKA_KODU': row[4],
-                'MODEL_KODU': row[5],
-                'ACIKLAMA': row[6],
-                'SATIS_FIYATI1': float(row[7]) if row[7] else 0.0,
-                'BAKIYE': float(row[8]) if row[8] else 0.0,
-                'WEB_DURUM': row[9],
-                'AKTIF': row[10],
-                'KATEGORI': row[11],  # GRUP_ADI
-                'MARKA': row[12],     # MARKA_ADI
-                'MODEL': row[13]      # MODEL_ADI
-            }
+            return self._product_from_row(row)
             
         except Exception as e:
             logger.error(f"Ürün okuma hatası: {str(e)}")
             return None
 
-    def get_stock_and_prices(self) -> Optional[List[Dict]]:
-        """Stok ve fiyat bilgilerini getir
+    def get_products_by_codes(self, stok_kodlari: Iterable[str]) -> Optional[Dict[str, WolvoxProduct]]:
+        """Stok kodlarına göre ürünleri toplu getir
+
+        Kodlar IN listeleri halinde parçalanır; ürün, bakiye, fiyat ve resim
+        bilgileri her parça için tek sorguda okunur. Parça uzunluğuna göre
+        değişen sorgular hazırlanmış sorgu önbelleğindeki sık kullanılan
+        sorguları düşürmesin diye ayrı bir cursor ile çalıştırılır.
+
+        Args:
+            stok_kodlari: Ürün stok kodları
 
         Returns:
-            Stok ve fiyat listesi veya None
+            {stok_kodu: ürün} (bulunamayan kodlar yer almaz) veya None
         """
+        codes = list(dict.fromkeys(
+            str(code).strip() for code in stok_kodlari if code is not None and str(code).strip()
+        ))
+        products = {}
+        image_start = len(self.PRODUCT_COLUMNS)
+
+        cursor = self.conn.cursor()
         try:
-            cursor = self.conn.cursor()
-            
-            cursor.execute("""
+            for chunk in chunked(codes):
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f"""
+                SELECT {self.PRODUCT_FIELDS},
+                    s.RESIM,
+                    s.RESIM2,
+                    s.RESIM3,
+                    s.RESIM4,
+                    s.RESIM5
+                {self.PRODUCT_JOINS}
+                WHERE s.STOK_KODU IN ({placeholders}) AND s.WEB_DURUM = 1 AND s.AKTIF = 1
+                """, tuple(chunk))
+
+                for row in cursor.fetchall():
+                    product = self._product_from_row(row)
+                    product.resimler = [img.strip() for img in row[image_start:] if img and img.strip()]
+                    products[product.stok_kodu] = product
+
+            return products
+
+        except Exception as e:
+            logger.error(f"Toplu ürün okuma hatası: {str(e)}")
+            return None
+
+        finally:
+            cursor.close()
+
+    def iter_stock_and_prices(self) -> Iterator[WolvoxProduct]:
+        """Stok ve fiyat bilgilerini akış olarak getir
+
+        Okuma hataları çağırana iletilir.
+
+        Yields:
+            Stok ve fiyat bilgileri
+        """
+        query = """
                 SELECT 
                     STOK_KODU,
                     SATIS_FIYATI1,
                     BAKIYE
                 FROM STOKLAR
                 WHERE WEB_DURUM = 1 AND AKTIF = 1
-            """)
-            
-            products = []
-            for row in cursor.fetchall():
-                product = {
-                    'STOK_KODU': row[0],
-                    'SATIS_FIYATI1': float(row[1]) if row[1] else 0.0,
-                    'BAKIYE': float(row[2]) if row[2] else 0.0
-                }
-                products.append(product)
-                
-            return products
+        """
+        for row in self._iter_rows(query):
+            yield self._stock_price_from_row(row)
+
+    def get_stock_and_prices(self) -> Optional[List[WolvoxProduct]]:
+        """Stok ve fiyat bilgilerini getir
+
+        Returns:
+            Stok ve fiyat listesi veya None
+        """
+        try:
+            return list(self.iter_stock_and_prices())
             
         except Exception as e:
             logger.error(f"Stok ve fiyat okuma hatası: {str(e)}")
@@ -194,11 +237,11 @@ class WolvoxProductReader:
                 fdb.load_api(fb_client_path)
             
             # Veritabanı bağlantısı
-            self.connection = fdb.connect(
+            self.connection = get_pool(
                 dsn=f"{os.getenv('WOLVOX_DB_HOST')}:{os.getenv('WOLVOX_DB_PATH')}",
                 user=os.getenv('WOLVOX_DB_USER'),
                 password=os.getenv('WOLVOX_DB_PASSWORD')
-            )
+            ).acquire()
             logger.info("Veritabanı bağlantısı kuruldu")
             
         except Exception as e:
@@ -233,8 +276,7 @@ class WolvoxProductReader:
         """Ürün resimlerini getir"""
         try:
             # Resimleri sorgula
-            cur = self.connection.cursor()
-            cur.execute("""
+            cur = get_statement_cache(self.connection).execute("""
                 SELECT 
                     RESIM,
                     RESIM2,
@@ -260,15 +302,13 @@ class WolvoxProductReader:
         except Exception as e:
             logger.error(f"Resimler alınırken hata oluştu: {str(e)}")
             raise
-        finally:
-            if cur:
-                cur.close()
     
     def close(self):
-        """Veritabanı bağlantısını kapat"""
+        """Veritabanı bağlantısını havuza iade et"""
         if self.connection:
             self.connection.close()
-            logger.info("Veritabanı bağlantısı kapatıldı")
+            self.connection = None
+            logger.info("Veritabanı bağlantısı havuza iade edildi")
 
 if __name__ == "__main__":
     # Test
@@ -0,0 +1,87 @@
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class StatementCache:
+    def __init__(self, connection, max_size: int = 64):
+        """Bağlantı başına hazırlanmış sorgu (prepared statement) önbelleği
+
+        Aynı SQL metni her çağrıda yeniden hazırlanmaz; fdb cursor.prep ile
+        hazırlanan sorgu kendi cursor'ı ile saklanır ve yeni parametrelerle
+        tekrar çalıştırılır. En az kullanılan sorgu max_size aşıldığında
+        kapatılır.
+
+        Args:
+            connection: Wolvox veritabanı bağlantısı
+            max_size: Saklanacak en fazla sorgu sayısı
+        """
+        self.conn = connection
+        self.max_size = max_size
+        self._statements = OrderedDict()  # sql -> (cursor, prepared statement)
+        self._lock = threading.Lock()
+
+    def execute(self, sql: str, params: tuple = ()):
+        """Hazırlanmış sorguyu çalıştır
+
+        Dönen cursor önbelleğe aittir; sonuçlar okunmalı ama cursor
+        kapatılmamalıdır. Aynı sorgunun bir sonraki çalıştırılması önceki
+        sonuçları kapatır.
+
+        Args:
+            sql: SQL metni (önbellek anahtarı)
+            params: Sorgu parametreleri
+
+        Returns:
+            Sonuçları okunacak cursor
+        """
+        with self._lock:
+            entry = self._statements.get(sql)
+            if entry is not None:
+                self._statements.move_to_end(sql)
+            else:
+                cursor = self.conn.cursor()
+                entry = (cursor, cursor.prep(sql))
+                self._statements[sql] = entry
+                if len(self._statements) > self.max_size:
+                    _, (old_cursor, _) = self._statements.popitem(last=False)
+                    self._close_cursor(old_cursor)
+
+        cursor, statement = entry
+        try:
+            cursor.execute(statement, params)
+        except Exception:
+            # Bozulan sorgu bir sonraki çağrıda yeniden hazırlanır
+            with self._lock:
+                if self._statements.get(sql) is entry:
+                    del self._statements[sql]
+            self._close_cursor(cursor)
+            raise
+        return cursor
+
+    def _close_cursor(self, cursor):
+        try:
+            cursor.close()
+        except Exception as e:
+            logger.warning(f"Önbellekteki sorgu kapatılırken hata: {str(e)}")
+
+    def clear(self):
+        """Önbellekteki tüm sorguları kapat"""
+        with self._lock:
+            entries = list(self._statements.values())
+            self._statements.clear()
+        for cursor, _ in entries:
+            self._close_cursor(cursor)
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+def get_statement_cache(connection) -> StatementCache:
+    """Bağlantının sorgu önbelleğini getir
+
+    Havuz bağlantıları kendi önbelleklerini taşır; havuz dışı bağlantılar
+    için yeni bir önbellek oluşturulur.
+    """
+    statements = getattr(connection, 'statements', None)
+    return statements if statements is not None else StatementCache(connection)
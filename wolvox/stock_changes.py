@@ -0,0 +1,153 @@
+import os
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.database.sync_state import get_sync_state, set_sync_state
+
+logger = logging.getLogger(__name__)
+
+# Stok bakiyesi tanımı (depo ekranındaki işaret kuralı ile aynı)
+STOK_BAKIYE_SQL = """-COALESCE(SUM(
+                    CASE
+                        WHEN sh.TUTAR_TURU = 0 THEN sh.MIKTARI
+                        ELSE -sh.MIKTARI
+                    END), 0)"""
+
+# Firebird IN listesi sınırının (1500) altında kalmak için
+IN_CHUNK_SIZE = 500
+
+def chunked(values: List, size: int = IN_CHUNK_SIZE) -> Iterable[List]:
+    """Listeyi IN sorguları için parçalara böl"""
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+def lookback_rows() -> int:
+    """Watermark'ın altında her turda tekrar taranan BLKODU aralığı (STOKHR_LOOKBACK_ROWS, varsayılan 500)"""
+    return max(0, int(os.getenv('STOKHR_LOOKBACK_ROWS', '500')))
+
+class StockChangeTracker:
+    STATE_KEY = 'stokhr.last_blkodu'
+
+    def __init__(self, connection, state_key: str = STATE_KEY, lookback: int = 0):
+        """STOKHR değişiklik takipçisi
+
+        Son işlenen STOKHR.BLKODU değerini sync.db'de saklar ve daha yeni
+        hareketleri okur. BLKODU işlem başında alındığından geç onaylanan
+        bir işlemin hareketi watermark'ın altında kalabilir; lookback
+        verilirse watermark'ın altındaki bu kadar BLKODU da her turda
+        tekrar taranır. Silindi olarak işaretlenen ya da yerinde düzenlenen
+        eski hareketler yakalanmaz; bunlar StockLedger.reconcile ile düzelir.
+
+        Args:
+            connection: Wolvox veritabanı bağlantısı
+            state_key: sync.db'deki watermark anahtarı
+            lookback: Watermark'ın altında tekrar taranan BLKODU aralığı
+        """
+        self.conn = connection
+        self.state_key = state_key
+        self.lookback = max(0, lookback)
+        self.pending_watermark = None
+
+    def get_watermark(self) -> Optional[int]:
+        """Kalıcı watermark değerini getir"""
+        return get_sync_state(self.state_key)
+
+    def latest_blkodu(self) -> int:
+        """STOKHR'daki en son hareketin BLKODU değeri"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT MAX(BLKODU) FROM STOKHR")
+            row = cursor.fetchone()
+            return row[0] if row and row[0] is not None else 0
+        finally:
+            cursor.close()
+
+    def collect_changes(self, since: Optional[int] = None) -> Set[int]:
+        """Son watermark'tan sonra hareket gören stokları getir
+
+        İlk çalıştırmada (watermark yokken) hareketi olan tüm stoklar döner.
+        lookback aralığındaki stoklar yeni hareket olmasa da döner.
+
+        Args:
+            since: Kalıcı watermark yerine bu BLKODU'dan sonrasını oku
+
+        Returns:
+            Hareket gören BLSTKODU kümesi
+        """
+        watermark = (self.get_watermark() or 0) if since is None else since
+
+        # Üst sınırı sabitle; sorgu sırasında eklenen hareketler bir sonraki tura kalır
+        upper = self.latest_blkodu()
+        lower = max(watermark - self.lookback, 0)
+
+        if upper <= lower:
+            self.pending_watermark = None
+            return set()
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT DISTINCT BLSTKODU
+                FROM STOKHR
+                WHERE BLKODU > ? AND BLKODU <= ?
+            """, (lower, upper))
+
+            touched = {row[0] for row in cursor.fetchall()}
+            self.pending_watermark = max(upper, watermark)
+
+            if upper > watermark:
+                logger.info(f"STOKHR {watermark} -> {upper}: {len(touched)} stok etkilendi")
+            return touched
+
+        finally:
+            cursor.close()
+
+    def get_balances(self, blstkodlar: Iterable[int]) -> Dict[int, Dict]:
+        """Verilen stokların güncel bakiyelerini hesapla
+
+        Args:
+            blstkodlar: Stok BLKODU değerleri
+
+        Returns:
+            {BLKODU: {'stok_kodu': ..., 'bakiye': ...}}
+        """
+        codes = list(blstkodlar)
+        balances = {}
+        if not codes:
+            return balances
+
+        cursor = self.conn.cursor()
+        try:
+            for chunk in chunked(codes):
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f"""
+                    SELECT
+                        s.BLKODU,
+                        s.STOKKODU,
+                        CAST({STOK_BAKIYE_SQL} AS DECIMAL(15,2)) as BAKIYE
+                    FROM STOK s
+                    LEFT JOIN STOKHR sh ON sh.BLSTKODU = s.BLKODU AND sh.SILINDI = 0
+                    WHERE s.BLKODU IN ({placeholders})
+                    GROUP BY s.BLKODU, s.STOKKODU
+                """, chunk)
+
+                for blkodu, stok_kodu, bakiye in cursor.fetchall():
+                    balances[blkodu] = {
+                        'stok_kodu': stok_kodu.strip() if stok_kodu else '',
+                        'bakiye': float(bakiye or 0)
+                    }
+
+            return balances
+
+        finally:
+            cursor.close()
+
+    def commit(self):
+        """İşlenen hareketleri kalıcı olarak işaretle
+
+        Yalnızca değişiklikler hedefe başarıyla yazıldıktan sonra çağrılmalı;
+        aksi halde aynı hareketler bir sonraki turda tekrar okunur.
+        """
+        if self.pending_watermark is not None:
+            set_sync_state(self.state_key, self.pending_watermark)
+            self.pending_watermark = None
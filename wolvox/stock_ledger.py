@@ -0,0 +1,334 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.database.connection import DatabaseManager
+from src.database.models import StockBalance
+from src.database.sync_state import get_sync_state
+from .stock_changes import STOK_BAKIYE_SQL, StockChangeTracker, chunked, lookback_rows
+
+logger = logging.getLogger(__name__)
+
+class StockLedger:
+    def __init__(self, connection=None, max_age: float = 30.0, pool=None):
+        """sync.db içindeki depo bazlı stok defteri
+
+        Bakiyeler (BLSTKODU, DEPO_ADI) bazında STOK_BAKIYE_SQL tanımıyla
+        hesaplanır. Defteri seed/refresh/reconcile ile yalnızca zamanlanmış
+        görevler oluşturur ve ilerletir (main.py'deki senkronizasyon süreci;
+        web uygulaması açılışta eksikse seed eder). refresh watermark'ın
+        altındaki son STOKHR_LOOKBACK_ROWS hareketi de tekrar tarar; silinen
+        ya da düzenlenen eski hareketlerden doğan sapmalar periyodik
+        reconcile ile düzeltilir.
+
+        Wolvox bağlantısı ya da havuzu verilirse okuma metodları defteri
+        ilerletmez ve seed etmez: watermark'tan sonra hareket gören stokların
+        bakiyeleri STOKHR'dan canlı okunup max_age saniye boyunca tüm
+        okumalarda defterdekilerin yerine kullanılır. Defter henüz
+        oluşturulmamışsa yalnızca istenen stoklar Wolvox'tan canlı okunur.
+        Bağlantı ve havuz yoksa yalnızca sync.db okunur. İstek başına
+        sorgu yapılmaması için okuyucular get_stock_ledger ile süreç
+        boyunca paylaşılan örneği kullanmalıdır.
+
+        Args:
+            connection: Wolvox veritabanı bağlantısı
+            max_age: Canlı okunan bakiyelerin tekrar kullanıldığı süre (saniye)
+            pool: Wolvox bağlantı havuzu (bağlantı yerine; gerektiğinde kısa süreli bağlantı alınır)
+        """
+        self.conn = connection
+        self.pool = pool
+        self.db = DatabaseManager()
+        self.max_age = max_age
+        self._overlay: Optional[Tuple[float, Set[int], List[Dict]]] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connection(self):
+        """Verilen bağlantıyı ya da havuzdan kısa süreli bir bağlantıyı kullan"""
+        if self.conn is not None:
+            yield self.conn
+        else:
+            with self.pool.connection() as conn:
+                yield conn
+
+    def is_seeded(self) -> bool:
+        """Defter en az bir kez doldurulmuş mu"""
+        return get_sync_state(StockChangeTracker.STATE_KEY) is not None
+
+    def _read_balances(self, connection, blstkodlar: Optional[List[int]] = None,
+                       stok_kodlari: Optional[List[str]] = None) -> List[Dict]:
+        """Wolvox'tan depo bazlı bakiyeleri oku (filtre verilmezse tümü)"""
+        cursor = connection.cursor()
+        try:
+            query = f"""
+                SELECT
+                    sh.BLSTKODU,
+                    s.STOKKODU,
+                    sh.DEPO_ADI,
+                    CAST({STOK_BAKIYE_SQL} AS DECIMAL(15,2)) as MIKTAR
+                FROM STOKHR sh
+                JOIN STOK s ON s.BLKODU = sh.BLSTKODU
+                WHERE sh.SILINDI = 0
+                {{filter}}
+                GROUP BY sh.BLSTKODU, s.STOKKODU, sh.DEPO_ADI
+            """
+
+            if blstkodlar is not None:
+                column, values = 'sh.BLSTKODU', blstkodlar
+            elif stok_kodlari is not None:
+                column, values = 's.STOKKODU', stok_kodlari
+            else:
+                column, values = None, None
+
+            if column is None:
+                batches = [(query.format(filter=''), ())]
+            else:
+                batches = [
+                    (query.format(filter=f"AND {column} IN ({', '.join('?' * len(chunk))})"), chunk)
+                    for chunk in chunked(values)
+                ]
+
+            rows = []
+            for sql, params in batches:
+                cursor.execute(sql, params)
+                for blstkodu, stok_kodu, depo_adi, miktar in cursor.fetchall():
+                    rows.append({
+                        'blstkodu': blstkodu,
+                        'stok_kodu': stok_kodu.strip() if stok_kodu else '',
+                        'depo_adi': depo_adi.strip() if depo_adi else '',
+                        'miktar': float(miktar or 0)
+                    })
+            return rows
+
+        finally:
+            cursor.close()
+
+    def _ledger_totals(self, blstkodlar: Optional[List[int]] = None) -> Dict[int, Dict]:
+        """Defterdeki toplam bakiyeler {BLSTKODU: {'stok_kodu': ..., 'bakiye': ...}}"""
+        totals = {}
+        with self.db.session_scope() as session:
+            columns = (StockBalance.blstkodu, StockBalance.stok_kodu, StockBalance.miktar)
+            if blstkodlar is None:
+                queries = [session.query(*columns)]
+            else:
+                queries = [
+                    session.query(*columns).filter(StockBalance.blstkodu.in_(chunk))
+                    for chunk in chunked(blstkodlar)
+                ]
+            for query in queries:
+                for blstkodu, stok_kodu, miktar in query.all():
+                    total = totals.setdefault(blstkodu, {'stok_kodu': stok_kodu, 'bakiye': 0.0})
+                    total['bakiye'] += miktar or 0
+        return totals
+
+    @staticmethod
+    def _diff(before: Dict[int, Dict], after: Dict[int, Dict]) -> Dict[int, Dict]:
+        """Toplamı değişen stoklar (defterden düşen stokların bakiyesi 0 sayılır)"""
+        changed = {}
+        for blstkodu in set(before) | set(after):
+            old = before.get(blstkodu)
+            new = after.get(blstkodu) or {'stok_kodu': old['stok_kodu'], 'bakiye': 0.0}
+            if old is None or round(old['bakiye'], 2) != round(new['bakiye'], 2):
+                changed[blstkodu] = new
+        return changed
+
+    def seed(self):
+        """Defteri Wolvox'tan tamamen yeniden oluştur"""
+        with self._connection() as conn:
+            tracker = StockChangeTracker(conn)
+            # Watermark agregasyondan önce alınır; aradaki hareketler bir sonraki refresh'te tekrar hesaplanır
+            upper = tracker.latest_blkodu()
+            rows = self._read_balances(conn)
+
+            with self.db.session_scope() as session:
+                session.query(StockBalance).delete(synchronize_session=False)
+                session.bulk_insert_mappings(StockBalance, rows)
+
+            tracker.pending_watermark = upper
+            tracker.commit()
+
+        self._overlay = None
+        logger.info(f"Stok defteri oluşturuldu: {len(rows)} kayıt")
+
+    def refresh(self) -> Dict[int, Dict]:
+        """Yeni STOKHR hareketlerini deftere işle
+
+        Returns:
+            Değişen stokların toplam bakiyeleri {BLKODU: {'stok_kodu': ..., 'bakiye': ...}}
+        """
+        if not self.is_seeded():
+            self.seed()
+            return {}
+
+        with self._connection() as conn:
+            tracker = StockChangeTracker(conn, lookback=lookback_rows())
+            touched = tracker.collect_changes()
+            if not touched:
+                return {}
+
+            touched = list(touched)
+            before = self._ledger_totals(touched)
+            rows = self._read_balances(conn, touched)
+
+            with self.db.session_scope() as session:
+                for chunk in chunked(touched):
+                    session.query(StockBalance).filter(
+                        StockBalance.blstkodu.in_(chunk)
+                    ).delete(synchronize_session=False)
+                session.bulk_insert_mappings(StockBalance, rows)
+
+            tracker.commit()
+
+        self._overlay = None
+
+        # lookback ile tekrar okunan stoklar bakiyesi değişmediyse gönderilmez
+        after = {}
+        for row in rows:
+            total = after.setdefault(row['blstkodu'], {'stok_kodu': row['stok_kodu'], 'bakiye': 0.0})
+            total['bakiye'] += row['miktar']
+        changed = self._diff(before, after)
+
+        if changed:
+            logger.info(f"Stok defteri güncellendi: {len(changed)} stok")
+        return changed
+
+    def reconcile(self) -> Dict[int, Dict]:
+        """Defteri Wolvox'tan yeniden oluştur ve sapan stokları getir
+
+        Watermark ile yakalanamayan değişiklikler (silindi işaretlenen ya
+        da yerinde düzenlenen eski hareketler) bu şekilde deftere yansır.
+
+        Returns:
+            Toplamı değişen stokların bakiyeleri {BLKODU: {'stok_kodu': ..., 'bakiye': ...}}
+        """
+        before = self._ledger_totals()
+        self.seed()
+        changed = self._diff(before, self._ledger_totals())
+        if changed:
+            logger.warning(f"Stok defteri Wolvox ile uzlaştırıldı: {len(changed)} stokta sapma düzeltildi")
+        return changed
+
+    def _unprocessed(self) -> Tuple[Optional[Set[int]], List[Dict]]:
+        """Deftere işlenmemiş hareketi olan stoklar ve canlı depo bakiyeleri
+
+        Sonuç max_age saniye boyunca tüm okumalarda paylaşılır; aynı anda
+        gelen okumalar tek sorgu turunu bekler.
+
+        Returns:
+            (BLSTKODU kümesi, _read_balances satırları); defter henüz
+            oluşturulmamışsa küme None'dır
+        """
+        if self.conn is None and self.pool is None:
+            return set(), []
+        if not self.is_seeded():
+            return None, []
+
+        with self._lock:
+            overlay = self._overlay
+            if overlay is not None and time.monotonic() - overlay[0] <= self.max_age:
+                return overlay[1], overlay[2]
+
+            with self._connection() as conn:
+                # Okuma watermark'ı ilerletmez (commit çağrılmaz); değişiklikler refresh ile işlenir
+                touched = StockChangeTracker(conn, lookback=lookback_rows()).collect_changes()
+                rows = self._read_balances(conn, list(touched)) if touched else []
+
+            self._overlay = (time.monotonic(), touched, rows)
+            return touched, rows
+
+    def _read_live(self, stok_kodlari: Optional[List[str]] = None) -> List[Dict]:
+        """Defter oluşturulmamışken istenen stokları Wolvox'tan canlı oku"""
+        with self._connection() as conn:
+            return self._read_balances(conn, stok_kodlari=stok_kodlari)
+
+    def get_stock(self, stok_kodu: str) -> Dict:
+        """Stok koduna göre toplam ve depo bakiyelerini getir"""
+        touched, live = self._unprocessed()
+        if touched is None:
+            rows, live = [], self._read_live([stok_kodu])
+        else:
+            with self.db.session_scope() as session:
+                rows = session.query(StockBalance.blstkodu, StockBalance.depo_adi, StockBalance.miktar).filter(
+                    StockBalance.stok_kodu == stok_kodu
+                ).all()
+
+        balances = [(depo_adi, miktar) for blstkodu, depo_adi, miktar in rows if blstkodu not in touched]
+        balances += [(row['depo_adi'], row['miktar']) for row in live if row['stok_kodu'] == stok_kodu]
+
+        depots = {}
+        for depo_adi, miktar in sorted(balances):
+            if miktar:
+                depots[depo_adi] = depots.get(depo_adi, 0.0) + miktar
+        return {
+            'total': sum(depots.values()),
+            'depots': depots
+        }
+
+    def get_totals(self, stok_kodlari: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Stok kodlarına göre toplam bakiyeleri getir
+
+        Args:
+            stok_kodlari: Stok kodları (None ise tümü)
+        """
+        touched, live = self._unprocessed()
+        codes = None if stok_kodlari is None else list(stok_kodlari)
+        totals = {}
+        if touched is None:
+            live = self._read_live(codes)
+        else:
+            with self.db.session_scope() as session:
+                columns = (StockBalance.blstkodu, StockBalance.stok_kodu, StockBalance.miktar)
+                if codes is None:
+                    queries = [session.query(*columns)]
+                else:
+                    queries = [
+                        session.query(*columns).filter(StockBalance.stok_kodu.in_(chunk))
+                        for chunk in chunked(codes)
+                    ]
+                for query in queries:
+                    for blstkodu, stok_kodu, miktar in query.all():
+                        if blstkodu not in touched:
+                            totals[stok_kodu] = totals.get(stok_kodu, 0.0) + (miktar or 0)
+
+        wanted = None if codes is None else set(codes)
+        for row in live:
+            if wanted is None or row['stok_kodu'] in wanted:
+                totals[row['stok_kodu']] = totals.get(row['stok_kodu'], 0.0) + row['miktar']
+        return totals
+
+    def get_depot_balances(self) -> Dict[int, Dict[str, float]]:
+        """Tüm depo bakiyelerini {BLSTKODU: {DEPO_ADI: MIKTAR}} olarak getir"""
+        touched, live = self._unprocessed()
+        balances = {}
+        if touched is None:
+            live = self._read_live()
+        else:
+            with self.db.session_scope() as session:
+                for blstkodu, depo_adi, miktar in session.query(
+                    StockBalance.blstkodu, StockBalance.depo_adi, StockBalance.miktar
+                ).all():
+                    if blstkodu not in touched:
+                        balances.setdefault(blstkodu, {})[depo_adi] = miktar or 0
+        for row in live:
+            balances.setdefault(row['blstkodu'], {})[row['depo_adi']] = row['miktar']
+        return balances
+
+_ledgers: Dict[int, StockLedger] = {}
+_ledgers_lock = threading.Lock()
+
+def get_stock_ledger(pool) -> StockLedger:
+    """Havuza bağlı, süreç boyunca paylaşılan stok defterini getir
+
+    Web istekleri ve GUI pencereleri aynı örneği kullandığından canlı
+    okunan bakiyeler max_age boyunca tüm okumalarda paylaşılır.
+
+    Args:
+        pool: Wolvox bağlantı havuzu
+    """
+    with _ledgers_lock:
+        ledger = _ledgers.get(id(pool))
+        if ledger is None or ledger.pool is not pool:
+            ledger = _ledgers[id(pool)] = StockLedger(pool=pool)
+        return ledger
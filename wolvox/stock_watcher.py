@@ -0,0 +1,114 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional, Set
+
+from .stock_changes import StockChangeTracker
+
+logger = logging.getLogger(__name__)
+
+class StockMovementWatcher:
+    STATE_KEY = 'stokhr.watcher.last_blkodu'
+
+    def __init__(self, pool, push: Callable[[Dict[int, Dict]], bool],
+                 poll_interval: Optional[float] = None, push_interval: Optional[float] = None,
+                 state_key: str = STATE_KEY):
+        """STOKHR hareketlerini izleyip stok bakiyelerini küçük gruplarla gönderen izleyici
+
+        Arka plan iş parçacığında her poll_interval saniyede watermark'tan
+        sonraki STOKHR hareketleri okunur ve etkilenen stoklar biriktirilir.
+        Her push_interval saniyede biriken stokların güncel bakiyeleri tek
+        seferde hesaplanıp push ile gönderilir; aynı stokta art arda gelen
+        hareketler tek güncellemeye iner. Watermark yalnızca gönderim
+        başarılı olduktan sonra kalıcı yazılır; süreç yeniden başlarsa
+        gönderilmemiş hareketler tekrar okunur.
+
+        İlk çalıştırmada (watermark yokken) geçmiş hareketler gönderilmez;
+        izleme o anki son hareketten başlar.
+
+        Args:
+            pool: Wolvox bağlantı havuzu (izleyici her turda kısa süreli bağlantı alır)
+            push: {BLSTKODU: {'stok_kodu', 'bakiye'}} bakiyelerini gönderip
+                başarı durumunu döndüren fonksiyon
+            poll_interval: Hareket okuma aralığı (None ise STOCK_WATCHER_POLL_INTERVAL, varsayılan 2)
+            push_interval: Gönderim aralığı (None ise STOCK_WATCHER_PUSH_INTERVAL, varsayılan 3)
+            state_key: sync.db'deki watermark anahtarı
+        """
+        self.pool = pool
+        self.push = push
+        self.poll_interval = poll_interval or float(os.getenv('STOCK_WATCHER_POLL_INTERVAL', '2'))
+        self.push_interval = push_interval or float(os.getenv('STOCK_WATCHER_PUSH_INTERVAL', '3'))
+        self.state_key = state_key
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """İzleyiciyi arka planda başlat"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stokhr-watcher', daemon=True)
+        self._thread.start()
+        logger.info(f"STOKHR izleyici başlatıldı (okuma {self.poll_interval} sn, gönderim {self.push_interval} sn)")
+
+    def stop(self, timeout: Optional[float] = None):
+        """İzleyiciyi durdur ve iş parçacığının bitmesini bekle"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        cursor: Optional[int] = None
+        dirty: Set[int] = set()
+        next_push = time.monotonic() + self.push_interval
+
+        while not self._stop.is_set():
+            # Her turda havuzdan bağlantı alınır; Firebird işlemi tur sonunda
+            # kapandığından yeni işlenen hareketler bir sonraki turda görünür
+            connection = None
+            try:
+                connection = self.pool.acquire()
+                tracker = StockChangeTracker(connection, self.state_key)
+
+                if cursor is None:
+                    cursor = tracker.get_watermark()
+                if cursor is None:
+                    tracker.pending_watermark = cursor = tracker.latest_blkodu()
+                    tracker.commit()
+                    logger.info(f"STOKHR izleyici watermark'ı başlatıldı: {cursor}")
+
+                touched = tracker.collect_changes(since=cursor)
+                if touched:
+                    dirty |= touched
+                    cursor = tracker.pending_watermark
+
+                if dirty and time.monotonic() >= next_push:
+                    if self._push(tracker.get_balances(dirty)):
+                        tracker.pending_watermark = cursor
+                        tracker.commit()
+                        dirty.clear()
+                    next_push = time.monotonic() + self.push_interval
+                elif not dirty:
+                    next_push = max(next_push, time.monotonic() + self.push_interval)
+
+            except Exception as e:
+                logger.error(f"STOKHR izleyici hatası: {str(e)}")
+            finally:
+                if connection is not None:
+                    connection.close()
+
+            self._stop.wait(self.poll_interval)
+
+    def _push(self, balances: Dict[int, Dict]) -> bool:
+        try:
+            if self.push(balances):
+                return True
+            logger.warning(f"{len(balances)} stok bakiyesi gönderilemedi, bir sonraki turda tekrar denenecek")
+        except Exception as e:
+            logger.error(f"Stok bakiyeleri gönderilemedi: {str(e)}")
+        return False
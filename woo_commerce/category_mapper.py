@@ -1,3 +1,5 @@
+import sys
+from pathlib import Path
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTreeWidget, QTreeWidgetItem, QPushButton, QLabel,
                              QMessageBox, QDialog, QLineEdit, QComboBox,
@@ -7,7 +9,15 @@ import os
 import json
 import fdb
 from dotenv import load_dotenv
-import requests
+
+# Ana dizini Python path'ine ekle
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from wolvox.connection_pool import get_pool
+from src.core.category_sync import CategoryTreeSync
+from src.core.http_transport import get_transport
+from src.core.woo_fields import with_fields
 
 class CategoryMapperWindow(QMainWindow):
     def __init__(self, parent=None):
@@ -282,7 +292,7 @@ class CategoryMapperWindow(QMainWindow):
                     'parent': int(parent_combo.currentData())
                 }
                 
-                response = requests.post(
+                response = get_transport().post(
                     f"{url}/wp-json/wc/v3/products/categories",
                     auth=(consumer_key, consumer_secret),
                     json=data
@@ -391,12 +401,12 @@ class CategoryMapperWindow(QMainWindow):
             if fb_client_path and os.path.exists(fb_client_path):
                 fdb.load_api(fb_client_path)
             
-            # Veritabanı bağlantısı
-            con = fdb.connect(
+            # Bağlantıyı havuzdan al; con.close() havuza iade eder
+            con = get_pool(
                 dsn=f"{os.getenv('WOLVOX_DB_HOST')}:{os.getenv('WOLVOX_DB_PATH')}",
                 user=os.getenv('WOLVOX_DB_USER'),
                 password=os.getenv('WOLVOX_DB_PASSWORD')
-            )
+            ).acquire()
             return con
         except Exception as e:
             QMessageBox.critical(self, 'Hata', f'Veritabanı bağlantısı kurulamadı: {str(e)}')
@@ -471,10 +481,11 @@ class CategoryMapperWindow(QMainWindow):
             consumer_secret = os.getenv('WOOCOMMERCE_CONSUMER_SECRET')
             
             # Kategorileri al
-            response = requests.get(
+            response = get_transport().get(
                 f"{url}/wp-json/wc/v3/products/categories",
                 auth=(consumer_key, consumer_secret),
-                params={"per_page": 100}
+                params=with_fields({"per_page": 100}, 'category'),
+                cache=True
             )
             
             if response.status_code == 200:
@@ -509,74 +520,47 @@ class CategoryMapperWindow(QMainWindow):
         try:
             # WooCommerce API bilgileri
             url = os.getenv('WOOCOMMERCE_URL')
-            consumer_key = os.getenv('WOOCOMMERCE_CONSUMER_KEY')
-            consumer_secret = os.getenv('WOOCOMMERCE_CONSUMER_SECRET')
+            auth = (os.getenv('WOOCOMMERCE_CONSUMER_KEY'), os.getenv('WOOCOMMERCE_CONSUMER_SECRET'))
             
-            # Mevcut WooCommerce kategorilerini al
-            response = requests.get(
-                f"{url}/wp-json/wc/v3/products/categories",
-                auth=(consumer_key, consumer_secret),
-                params={"per_page": 100}
-            )
+            def list_page(page):
+                response = get_transport().get(
+                    f"{url}/wp-json/wc/v3/products/categories",
+                    auth=auth,
+                    params=with_fields({"per_page": 100, "page": page}, 'category')
+                )
+                return response.json() if response.status_code == 200 else None
             
-            if response.status_code == 200:
-                existing_categories = {cat['name']: cat['id'] for cat in response.json()}
-                
-                # Wolvox kategorilerini ekle
-                for i in range(self.wolvox_tree.topLevelItemCount()):
-                    grup_item = self.wolvox_tree.topLevelItem(i)
-                    grup_name = grup_item.text(1)
-                    
-                    # Ana grup yoksa ekle
-                    if grup_name not in existing_categories:
-                        response = requests.post(
-                            f"{url}/wp-json/wc/v3/products/categories",
-                            auth=(consumer_key, consumer_secret),
-                            json={"name": grup_name}
-                        )
-                        
-                        if response.status_code == 201:
-                            grup_id = response.json()['id']
-                            existing_categories[grup_name] = grup_id
-                    
-                    grup_id = existing_categories.get(grup_name)
-                    
-                    # Ara grupları ekle
-                    for j in range(grup_item.childCount()):
-                        aragrup_item = grup_item.child(j)
-                        aragrup_name = aragrup_item.text(1)
-                        
-                        if aragrup_name not in existing_categories:
-                            response = requests.post(
-                                f"{url}/wp-json/wc/v3/products/categories",
-                                auth=(consumer_key, consumer_secret),
-                                json={"name": aragrup_name, "parent": grup_id}
-                            )
-                            
-                            if response.status_code == 201:
-                                aragrup_id = response.json()['id']
-                                existing_categories[aragrup_name] = aragrup_id
-                        
-                        aragrup_id = existing_categories.get(aragrup_name)
-                        
-                        # Alt grupları ekle
-                        for k in range(aragrup_item.childCount()):
-                            altgrup_item = aragrup_item.child(k)
-                            altgrup_name = altgrup_item.text(1)
-                            
-                            if altgrup_name not in existing_categories:
-                                response = requests.post(
-                                    f"{url}/wp-json/wc/v3/products/categories",
-                                    auth=(consumer_key, consumer_secret),
-                                    json={"name": altgrup_name, "parent": aragrup_id}
-                                )
-                
-                # Kategorileri yeniden yükle
-                self.load_woo_categories()
-                QMessageBox.information(self, 'Başarılı', 'Kategoriler senkronize edildi!')
-                
+            def send_batch(data):
+                response = get_transport().post(
+                    f"{url}/wp-json/wc/v3/products/categories/batch",
+                    auth=auth,
+                    json=data
+                )
+                response.raise_for_status()
+                return response.json()
+            
+            # Ağaçtaki Wolvox kategorilerini ad yollarına çevir
+            paths = []
+            for i in range(self.wolvox_tree.topLevelItemCount()):
+                grup_item = self.wolvox_tree.topLevelItem(i)
+                grup_path = (grup_item.text(1),)
+                paths.append(grup_path)
+                for j in range(grup_item.childCount()):
+                    aragrup_item = grup_item.child(j)
+                    aragrup_path = grup_path + (aragrup_item.text(1),)
+                    paths.append(aragrup_path)
+                    for k in range(aragrup_item.childCount()):
+                        paths.append(aragrup_path + (aragrup_item.child(k).text(1),))
+            
+            # Elle başlatılan senkronizasyonda ağaç özeti kontrol edilmez
+            result = CategoryTreeSync(list_page, send_batch).sync(paths, force=True)
+            
+            # Kategorileri yeniden yükle
+            self.load_woo_categories()
+            if result['failed']:
+                QMessageBox.warning(self, 'Uyarı', f"{result['failed']} kategori senkronize edilemedi!")
             else:
-                QMessageBox.warning(self, 'Uyarı', 'WooCommerce kategorileri alınamadı!')
+                QMessageBox.information(self, 'Başarılı', 'Kategoriler senkronize edildi!')
                 
         except Exception as e:
             QMessageBox.warning(self, 'Uyarı', f'Kategori senkronizasyonu sırasında hata: {str(e)}')
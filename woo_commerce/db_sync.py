@@ -6,11 +6,15 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
 
-import fdb
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
 
+from wolvox.connection_pool import get_pool
+from wolvox.product import WolvoxProduct
+from wolvox.stock_ledger import get_stock_ledger
+from wolvox.statement_cache import get_statement_cache
+
 # Logging ayarları
 logging.basicConfig(
     level=logging.INFO,
@@ -23,39 +27,48 @@ logging.basicConfig(
 
 logger = logging.getLogger('DBSync')
 
+# STOK sorgularındaki sütun sırası
+PRODUCT_COLUMNS = (
+    'stok_kodu', 'stok_adi', 'barkod', 'birim', 'kdv_orani', 'marka', 'model',
+    'aciklama', 'resim_yolu', 'kategori', 'webde_gorunsun', 'aktif', 'blkodu'
+)
+
 class DBSync:
     def __init__(self):
         load_dotenv()
         self.db_path = os.getenv('DB_PATH')
-        self.connection = None
+        self.pool = None
+        self.ledger = None
         
     def connect(self):
-        """Veritabanına bağlanır"""
+        """Veritabanı bağlantı havuzunu hazırlar
+
+        Bağlantı burada tutulmaz; her işlem havuzdan bağlantı alıp iş
+        bitince iade eder.
+        """
         try:
-            self.connection = fdb.connect(
+            self.pool = get_pool(
                 dsn=self.db_path,
                 user='SYSDBA',
                 password='masterkey'
             )
-            logger.info("Veritabanı bağlantısı başarılı")
+            self.ledger = get_stock_ledger(self.pool)
+            logger.info("Veritabanı bağlantı havuzu hazır")
             return True
         except Exception as e:
             logger.error(f"Veritabanı bağlantısı başarısız: {str(e)}")
             return False
     
     def disconnect(self):
-        """Veritabanı bağlantısını kapatır"""
-        if self.connection:
-            self.connection.close()
-            logger.info("Veritabanı bağlantısı kapatıldı")
+        """Havuz referansını bırakır (bağlantılar işlem sonunda zaten iade edilir)"""
+        self.pool = None
+        self.ledger = None
     
     def get_tire_products(self):
         """Lastik ürünlerini getirir"""
         try:
-            if not self.connection:
+            if not self.pool:
                 self.connect()
-                
-            cursor = self.connection.cursor()
             
             query = """
                 SELECT 
@@ -71,38 +84,29 @@ class DBSync:
                     s.GRUBU,
                     s.WEBDE_GORUNSUN,
                     s.AKTIF,
-                    s.BLKODU,
-                    (
-                        SELECT COALESCE(SUM(CASE WHEN sh.TUTAR_TURU = 0 THEN sh.MIKTARI ELSE -sh.MIKTARI END), 0)
-                        FROM STOKHR sh
-                        WHERE sh.BLSTKODU = s.BLKODU
-                    ) as STOK_MIKTARI
+                    s.BLKODU
                 FROM STOK s
                 WHERE s.STOK_ADI LIKE '%LASTİ%'
                 OR s.STOK_ADI LIKE '%LASTIK%'
                 OR s.STOK_ADI LIKE '%LASTİK%'
             """
             
-            cursor.execute(query)
-            products = []
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(query)
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
             
-            for row in cursor.fetchall():
-                product = {
-                    'sku': row[0],
-                    'name': row[1],
-                    'barcode': row[2],
-                    'unit': row[3],
-                    'tax_rate': row[4],
-                    'brand': row[5],
-                    'model': row[6],
-                    'description': row[7],
-                    'image_path': row[8],
-                    'group': row[9],
-                    'show_on_web': row[10],
-                    'active': row[11],
-                    'bl_code': row[12],
-                    'stock': float(row[13]) if row[13] else 0,
-                }
+            # Stok miktarları sync.db stok defterinden
+            stocks = self.ledger.get_totals([row[0].strip() for row in rows if row[0]])
+            
+            products = []
+            build = WolvoxProduct.row_factory(PRODUCT_COLUMNS)
+            for row in rows:
+                product = build(row)
+                product.bakiye = stocks.get(product.stok_kodu, 0) if product.stok_kodu else 0
                 products.append(product)
             
             logger.info(f"Toplam {len(products)} lastik ürünü bulundu")
@@ -111,17 +115,12 @@ class DBSync:
         except Exception as e:
             logger.error(f"Ürünler getirilirken hata oluştu: {str(e)}")
             raise
-        finally:
-            if cursor:
-                cursor.close()
     
     def get_product_by_sku(self, sku):
         """SKU'ya göre ürün bilgilerini getirir"""
         try:
-            if not self.connection:
+            if not self.pool:
                 self.connect()
-                
-            cursor = self.connection.cursor()
             
             query = """
                 SELECT 
@@ -137,36 +136,17 @@ class DBSync:
                     s.GRUBU,
                     s.WEBDE_GORUNSUN,
                     s.AKTIF,
-                    s.BLKODU,
-                    (
-                        SELECT COALESCE(SUM(CASE WHEN sh.TUTAR_TURU = 0 THEN sh.MIKTARI ELSE -sh.MIKTARI END), 0)
-                        FROM STOKHR sh
-                        WHERE sh.BLSTKODU = s.BLKODU
-                    ) as STOK_MIKTARI
+                    s.BLKODU
                 FROM STOK s
                 WHERE s.STOKKODU = ?
             """
             
-            cursor.execute(query, (sku,))
-            row = cursor.fetchone()
+            with self.pool.connection() as conn:
+                row = get_statement_cache(conn).execute(query, (sku,)).fetchone()
             
             if row:
-                product = {
-                    'sku': row[0],
-                    'name': row[1],
-                    'barcode': row[2],
-                    'unit': row[3],
-                    'tax_rate': row[4],
-                    'brand': row[5],
-                    'model': row[6],
-                    'description': row[7],
-                    'image_path': row[8],
-                    'group': row[9],
-                    'show_on_web': row[10],
-                    'active': row[11],
-                    'bl_code': row[12],
-                    'stock': float(row[13]) if row[13] else 0,
-                }
+                product = WolvoxProduct.row_factory(PRODUCT_COLUMNS)(row)
+                product.bakiye = self.ledger.get_stock(product.stok_kodu)['total']
                 return product
             
             return None
@@ -174,9 +154,6 @@ class DBSync:
         except Exception as e:
             logger.error(f"Ürün bilgileri getirilirken hata oluştu: {str(e)}")
             raise
-        finally:
-            if cursor:
-                cursor.close()
 
 if __name__ == "__main__":
     # Test
@@ -1,4 +1,5 @@
 import sys
+from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QComboBox, QPushButton, QLabel, QScrollArea,
                            QMessageBox, QTabWidget, QTextEdit, QGroupBox, QLineEdit,
@@ -11,9 +12,16 @@ import json
 import os
 from dotenv import load_dotenv
 import fdb
-import requests
 from datetime import datetime
+
+# Ana dizini Python path'ine ekle
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
 from category_mapper import CategoryMapperWindow
+from wolvox.connection_pool import get_pool
+from src.core.http_transport import get_transport
+from src.core.woo_fields import with_fields
 
 class CustomRuleDialog(QDialog):
     def __init__(self, parent=None):
@@ -505,10 +513,10 @@ class FieldMapperWindow(QMainWindow):
             consumer_key = os.getenv('WOOCOMMERCE_CONSUMER_KEY')
             consumer_secret = os.getenv('WOOCOMMERCE_CONSUMER_SECRET')
             
-            response = requests.get(
+            response = get_transport().get(
                 f"{url}/wp-json/wc/v3/products",
                 auth=(consumer_key, consumer_secret),
-                params={'per_page': 1},
+                params=with_fields({'per_page': 1}, ['id']),
                 verify=False
             )
             
@@ -532,12 +540,12 @@ class FieldMapperWindow(QMainWindow):
             if fb_client_path and os.path.exists(fb_client_path):
                 fdb.load_api(fb_client_path)
             
-            # Veritabanı bağlantısı
-            con = fdb.connect(
+            # Bağlantıyı havuzdan al; con.close() havuza iade eder
+            con = get_pool(
                 dsn=f"{os.getenv('WOLVOX_DB_HOST')}:{os.getenv('WOLVOX_DB_PATH')}",
                 user=os.getenv('WOLVOX_DB_USER'),
                 password=os.getenv('WOLVOX_DB_PASSWORD')
-            )
+            ).acquire()
             return con
         except Exception as e:
             QMessageBox.critical(self, 'Hata', f'Veritabanı bağlantısı kurulamadı: {str(e)}')
@@ -175,7 +175,7 @@ class ProductManagerWindow(QMainWindow):
             woo_products = {}
             page = 1
             while True:
-                products = self.woo.list_products(page=page)
+                products = self.woo.list_products(page=page, per_page=100, fields='stock_price')
                 if not products:
                     break
                 for product in products:
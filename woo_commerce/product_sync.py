@@ -8,6 +8,9 @@ sys.path.append(str(root_dir))
 
 from woo_commerce.woocommerce_client import WooCommerceClient
 from wolvox.product_reader import WolvoxProductReader
+from src.database.fingerprints import FingerprintStore, payload_hash
+from src.core.batch_dispatcher import BatchDispatcher
+from src.core.batch_writer import ProductBatchWriter
 import logging
 from datetime import datetime
 import json
@@ -28,6 +31,8 @@ class ProductSync:
     def __init__(self):
         self.woo = WooCommerceClient()
         self.wolvox = WolvoxProductReader()
+        self.fingerprints = FingerprintStore()
+        self.dispatcher = BatchDispatcher()
         self.load_category_mappings()
     
     def load_category_mappings(self):
@@ -124,7 +129,7 @@ class ProductSync:
             existing_products = {}
             page = 1
             while True:
-                products = self.woo.list_products(page=page)
+                products = self.woo.list_products(page=page, per_page=100, fields='index', cache='probe')
                 if not products:
                     break
                 
@@ -134,32 +139,58 @@ class ProductSync:
             
             logger.info(f"{len(existing_products)} adet mevcut WooCommerce ürünü bulundu")
             
+            # Oluşturma/güncellemeler products/batch istekleriyle gönderilir
+            def on_success(sku, action, item, fingerprint):
+                self.fingerprints.save(sku, fingerprint, item['id'])
+                if action == 'create':
+                    logger.info(f"Yeni ürün oluşturuldu: {sku}")
+                else:
+                    logger.info(f"Ürün güncellendi: {sku}")
+            
+            def on_failure(sku, action, message, fingerprint):
+                logger.error(f"Ürün senkronize edilirken hata: {sku} - {message}")
+            
+            writer = ProductBatchWriter(self.woo.batch_products, on_success=on_success, on_failure=on_failure,
+                                        dispatcher=self.dispatcher)
+            
             # Her ürün için senkronizasyon yap
+            skipped = 0
             for wolvox_product in wolvox_products:
                 try:
                     sku = wolvox_product['stok_kodu']
                     product_data = self.convert_to_woo_product(wolvox_product)
+                    fingerprint = payload_hash(product_data)
                     
                     if sku in existing_products:
-                        # Mevcut ürünü güncelle
                         product_id = existing_products[sku]
-                        self.update_existing_product(product_id, product_data)
-                        logger.info(f"Ürün güncellendi: {sku}")
+                        
+                        # Son gönderilen yükle aynıysa güncelleme yapılmaz
+                        if self.fingerprints.matches(sku, fingerprint):
+                            skipped += 1
+                            continue
+                        
+                        # Mevcut ürünü güncelle
+                        writer.update(sku, product_id, product_data, fingerprint)
                     else:
                         # Yeni ürün oluştur
-                        self.create_new_product(product_data)
-                        logger.info(f"Yeni ürün oluşturuldu: {sku}")
+                        writer.create(sku, product_data, fingerprint)
                     
                 except Exception as e:
                     logger.error(f"Ürün senkronize edilirken hata: {sku} - {str(e)}")
                     continue
             
-            logger.info("Ürün senkronizasyonu tamamlandı")
+            writer.flush()
+            failed = sum(1 for success, _ in writer.results if not success)
+            if failed:
+                logger.warning(f"{failed} ürün senkronize edilemedi")
+            
+            logger.info(f"Ürün senkronizasyonu tamamlandı ({skipped} ürün değişmediği için atlandı)")
             
         except Exception as e:
             logger.error(f"Ürün senkronizasyonu sırasında hata: {str(e)}")
             raise
         finally:
+            self.fingerprints.commit()
             self.wolvox.close()
     
     def sync_stock_quantities(self):
@@ -172,7 +203,7 @@ class ProductSync:
             existing_products = {}
             page = 1
             while True:
-                products = self.woo.list_products(page=page)
+                products = self.woo.list_products(page=page, per_page=100, fields='index', cache='probe')
                 if not products:
                     break
                 
@@ -207,7 +238,7 @@ class ProductSync:
         try:
             page = 1
             while True:
-                products = self.woo.list_products(page=page)
+                products = self.woo.list_products(page=page, per_page=100, fields='stock_price', cache=True)
                 if not products:
                     break
                     
@@ -266,7 +297,7 @@ class ProductSync:
             woo_products = {}
             page = 1
             while True:
-                products = self.woo.list_products(page=page)
+                products = self.woo.list_products(page=page, per_page=100, fields='index', cache='probe')
                 if not products:
                     break
                 
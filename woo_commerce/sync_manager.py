@@ -8,6 +8,8 @@ sys.path.append(str(root_dir))
 
 from woo_commerce.woocommerce_client import WooCommerceClient
 from woo_commerce.db_sync import DBSync
+from src.core.batch_dispatcher import BatchDispatcher
+from src.core.batch_writer import ProductBatchWriter
 import logging
 from datetime import datetime
 
@@ -27,6 +29,7 @@ class SyncManager:
     def __init__(self):
         self.woo = WooCommerceClient()
         self.db = DBSync()
+        self.dispatcher = BatchDispatcher()
         
     def sync_all_products(self):
         """Tüm ürünleri senkronize eder"""
@@ -40,13 +43,26 @@ class SyncManager:
             logger.info(f"Veritabanından {len(db_products)} ürün alındı")
             
             # WooCommerce'daki ürünleri al
-            woo_products = self.woo.list_products(per_page=100)
+            woo_products = self.woo.list_products(per_page=100, fields='index')
             
             # SKU'ya göre WooCommerce ürünlerini maple
             woo_products_map = {p['sku']: p for p in woo_products if p['sku']}
             
-            updated_count = 0
-            created_count = 0
+            counts = {'create': 0, 'update': 0}
+            
+            def on_success(sku, action, item, name):
+                counts[action] += 1
+                if action == 'create':
+                    logger.info(f"Yeni ürün oluşturuldu: {name} (SKU: {sku})")
+                else:
+                    logger.info(f"Ürün güncellendi: {name} (SKU: {sku})")
+            
+            def on_failure(sku, action, message, name):
+                logger.error(f"Ürün senkronizasyonunda hata: {name} (SKU: {sku}) - {message}")
+            
+            # Oluşturma/güncellemeler products/batch istekleriyle gönderilir
+            writer = ProductBatchWriter(self.woo.batch_products, on_success=on_success, on_failure=on_failure,
+                                        dispatcher=self.dispatcher)
             
             # Her ürün için kontrol et
             for db_product in db_products:
@@ -55,17 +71,19 @@ class SyncManager:
                     if db_product['sku'] in woo_products_map:
                         # Ürünü güncelle
                         woo_product = woo_products_map[db_product['sku']]
-                        self._update_product(woo_product['id'], db_product)
-                        updated_count += 1
+                        self._update_product(writer, woo_product['id'], db_product)
                     else:
                         # Yeni ürün oluştur
-                        self._create_product(db_product)
-                        created_count += 1
+                        self._create_product(writer, db_product)
                         
                 except Exception as e:
                     logger.error(f"Ürün senkronizasyonunda hata: {str(e)}")
                     continue
             
+            writer.flush()
+            created_count = counts['create']
+            updated_count = counts['update']
+            
             logger.info(f"Senkronizasyon tamamlandı: {created_count} yeni ürün, {updated_count} güncelleme")
             
         except Exception as e:
@@ -85,7 +103,7 @@ class SyncManager:
             db_products = self.db.get_tire_products()
             
             # WooCommerce'daki ürünleri al
-            woo_products = self.woo.list_products(per_page=100)
+            woo_products = self.woo.list_products(per_page=100, fields='stock_price')
             
             # SKU'ya göre WooCommerce ürünlerini maple
             woo_products_map = {p['sku']: p for p in woo_products if p['sku']}
@@ -118,8 +136,8 @@ class SyncManager:
         finally:
             self.db.disconnect()
     
-    def _create_product(self, db_product):
-        """Yeni ürün oluşturur"""
+    def _create_product(self, writer, db_product):
+        """Yeni ürünü toplu oluşturma kuyruğuna ekler"""
         product_data = {
             'name': db_product['name'],
             'sku': db_product['sku'],
@@ -156,11 +174,10 @@ class SyncManager:
             ]
         }
         
-        self.woo.create_product(product_data)
-        logger.info(f"Yeni ürün oluşturuldu: {db_product['name']} (SKU: {db_product['sku']})")
+        writer.create(db_product['sku'], product_data, db_product['name'])
     
-    def _update_product(self, product_id, db_product):
-        """Mevcut ürünü günceller"""
+    def _update_product(self, writer, product_id, db_product):
+        """Mevcut ürünü toplu güncelleme kuyruğuna ekler"""
         product_data = {
             'name': db_product['name'],
             'regular_price': str(db_product['price']),
@@ -194,8 +211,7 @@ class SyncManager:
             ]
         }
         
-        self.woo.update_product(product_id, product_data)
-        logger.info(f"Ürün güncellendi: {db_product['name']} (SKU: {db_product['sku']})")
+        writer.update(db_product['sku'], product_id, product_data, db_product['name'])
 
 if __name__ == "__main__":
     # Test
@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 import logging
 from datetime import datetime
 
+from src.core.http_transport import get_transport
+from src.core.woo_fields import with_fields
+
 # Logging ayarları
 logging.basicConfig(
     level=logging.INFO,
@@ -25,19 +28,21 @@ class WooCommerceClient:
         self.consumer_key = os.getenv('WOOCOMMERCE_CONSUMER_KEY')
         self.consumer_secret = os.getenv('WOOCOMMERCE_CONSUMER_SECRET')
         self.base_url = f"{self.url}/wp-json/wc/v3"
+        self.transport = get_transport()
         
-    def _make_request(self, endpoint, method='GET', data=None, params=None):
-        """API isteklerini yönetir"""
+    def _make_request(self, endpoint, method='GET', data=None, params=None, cache=False):
+        """API isteklerini yönetir (cache için bkz. HttpTransport.request)"""
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = requests.request(
-                method=method,
-                url=url,
+            response = self.transport.request(
+                method,
+                url,
                 auth=HTTPBasicAuth(self.consumer_key, self.consumer_secret),
                 json=data if data else None,
                 params=params if params else None,
-                verify=False
+                verify=False,
+                cache=cache
             )
             
             response.raise_for_status()
@@ -49,26 +54,41 @@ class WooCommerceClient:
                 logger.error(f"API yanıtı: {e.response.text}")
             raise
     
-    def list_products(self, page=1, per_page=10):
-        """Ürünleri listeler"""
+    def list_products(self, page=1, per_page=10, fields='full', cache=False):
+        """Ürünleri listeler
+
+        fields yanıtı WooCommerce _fields ile daraltır: 'index',
+        'stock_price', 'full' ya da alan adları listesi
+        (bkz. src.core.woo_fields). cache='probe' ile değişmemiş sayfalar
+        yerel önbellekten verilir.
+        """
         try:
             params = {
                 'page': page,
                 'per_page': per_page
             }
-            return self._make_request('products', params=params)
+            return self._make_request('products', params=with_fields(params, fields), cache=cache)
         except Exception as e:
             logger.error(f"Ürünler listelenirken hata oluştu: {str(e)}")
             raise
     
-    def get_product(self, product_id):
+    def get_product(self, product_id, fields='full'):
         """Belirli bir ürünün detaylarını getirir"""
         try:
-            return self._make_request(f'products/{product_id}')
+            return self._make_request(f'products/{product_id}', params=with_fields(None, fields))
         except Exception as e:
             logger.error(f"Ürün detayları alınırken hata oluştu: {str(e)}")
             raise
     
+    def get_product_by_sku(self, sku, fields='full'):
+        """SKU'ya göre ürünü getirir (bulunamazsa None)"""
+        try:
+            products = self._make_request('products', params=with_fields({'sku': sku}, fields))
+            return products[0] if products else None
+        except Exception as e:
+            logger.error(f"Ürün SKU ile alınırken hata oluştu: {str(e)}")
+            raise
+    
     def create_product(self, product_data):
         """Yeni ürün oluşturur"""
         try:
@@ -85,6 +105,14 @@ class WooCommerceClient:
             logger.error(f"Ürün güncellenirken hata oluştu: {str(e)}")
             raise
     
+    def batch_products(self, data):
+        """Ürünleri toplu oluşturur/günceller ({'create': [...], 'update': [...]})"""
+        try:
+            return self._make_request('products/batch', method='POST', data=data)
+        except Exception as e:
+            logger.error(f"Toplu ürün isteği başarısız: {str(e)}")
+            raise
+    
     def update_product_stock(self, product_id, stock_quantity):
         """Ürün stok miktarını günceller"""
         try:
@@ -96,10 +124,10 @@ class WooCommerceClient:
             logger.error(f"Stok güncellenirken hata oluştu: {str(e)}")
             raise
     
-    def get_product_categories(self):
+    def get_product_categories(self, fields='full'):
         """Ürün kategorilerini listeler"""
         try:
-            return self._make_request('products/categories')
+            return self._make_request('products/categories', params=with_fields(None, fields))
         except Exception as e:
             logger.error(f"Kategoriler listelenirken hata oluştu: {str(e)}")
             raise
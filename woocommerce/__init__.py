@@ -1,4 +1,11 @@
 from .wc_client import WooCommerceClient
 from .sync_manager import WooCommerceSyncManager
 
-__all__ = ['WooCommerceClient', 'WooCommerceSyncManager']
+__all__ = ['WooCommerceClient', 'AsyncWooCommerceClient', 'WooCommerceSyncManager']
+
+def __getattr__(name):
+    # httpx yalnızca asenkron istemci kullanıldığında gerekir
+    if name == 'AsyncWooCommerceClient':
+        from .async_client import AsyncWooCommerceClient
+        return AsyncWooCommerceClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,220 @@
+import asyncio
+import importlib.util
+import logging
+from typing import Dict, List, Optional, Union
+from datetime import datetime
+
+import httpx
+
+from src.core.http_transport import woo_rate_limiter
+from src.core.woo_fields import Fields, with_fields
+
+logger = logging.getLogger(__name__)
+
+class AsyncWooCommerceClient:
+    def __init__(self, url: str, consumer_key: str, consumer_secret: str,
+                 max_concurrency: int = 20, max_connections: int = 20,
+                 http2: bool = False, timeout: float = 60.0):
+        """asyncio tabanlı WooCommerce API istemcisi
+
+        WooCommerceClient ile aynı metotları coroutine olarak sunar. Tek bir
+        httpx.AsyncClient üzerinden bağlantılar havuzlanır ve keep-alive ile
+        yeniden kullanılır; http2 açıksa istekler aynı bağlantı üzerinde
+        çoklanır (h2 paketi gerekir, yoksa HTTP/1.1 kullanılır). Aynı anda
+        yürütülen istek sayısı max_concurrency ile sınırlanır; istek hızı
+        senkron istemcilerle paylaşılan WOO_RATE_LIMIT kovasıyla sınırlanır.
+
+        Args:
+            url: WooCommerce site URL'si
+            consumer_key: API Consumer Key
+            consumer_secret: API Consumer Secret
+            max_concurrency: Eşzamanlı istek sınırı
+            max_connections: Havuzdaki en fazla bağlantı
+            http2: HTTP/2 kullanılsın mı
+            timeout: İstek zaman aşımı (saniye)
+        """
+        self.url = url.rstrip('/')
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.api_url = f"{self.url}/wp-json/wc/v3"
+        self.auth = (consumer_key, consumer_secret)
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.rate_limiter = woo_rate_limiter()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = self.http2
+            if http2:
+                if importlib.util.find_spec('h2') is None:
+                    logger.warning("h2 paketi bulunamadı, HTTP/1.1 kullanılacak")
+                    http2 = False
+            self._client = httpx.AsyncClient(
+                base_url=self.api_url,
+                auth=self.auth,
+                http2=http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Optional[Union[Dict, List]]:
+        """API isteği gönder
+
+        Args:
+            method: HTTP metodu (GET, POST, PUT, DELETE)
+            endpoint: API endpoint'i
+            params: URL parametreleri
+            data: POST/PUT için veri
+
+        Returns:
+            API yanıtı
+        """
+        client = self._get_client()
+        try:
+            async with self._semaphore:
+                await self.rate_limiter.acquire_async()
+                response = await client.request(method, endpoint, params=params, json=data)
+            self.rate_limiter.on_response(response.status_code, response.headers.get('Retry-After'))
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"WooCommerce API hatası: {str(e)}")
+            return None
+
+    async def close(self):
+        """Bağlantı havuzunu kapat"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def __aenter__(self):
+        self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def get_product_by_sku(self, sku: str, fields: Fields = 'full') -> Optional[Dict]:
+        """SKU'ya göre ürün getir (fields için bkz. WooCommerceClient)"""
+        params = with_fields({'sku': sku}, fields)
+        products = await self._make_request('GET', 'products', params=params)
+        if products and len(products) > 0:
+            return products[0]
+        return None
+
+    async def list_products(self, page: int = 1, per_page: int = 100, fields: Fields = 'full', **params) -> Optional[List[Dict]]:
+        """Ürünleri sayfa sayfa getir"""
+        params.update({'page': page, 'per_page': per_page})
+        return await self._make_request('GET', 'products', params=with_fields(params, fields))
+
+    async def get_products_by_skus(self, skus: List[str], fields: Fields = 'full') -> Optional[List[Dict]]:
+        """Birden çok SKU'yu tek istekte getir (virgülle ayrılmış sku filtresi)"""
+        params = with_fields({'sku': ','.join(skus), 'per_page': 100}, fields)
+        return await self._make_request('GET', 'products', params=params)
+
+    async def create_product(self, data: Dict) -> Optional[Dict]:
+        """Yeni ürün oluştur"""
+        return await self._make_request('POST', 'products', data=data)
+
+    async def update_product(self, product_id: int, data: Dict) -> Optional[Dict]:
+        """Ürün güncelle"""
+        return await self._make_request('PUT', f'products/{product_id}', data=data)
+
+    async def get_categories(self, fields: Fields = 'full') -> Optional[List[Dict]]:
+        """Tüm kategorileri getir"""
+        return await self._make_request('GET', 'products/categories', params=with_fields({'per_page': 100}, fields))
+
+    async def list_categories(self, page: int = 1, per_page: int = 100, fields: Fields = 'full', **params) -> Optional[List[Dict]]:
+        """Kategorileri sayfa sayfa getir"""
+        params.update({'page': page, 'per_page': per_page})
+        return await self._make_request('GET', 'products/categories', params=with_fields(params, fields))
+
+    async def create_category(self, name: str, parent: int = 0) -> Optional[Dict]:
+        """Yeni kategori oluştur"""
+        data = {
+            'name': name,
+            'parent': parent
+        }
+        return await self._make_request('POST', 'products/categories', data=data)
+
+    async def update_stock(self, product_id: int, quantity: int, manage_stock: bool = True) -> Optional[Dict]:
+        """Stok miktarını güncelle"""
+        data = {
+            'stock_quantity': quantity,
+            'manage_stock': manage_stock,
+            'stock_status': 'instock' if quantity > 0 else 'outofstock'
+        }
+        return await self.update_product(product_id, data)
+
+    async def update_price(self, product_id: int, regular_price: str, sale_price: Optional[str] = None) -> Optional[Dict]:
+        """Fiyat güncelle"""
+        data = {
+            'regular_price': regular_price
+        }
+        if sale_price:
+            data['sale_price'] = sale_price
+        return await self.update_product(product_id, data)
+
+    async def batch_update_products(self, updates: List[Dict]) -> Optional[Dict]:
+        """Toplu ürün güncelleme"""
+        return await self.batch_products({'update': updates})
+
+    async def batch_products(self, data: Dict) -> Optional[Dict]:
+        """Toplu ürün oluşturma/güncelleme ({'create': [...], 'update': [...]})"""
+        return await self._make_request('POST', 'products/batch', data=data)
+
+    async def get_product_variations(self, product_id: int, fields: Fields = 'full') -> Optional[List[Dict]]:
+        """Ürün varyasyonlarını getir"""
+        return await self._make_request('GET', f'products/{product_id}/variations', params=with_fields(None, fields))
+
+    async def list_product_variations(self, product_id: int, page: int = 1, per_page: int = 100,
+                                      fields: Fields = 'full', **params) -> Optional[List[Dict]]:
+        """Ürün varyasyonlarını sayfa sayfa getir"""
+        params.update({'page': page, 'per_page': per_page})
+        return await self._make_request('GET', f'products/{product_id}/variations', params=with_fields(params, fields))
+
+    async def create_product_variation(self, product_id: int, data: Dict) -> Optional[Dict]:
+        """Ürün varyasyonu oluştur"""
+        return await self._make_request('POST', f'products/{product_id}/variations', data=data)
+
+    async def update_product_variation(self, product_id: int, variation_id: int, data: Dict) -> Optional[Dict]:
+        """Ürün varyasyonu güncelle"""
+        return await self._make_request('PUT', f'products/{product_id}/variations/{variation_id}', data=data)
+
+    async def batch_update_variations(self, product_id: int, updates: List[Dict]) -> Optional[Dict]:
+        """Toplu varyasyon güncelleme"""
+        return await self.batch_variations(product_id, {'update': updates})
+
+    async def batch_variations(self, product_id: int, data: Dict) -> Optional[Dict]:
+        """Toplu varyasyon oluşturma/güncelleme"""
+        return await self._make_request('POST', f'products/{product_id}/variations/batch', data=data)
+
+    async def get_orders(self, status: Optional[str] = None, after: Optional[datetime] = None,
+                         fields: Fields = 'full') -> Optional[List[Dict]]:
+        """Siparişleri getir"""
+        params = with_fields({'per_page': 100}, fields)
+        if status:
+            params['status'] = status
+        if after:
+            params['after'] = after.isoformat()
+        return await self._make_request('GET', 'orders', params=params)
+
+    async def update_order_status(self, order_id: int, status: str) -> Optional[Dict]:
+        """Sipariş durumunu güncelle"""
+        data = {'status': status}
+        return await self._make_request('PUT', f'orders/{order_id}', data=data)
+
+    async def batch_update_orders(self, updates: List[Dict]) -> Optional[Dict]:
+        """Toplu sipariş güncelleme (ör. [{'id': 1, 'status': 'completed'}])"""
+        return await self._make_request('POST', 'orders/batch', data={'update': updates})
@@ -0,0 +1,151 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.core.category_sync import normalize_name
+
+logger = logging.getLogger(__name__)
+
+class CategoryIndex:
+    def __init__(self, wc_client):
+        """WooCommerce kategori indeksi
+
+        Tüm kategoriler ilk kullanımda sayfa sayfa bir kez okunur; aramalar
+        bellekten yapılır. Kategoriler normalize edilmiş ada göre ve üst
+        kategori yoluna göre (kök -> kategori adları) indekslenir. Yeni
+        oluşturulan kategoriler indekse hemen eklenir. Tüm işlemler kilit
+        altında yapılır; aynı kategori farklı iş parçacıklarından iki kez
+        oluşturulmaz.
+
+        Args:
+            wc_client: WooCommerce API istemcisi
+        """
+        self.wc = wc_client
+        self._lock = threading.RLock()
+        self._categories: Optional[Dict[int, Dict]] = None  # id -> {'id', 'name', 'parent'}
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_parent: Dict[Tuple[int, str], int] = {}  # (üst ID, ad) -> ID
+
+    def _load(self):
+        if self._categories is not None:
+            return
+        categories = {}
+        page = 1
+        while True:
+            batch = self.wc.list_categories(page=page, per_page=100, fields='category', cache=True)
+            if batch is None:
+                raise Exception(f"Kategori listesi alınamadı (sayfa {page})")
+            for category in batch:
+                categories[category['id']] = category
+            if len(batch) < 100:
+                break
+            page += 1
+
+        self._categories = {}
+        self._by_name = {}
+        self._by_parent = {}
+        for category in sorted(categories.values(), key=lambda c: c['id']):
+            self._add(category)
+        logger.info(f"WooCommerce kategori indeksi yüklendi: {len(self._categories)} kategori")
+
+    def _add(self, category: Dict):
+        entry = {'id': category['id'], 'name': category['name'], 'parent': category.get('parent') or 0}
+        key = normalize_name(entry['name'])
+        self._categories[entry['id']] = entry
+        ids = self._by_name.setdefault(key, [])
+        if entry['id'] not in ids:
+            ids.append(entry['id'])
+        self._by_parent.setdefault((entry['parent'], key), entry['id'])
+
+    def invalidate(self):
+        """İndeksi boşalt; bir sonraki kullanımda yeniden yüklenir"""
+        with self._lock:
+            self._categories = None
+
+    def add(self, category: Optional[Dict]):
+        """WooCommerce yanıtındaki kategoriyi indekse ekle"""
+        if not category or 'id' not in category:
+            return
+        with self._lock:
+            self._load()
+            self._add(category)
+
+    def find(self, name: str, parent: Optional[int] = None) -> Optional[int]:
+        """Kategori ID'sini bul
+
+        Args:
+            name: Kategori adı
+            parent: Üst kategori ID'si (None ise herhangi bir üst kategori altında)
+
+        Returns:
+            Kategori ID'si (aynı adda birden çok kategori varsa en eskisi)
+        """
+        key = normalize_name(name)
+        with self._lock:
+            self._load()
+            if parent is None:
+                ids = self._by_name.get(key)
+                return ids[0] if ids else None
+            return self._by_parent.get((parent, key))
+
+    def find_path(self, path: List[str]) -> Optional[int]:
+        """Kökten başlayan ad yolundaki son kategorinin ID'sini bul"""
+        parent = 0
+        with self._lock:
+            self._load()
+            for name in path:
+                parent = self._by_parent.get((parent, normalize_name(name)))
+                if parent is None:
+                    return None
+        return parent or None
+
+    def path(self, category_id: int) -> List[str]:
+        """Kategorinin kökten itibaren ad yolu"""
+        names = []
+        with self._lock:
+            self._load()
+            seen = set()
+            while category_id and category_id in self._categories and category_id not in seen:
+                seen.add(category_id)
+                category = self._categories[category_id]
+                names.append(category['name'])
+                category_id = category['parent']
+        return list(reversed(names))
+
+    def get_or_create(self, name: str, parent: Optional[int] = None) -> Optional[int]:
+        """Kategoriyi bul, yoksa oluştur
+
+        Args:
+            name: Kategori adı
+            parent: Üst kategori ID'si (None ise ad her yerde aranır, yoksa
+                kök kategori olarak oluşturulur)
+
+        Returns:
+            Kategori ID'si; oluşturulamazsa None
+        """
+        with self._lock:
+            category_id = self.find(name, parent)
+            if category_id:
+                return category_id
+
+            new_category = self.wc.create_category(name.strip(), parent or 0)
+            if new_category:
+                self._add(new_category)
+                return new_category['id']
+
+            # Kategori başka bir süreç tarafından oluşturulmuş olabilir
+            logger.warning(f"Kategori oluşturulamadı, indeks yenileniyor: {name}")
+            self._categories = None
+            return self.find(name, parent)
+
+    def get_or_create_path(self, path: List[str]) -> Optional[int]:
+        """Ad yolundaki kategorileri sırayla bul veya oluştur, son kategorinin ID'sini döndür"""
+        parent = 0
+        with self._lock:
+            for name in path:
+                if not name or not name.strip():
+                    continue
+                parent = self.get_or_create(name, parent)
+                if not parent:
+                    return None
+        return parent or None
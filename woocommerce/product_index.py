@@ -0,0 +1,235 @@
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from src.database.connection import DatabaseManager
+from src.database.models import WooProductIndex
+from src.database.sync_state import get_sync_state, set_sync_state
+
+logger = logging.getLogger(__name__)
+
+# Gruplu SKU sorgularında istek başına SKU sayısı (URL uzunluğu sınırı)
+SKU_LOOKUP_CHUNK = 50
+
+class ProductIndex:
+    STATE_KEY = 'woo_product_index.built_at'
+
+    def __init__(self, wc_client, missing_ttl: float = 300.0):
+        """WooCommerce SKU -> ürün ID indeksi
+
+        Katalog bir kez sayfa sayfa okunup sync.db'ye kaydedilir; aramalar
+        bellekteki sözlükten yapılır. Oluşturma/güncelleme yanıtları indeksi
+        günceller, indekste olmayan SKU'lar gruplu sku sorgularıyla çözülür.
+
+        Kayıtlar {'product_id', 'variation_id', 'parent_id'} biçimindedir;
+        varyasyonlarda product_id ve parent_id ana ürünün ID'sidir.
+
+        WooCommerce'de bulunamayan SKU'lar missing_ttl saniye boyunca tekrar
+        sorgulanmaz; ürün bu sürede başka bir yoldan (yönetim paneli, başka
+        bir süreç) oluşturulursa sonraki sorguda bulunur.
+
+        Args:
+            wc_client: WooCommerce API istemcisi
+            missing_ttl: Bulunamayan SKU kaydının geçerlilik süresi (saniye)
+        """
+        self.wc = wc_client
+        self.db = DatabaseManager()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self.missing_ttl = missing_ttl
+        self._missing: Dict[str, float] = {}  # WooCommerce'de bulunamayan SKU -> sorgu zamanı
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict]:
+        with self._lock:
+            if self._entries is None:
+                with self.db.session_scope() as session:
+                    self._entries = {
+                        sku: {'product_id': product_id, 'variation_id': variation_id, 'parent_id': parent_id}
+                        for sku, product_id, variation_id, parent_id in session.query(
+                            WooProductIndex.sku,
+                            WooProductIndex.product_id,
+                            WooProductIndex.variation_id,
+                            WooProductIndex.parent_id
+                        ).all()
+                    }
+            return self._entries
+
+    @staticmethod
+    def _entry(item: Dict, parent_id: Optional[int] = None) -> Dict:
+        # products?sku= aramaları varyasyon da döndürebilir; ana ürün parent_id'dedir
+        if not parent_id and item.get('type') == 'variation':
+            parent_id = item.get('parent_id') or None
+        if parent_id:
+            return {'product_id': parent_id, 'variation_id': item['id'], 'parent_id': parent_id}
+        return {'product_id': item['id'], 'variation_id': None, 'parent_id': item.get('parent_id') or None}
+
+    def _save(self, entries: Dict[str, Dict]):
+        skus = list(entries)
+        with self.db.session_scope() as session:
+            rows = {}
+            for i in range(0, len(skus), 500):
+                for row in session.query(WooProductIndex).filter(
+                    WooProductIndex.sku.in_(skus[i:i + 500])
+                ).all():
+                    rows[row.sku] = row
+            for sku, entry in entries.items():
+                row = rows.get(sku)
+                if row is None:
+                    session.add(WooProductIndex(sku=sku, **entry))
+                else:
+                    row.product_id = entry['product_id']
+                    row.variation_id = entry['variation_id']
+                    row.parent_id = entry['parent_id']
+
+    def is_built(self) -> bool:
+        """İndeks en az bir kez katalogdan oluşturulmuş mu"""
+        return get_sync_state(self.STATE_KEY) is not None
+
+    def ensure_built(self):
+        """İndeks yoksa katalogdan oluştur"""
+        if not self.is_built():
+            self.build()
+
+    def build(self, include_variations: bool = True) -> int:
+        """Tüm kataloğu sayfa sayfa okuyup indeksi yeniden oluştur
+
+        Args:
+            include_variations: Değişken ürünlerin varyasyonları da indekslensin mi
+
+        Returns:
+            İndekslenen SKU sayısı
+        """
+        entries = {}
+        page = 1
+        while True:
+            products = self.wc.list_products(page=page, per_page=100, fields='index', cache='probe')
+            if products is None:
+                raise Exception(f"Ürün listesi alınamadı (sayfa {page})")
+            for product in products:
+                if product.get('sku'):
+                    entries[product['sku']] = self._entry(product)
+                if include_variations and product.get('type') == 'variable':
+                    entries.update(self._read_variations(product['id']))
+            if len(products) < 100:
+                break
+            page += 1
+
+        with self.db.session_scope() as session:
+            session.query(WooProductIndex).delete(synchronize_session=False)
+            session.bulk_insert_mappings(WooProductIndex, [
+                dict(entry, sku=sku) for sku, entry in entries.items()
+            ])
+
+        with self._lock:
+            self._entries = entries
+            self._missing.clear()
+
+        set_sync_state(self.STATE_KEY, datetime.now().isoformat())
+        logger.info(f"WooCommerce ürün indeksi oluşturuldu: {len(entries)} SKU")
+        return len(entries)
+
+    def _read_variations(self, product_id: int) -> Dict[str, Dict]:
+        entries = {}
+        page = 1
+        while True:
+            variations = self.wc.list_product_variations(product_id, page=page, per_page=100,
+                                                     fields='index', cache='probe')
+            if variations is None:
+                raise Exception(f"Varyasyonlar alınamadı: {product_id}")
+            for variation in variations:
+                if variation.get('sku'):
+                    entries[variation['sku']] = self._entry(variation, parent_id=product_id)
+            if len(variations) < 100:
+                break
+            page += 1
+        return entries
+
+    def get(self, sku: str) -> Optional[Dict]:
+        """SKU'nun indeks kaydını getir (yalnızca bellek)"""
+        return self._load().get(sku)
+
+    def get_product_id(self, sku: str) -> Optional[int]:
+        """SKU'nun ürün ID'sini getir (yalnızca bellek)"""
+        entry = self.get(sku)
+        return entry['product_id'] if entry else None
+
+    def resolve(self, skus: Iterable[str]) -> Dict[str, Dict]:
+        """SKU'ların indeks kayıtlarını getir
+
+        İndekste olmayan SKU'lar SKU_LOOKUP_CHUNK'lık gruplar halinde
+        WooCommerce'den sorgulanır; bulunamayanlar missing_ttl boyunca
+        tekrar sorgulanmaz.
+
+        Args:
+            skus: Ürün stok kodları
+
+        Returns:
+            {sku: kayıt} (WooCommerce'de olmayanlar yer almaz)
+        """
+        entries = self._load()
+        wanted = list(dict.fromkeys(sku for sku in skus if sku))
+
+        now = time.monotonic()
+        with self._lock:
+            misses = [
+                sku for sku in wanted
+                if sku not in entries and now - self._missing.get(sku, float('-inf')) > self.missing_ttl
+            ]
+
+        found = {}
+        for i in range(0, len(misses), SKU_LOOKUP_CHUNK):
+            chunk = misses[i:i + SKU_LOOKUP_CHUNK]
+            products = self.wc.get_products_by_skus(chunk, fields='index')
+            if products is None:
+                # İstek başarısızsa SKU'lar eksik sayılmaz; sonraki çağrıda tekrar denenir
+                continue
+            for product in products:
+                if product.get('sku') in chunk:
+                    found[product['sku']] = self._entry(product)
+            with self._lock:
+                checked_at = time.monotonic()
+                self._missing.update((sku, checked_at) for sku in chunk if sku not in found)
+
+        if found:
+            self._save(found)
+            with self._lock:
+                entries.update(found)
+
+        return {sku: entries[sku] for sku in wanted if sku in entries}
+
+    def update_from_response(self, item: Optional[Dict], parent_id: Optional[int] = None):
+        """Oluşturma/güncelleme yanıtındaki ürünü indekse işle
+
+        Args:
+            item: WooCommerce ürün veya varyasyon yanıtı
+            parent_id: Varyasyon yanıtlarında ana ürün ID'si
+        """
+        if not item or not item.get('sku') or 'id' not in item:
+            return
+        entry = self._entry(item, parent_id)
+        entries = self._load()
+        with self._lock:
+            if entries.get(item['sku']) == entry:
+                return
+            entries[item['sku']] = entry
+            self._missing.pop(item['sku'], None)
+        self._save({item['sku']: entry})
+
+    def update_from_batch(self, response: Optional[Dict], parent_id: Optional[int] = None):
+        """Toplu işlem yanıtındaki başarılı kayıtları indekse işle"""
+        if not response:
+            return
+        for key in ('create', 'update'):
+            for item in response.get(key, []):
+                if 'error' not in item:
+                    self.update_from_response(item, parent_id)
+
+    def remove(self, sku: str):
+        """SKU'yu indeksten çıkar (ör. ürün WooCommerce'de silinmişse)"""
+        entries = self._load()
+        with self._lock:
+            entries.pop(sku, None)
+        with self.db.session_scope() as session:
+            session.query(WooProductIndex).filter_by(sku=sku).delete(synchronize_session=False)
@@ -1,10 +1,18 @@
 import logging
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
 
+from .category_index import CategoryIndex
+from .product_index import ProductIndex
 from .wc_client import WooCommerceClient
+from src.core.batch_dispatcher import BatchDispatcher
+from src.core.batch_writer import ProductBatchWriter
+from src.core.concurrency import get_concurrency_controller
 from wolvox.product_reader import ProductReader
+from src.database.fingerprints import FingerprintStore, payload_hash
+from src.database.pushed_state import PushedStockPriceStore, stock_price_values
 
 logger = logging.getLogger(__name__)
 
@@ -18,150 +26,361 @@ class WooCommerceSyncManager:
         """
         self.wc = wc_client
         self.reader = product_reader
+        self.fingerprints = FingerprintStore()
+        self.pushed = PushedStockPriceStore()
+        self.index = ProductIndex(wc_client)
+        self.categories = CategoryIndex(wc_client)
+        self.dispatcher = BatchDispatcher(on_progress=self._report_progress,
+                                          controller=get_concurrency_controller())
+
+    def close(self):
+        """Toplu istek havuzunu kapat (bekleyen istekler tamamlanır)"""
+        self.dispatcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
         
     def sync_product(self, wolvox_product: Dict) -> Tuple[bool, str]:
         """Tek bir ürünü senkronize et
 
+        Yükü son gönderilenle aynı olan ürünler için WooCommerce'e istek
+        yapılmaz.
+
         Args:
             wolvox_product: Wolvox'tan gelen ürün verisi
 
         Returns:
             (başarı durumu, mesaj)
         """
-        try:
-            # SKU'ya göre WooCommerce'de ara
-            sku = wolvox_product.get('STOK_KODU')
-            if not sku:
-                return False, "Stok kodu bulunamadı"
-                
-            wc_product = self.wc.get_product_by_sku(sku)
+        session = _WriteSession(self._product_writer)
+        self._queue_products(session, [wolvox_product])
+        return self._flush(session)[0]
+        
+    def _prepare_product(self, wolvox_product: Dict) -> Tuple[Optional[Dict], Optional[str], Optional[Tuple[bool, str]]]:
+        """Ürünün WooCommerce verisini ve parmak izini hazırla
+
+        Returns:
+            (ürün verisi, parmak izi, sonuç); gönderilmeyecek ürünlerde veri
+            None olur ve sonuç doğrudan raporlanır
+        """
+        sku = wolvox_product.get('STOK_KODU')
+        if not sku:
+            return None, None, (False, "Stok kodu bulunamadı")
+        
+        # Ürün verilerini hazırla
+        product_data = {
+            'name': wolvox_product.get('STOK_ADI', ''),
+            'sku': sku,
+            'regular_price': str(wolvox_product.get('SATIS_FIYATI1', '0')),
+            'manage_stock': True,
+            'stock_quantity': int(wolvox_product.get('BAKIYE', 0)),
+            'status': 'publish'
+        }
+        
+        # Açıklama varsa ekle
+        description = wolvox_product.get('ACIKLAMA')
+        if description:
+            product_data['description'] = description
             
-            # Ürün verilerini hazırla
-            product_data = {
-                'name': wolvox_product.get('STOK_ADI', ''),
-                'sku': sku,
-                'regular_price': str(wolvox_product.get('SATIS_FIYATI1', '0')),
-                'manage_stock': True,
-                'stock_quantity': int(wolvox_product.get('BAKIYE', 0)),
-                'status': 'publish'
-            }
+        category = wolvox_product.get('KATEGORI')
+        
+        # Kategori ID'si yerine adı özetlenir; değişmeyen ürün için kategori de aranmaz
+        fingerprint = payload_hash(dict(product_data, category=category))
+        if self.fingerprints.matches(sku, fingerprint):
+            return None, None, (True, f"Değişiklik yok: {sku}")
             
-            # Açıklama varsa ekle
-            description = wolvox_product.get('ACIKLAMA')
-            if description:
-                product_data['description'] = description
+        # Kategori varsa indeksten bul, yoksa oluştur
+        if category:
+            category_id = self.categories.get_or_create(category)
+            if category_id:
+                product_data['categories'] = [{'id': category_id}]
                 
-            # Kategori varsa ekle
-            category = wolvox_product.get('KATEGORI')
-            if category:
-                # Kategoriyi bul veya oluştur
-                categories = self.wc.get_categories()
-                category_id = None
-                
-                if categories:
-                    for cat in categories:
-                        if cat['name'].lower() == category.lower():
-                            category_id = cat['id']
-                            break
-                            
-                if not category_id:
-                    new_category = self.wc.create_category(category)
-                    if new_category:
-                        category_id = new_category['id']
-                        
-                if category_id:
-                    product_data['categories'] = [{'id': category_id}]
-            
-            if wc_product:
-                # Ürün varsa güncelle
-                product_id = wc_product['id']
-                updated_product = self.wc.update_product(product_id, product_data)
-                if updated_product:
-                    return True, f"Ürün güncellendi: {sku}"
-                else:
-                    return False, f"Ürün güncellenemedi: {sku}"
-            else:
-                # Ürün yoksa oluştur
-                new_product = self.wc.create_product(product_data)
-                if new_product:
-                    return True, f"Yeni ürün oluşturuldu: {sku}"
-                else:
-                    return False, f"Ürün oluşturulamadı: {sku}"
-                    
-        except Exception as e:
-            logger.error(f"Ürün senkronizasyon hatası: {str(e)}")
-            return False, f"Hata: {str(e)}"
+        return product_data, fingerprint, None
+        
+    def _product_writer(self, parent_id: Optional[int] = None) -> ProductBatchWriter:
+        """Ürünler (parent_id None) veya bir ana ürünün varyasyonları için toplu yazıcı"""
+        def on_success(sku: str, action: str, item: Dict, fingerprint: Optional[str]):
+            if action == 'create':
+                self.index.update_from_response(item, parent_id)
+            if fingerprint:
+                self.fingerprints.save(sku, fingerprint, item.get('id'))
+            # Hızlı şerit bir sonraki turda WooCommerce'deki değerlerle karşılaştırır
+            self.pushed.record(sku, item)
             
+        def on_failure(sku: str, action: str, message: str, fingerprint: Optional[str]):
+            logger.error(f"Ürün senkronizasyon hatası ({sku}): {message}")
+            if action == 'update':
+                # Ürün silinmiş olabilir; bir sonraki denemede SKU yeniden çözülür
+                self.index.remove(sku)
+                
+        if parent_id:
+            send_batch = lambda data: self.wc.batch_variations(parent_id, data)
+        else:
+            send_batch = self.wc.batch_products
+        return ProductBatchWriter(send_batch, on_success=on_success, on_failure=on_failure,
+                                  dispatcher=self.dispatcher)
+        
+    def _flush(self, session: '_WriteSession') -> List[Tuple[bool, str]]:
+        """Oturumu gönder, gönderilen özetleri ve stok/fiyat değerlerini kaydet"""
+        results = session.flush()
+        self.fingerprints.commit()
+        self.pushed.commit()
+        return results
+        
+    def _report_progress(self, completed: int, submitted: int):
+        logger.info(f"Toplu istek tamamlandı: {completed}/{submitted} "
+                    f"(eşzamanlılık: {self.dispatcher.max_in_flight})")
+        
     def sync_all_products(self) -> List[Tuple[bool, str]]:
         """Tüm ürünleri senkronize et
 
+        Ürünler okuyucudan akış olarak alınır ve 100'lük gruplar halinde
+        işlenir; indekste olmayan SKU'lar grup başına toplu çözülür ve
+        değişen ürünler products/batch istekleriyle eşzamanlı gönderilir;
+        eşzamanlı istek sayısı gecikme ve hatalara göre uyarlanır.
+
         Returns:
             [(başarı durumu, mesaj), ...]
         """
-        results = []
-        products = self.reader.get_all_products()
-        
-        if not products:
-            return [(False, "Ürün bulunamadı")]
+        session = _WriteSession(self._product_writer)
+        batch = []
+        # Kategoriler her tam senkronizasyonda bir kez yeniden okunur
+        self.categories.invalidate()
+        try:
+            self.index.ensure_built()
+            for product in self.reader.iter_products():
+                batch.append(product)
+                if len(batch) >= 100:
+                    self._queue_products(session, batch)
+                    batch = []
+        except Exception as e:
+            logger.error(f"Ürün okuma hatası: {str(e)}")
+            session.add((False, f"Hata: {str(e)}"))
             
-        for product in products:
-            result = self.sync_product(product)
-            results.append(result)
+        if batch:
+            self._queue_products(session, batch)
+            
+        results = self._flush(session)
+        self.wc.transport.log_timings()
+        if not results:
+            return [(False, "Ürün bulunamadı")]
             
         return results
         
+    def _queue_products(self, session: '_WriteSession', products: List[Dict]):
+        """Ürünleri hazırlayıp yazıcı kuyruklarına ekle
+
+        İndekste olmayan SKU'lar tek seferde çözülür; oluşturma ve
+        güncellemeler ürünler ve her ana ürünün varyasyonları için ayrı
+        toplu isteklerle gönderilir.
+        """
+        entries = self.index.resolve([product.get('STOK_KODU') for product in products])
+        for product in products:
+            try:
+                product_data, fingerprint, result = self._prepare_product(product)
+                if product_data is None:
+                    session.add(result)
+                else:
+                    session.queue(product_data['sku'], entries.get(product_data['sku']),
+                                  product_data, fingerprint)
+            except Exception as e:
+                logger.error(f"Ürün senkronizasyon hatası: {str(e)}")
+                session.add((False, f"Hata: {str(e)}"))
+        
+    def sync_products_by_codes(self, stok_kodlari: List[str]) -> List[Tuple[bool, str]]:
+        """Verilen stok kodlarındaki ürünleri senkronize et
+
+        Ürünler okuyucudan toplu sorgularla tek seferde alınır ve 100'lük
+        gruplar halinde products/batch istekleriyle gönderilir.
+
+        Args:
+            stok_kodlari: Ürün stok kodları
+
+        Returns:
+            [(başarı durumu, mesaj), ...]
+        """
+        products = self.reader.get_products_by_codes(stok_kodlari)
+        if products is None:
+            return [(False, "Ürünler okunamadı")]
+
+        session = _WriteSession(self._product_writer)
+        batch = []
+        for stok_kodu in dict.fromkeys(str(code).strip() for code in stok_kodlari if code is not None and str(code).strip()):
+            product = products.get(stok_kodu)
+            if product is None:
+                # Bekleyen grup önce kuyruğa alınır ki sonuçlar kod sırasıyla dönsün
+                self._queue_products(session, batch)
+                batch = []
+                session.add((False, f"Ürün bulunamadı: {stok_kodu}"))
+                continue
+            batch.append(product)
+            if len(batch) >= 100:
+                self._queue_products(session, batch)
+                batch = []
+                
+        if batch:
+            self._queue_products(session, batch)
+
+        return self._flush(session)
+        
+    def _queue_stock_prices(self, session: '_WriteSession', products: List[Dict]):
+        """Bir grup ürünün stok/fiyatını indeksteki ID'lerle kuyruğa al"""
+        entries = self.index.resolve([product['STOK_KODU'] for product in products])
+        
+        for product in products:
+            sku = product['STOK_KODU']
+            entry = entries.get(sku)
+            if not entry:
+                session.add((False, f"WooCommerce'de ürün bulunamadı: {sku}"))
+                continue
+                
+            update_data = {
+                'regular_price': str(product.get('SATIS_FIYATI1', '0')),
+                'manage_stock': True,
+                'stock_quantity': int(product.get('BAKIYE', 0))
+            }
+            session.queue(sku, entry, update_data)
+        
     def sync_stock_prices(self) -> List[Tuple[bool, str]]:
         """Stok ve fiyatları senkronize et
 
+        Stok/fiyat satırları akış olarak okunur ve 100'lük toplu isteklerle
+        eşzamanlı gönderilir. WooCommerce ID'leri ürün indeksinden alınır.
+
         Returns:
             [(başarı durumu, mesaj), ...]
         """
-        results = []
-        products = self.reader.get_all_products()
+        session = _WriteSession(self._product_writer)
+        batch = []
         
-        if not products:
-            return [(False, "Ürün bulunamadı")]
-            
-        batch_updates = []
-        for product in products:
-            try:
-                sku = product.get('STOK_KODU')
-                if not sku:
-                    results.append((False, "Stok kodu bulunamadı"))
-                    continue
-                    
-                wc_product = self.wc.get_product_by_sku(sku)
-                if not wc_product:
-                    results.append((False, f"WooCommerce'de ürün bulunamadı: {sku}"))
+        try:
+            self.index.ensure_built()
+            for product in self.reader.iter_stock_and_prices():
+                if not product.get('STOK_KODU'):
+                    session.add((False, "Stok kodu bulunamadı"))
                     continue
                     
-                update_data = {
-                    'id': wc_product['id'],
-                    'regular_price': str(product.get('SATIS_FIYATI1', '0')),
-                    'manage_stock': True,
-                    'stock_quantity': int(product.get('BAKIYE', 0))
-                }
+                batch.append(product)
                 
-                batch_updates.append(update_data)
-                
-                # Her 100 üründe bir toplu güncelleme yap
-                if len(batch_updates) >= 100:
-                    response = self.wc.batch_update_products(batch_updates)
-                    if response:
-                        results.extend([(True, f"Ürün güncellendi: {u['sku']}") for u in batch_updates])
-                    else:
-                        results.extend([(False, f"Ürün güncellenemedi: {u['sku']}") for u in batch_updates])
-                    batch_updates = []
-                    
-            except Exception as e:
-                results.append((False, f"Hata: {str(e)}"))
+                # Her 100 üründe bir SKU'lar çözülüp kuyruğa alınır
+                if len(batch) >= 100:
+                    self._queue_stock_prices(session, batch)
+                    batch = []
+        except Exception as e:
+            logger.error(f"Stok ve fiyat okuma hatası: {str(e)}")
+            session.add((False, f"Hata: {str(e)}"))
                 
         # Kalan güncellemeleri yap
-        if batch_updates:
-            response = self.wc.batch_update_products(batch_updates)
-            if response:
-                results.extend([(True, f"Ürün güncellendi: {u['sku']}") for u in batch_updates])
-            else:
-                results.extend([(False, f"Ürün güncellenemedi: {u['sku']}") for u in batch_updates])
+        if batch:
+            self._queue_stock_prices(session, batch)
+            
+        results = self._flush(session)
+        self.wc.transport.log_timings()
+        if not results:
+            return [(False, "Ürün bulunamadı")]
+                
+        return results
+
+    def sync_stock_price_changes(self) -> List[Tuple[bool, str]]:
+        """Stok/fiyat hızlı şeridi: yalnızca değişen alanları gönder
+
+        Yalnızca stok kodu, fiyat ve bakiye kolonları okunur; her SKU son
+        gönderilen (ya da WooCommerce yanıtında dönen) değerlerle
+        karşılaştırılır ve sadece değişen regular_price, stock_quantity ve
+        stock_status alanları toplu güncellemelerle gönderilir. Açıklama,
+        görsel ve kategorilere dokunulmaz; değişiklik yoksa WooCommerce'e
+        hiç istek yapılmaz. Dakikalık çalıştırılmak için tasarlanmıştır.
+
+        Returns:
+            Gönderilen ürünlerin [(başarı durumu, mesaj), ...] listesi
+        """
+        session = _WriteSession(self._product_writer)
+        batch = []
+        scanned = 0
+        
+        try:
+            for product in self.reader.iter_stock_and_prices():
+                sku = product.get('STOK_KODU')
+                if not sku:
+                    continue
+                scanned += 1
+                values = stock_price_values(product.get('SATIS_FIYATI1'), product.get('BAKIYE'))
+                changes = self.pushed.changes(sku, values)
+                if not changes:
+                    continue
+                if self.pushed.get(sku) is None:
+                    changes['manage_stock'] = True
+                batch.append((sku, changes))
                 
+                if len(batch) >= 100:
+                    self._queue_stock_price_changes(session, batch)
+                    batch = []
+        except Exception as e:
+            logger.error(f"Stok ve fiyat okuma hatası: {str(e)}")
+            session.add((False, f"Hata: {str(e)}"))
+            
+        if batch:
+            self._queue_stock_price_changes(session, batch)
+            
+        results = self._flush(session)
+        logger.info(f"Stok/fiyat hızlı şeridi: {scanned} ürün tarandı, {len(results)} ürün gönderildi")
         return results
+        
+    def _queue_stock_price_changes(self, session: '_WriteSession', changes: List[Tuple[str, Dict]]):
+        """Değişen stok/fiyat alanlarını indeksteki ID'lerle güncelleme kuyruğuna al
+
+        WooCommerce'de olmayan SKU'lar atlanır; ürün tam senkronizasyonla
+        oluşturulduğunda yanıtı kaydedilir.
+        """
+        entries = self.index.resolve([sku for sku, _ in changes])
+        for sku, data in changes:
+            entry = entries.get(sku)
+            if entry:
+                session.queue(sku, entry, data)
+
+class _WriteSession:
+    def __init__(self, make_writer):
+        """Bir senkronizasyon turunun ürün/varyasyon yazıcıları
+
+        Sonuçlar ürünlerin eklendiği sırayla tutulur; toplu isteklerden
+        dönen sonuçlar kaydın yerine yazılır.
+
+        Args:
+            make_writer: Ana ürün ID'si (ürünler için None) alıp yazıcı döndüren fonksiyon
+        """
+        self.make_writer = make_writer
+        self.results: List[Optional[Tuple[bool, str]]] = []
+        self.writers = {}  # ana ürün ID'si -> (yazıcı, bekleyen sonuç sıraları)
+
+    def add(self, result: Tuple[bool, str]):
+        """Gönderilmeyen bir ürünün sonucunu ekle"""
+        self.results.append(result)
+
+    def queue(self, sku: str, entry: Optional[Dict], data: Dict, fingerprint: Optional[str] = None):
+        """Ürünü indeks kaydına göre güncelleme veya oluşturma kuyruğuna ekle"""
+        parent_id = entry['product_id'] if entry and entry['variation_id'] else None
+        if parent_id not in self.writers:
+            self.writers[parent_id] = (self.make_writer(parent_id), deque())
+        writer, positions = self.writers[parent_id]
+
+        positions.append(len(self.results))
+        self.results.append(None)
+        if entry:
+            written = writer.update(sku, entry['variation_id'] or entry['product_id'], data, fingerprint)
+        else:
+            written = writer.create(sku, data, fingerprint)
+        self._collect(positions, written)
+
+    def _collect(self, positions: deque, written: List[Tuple[bool, str]]):
+        for result in written:
+            self.results[positions.popleft()] = result
+
+    def flush(self) -> List[Tuple[bool, str]]:
+        """Bekleyen tüm toplu istekleri gönderip sonuçları döndür"""
+        for writer, positions in self.writers.values():
+            self._collect(positions, writer.flush())
+        return self.results
@@ -3,24 +3,31 @@ import logging
 from typing import Dict, List, Optional, Union
 from datetime import datetime
 
+from src.core.http_transport import HttpTransport, get_transport
+from src.core.woo_fields import Fields, with_fields
+
 logger = logging.getLogger(__name__)
 
 class WooCommerceClient:
-    def __init__(self, url: str, consumer_key: str, consumer_secret: str):
+    def __init__(self, url: str, consumer_key: str, consumer_secret: str,
+                 transport: Optional[HttpTransport] = None):
         """WooCommerce API istemcisi
 
         Args:
             url: WooCommerce site URL'si
             consumer_key: API Consumer Key
             consumer_secret: API Consumer Secret
+            transport: HTTP katmanı (None ise paylaşılan katman kullanılır)
         """
         self.url = url.rstrip('/')
         self.consumer_key = consumer_key
         self.consumer_secret = consumer_secret
         self.api_url = f"{self.url}/wp-json/wc/v3"
         self.auth = (consumer_key, consumer_secret)
+        self.transport = transport or get_transport()
 
-    def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Optional[Union[Dict, List]]:
+    def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None,
+                      cache: Union[bool, str] = False) -> Optional[Union[Dict, List]]:
         """API isteği gönder
 
         Args:
@@ -28,18 +35,20 @@ class WooCommerceClient:
             endpoint: API endpoint'i
             params: URL parametreleri
             data: POST/PUT için veri
+            cache: GET yanıtı önbellekten doğrulansın mı (bkz. HttpTransport.request)
 
         Returns:
             API yanıtı
         """
         url = f"{self.api_url}/{endpoint}"
         try:
-            response = requests.request(
-                method=method,
-                url=url,
+            response = self.transport.request(
+                method,
+                url,
                 auth=self.auth,
                 params=params,
-                json=data
+                json=data,
+                cache=cache
             )
             response.raise_for_status()
             return response.json()
@@ -47,14 +56,34 @@ class WooCommerceClient:
             logger.error(f"WooCommerce API hatası: {str(e)}")
             return None
 
-    def get_product_by_sku(self, sku: str) -> Optional[Dict]:
-        """SKU'ya göre ürün getir"""
-        params = {'sku': sku}
+    def get_product_by_sku(self, sku: str, fields: Fields = 'full') -> Optional[Dict]:
+        """SKU'ya göre ürün getir
+
+        Okuma metotlarının fields parametresi yanıtı WooCommerce _fields ile
+        daraltır: hazır seçim adı ('index', 'stock_price', 'full') ya da
+        alan adları listesi (bkz. src.core.woo_fields).
+        """
+        params = with_fields({'sku': sku}, fields)
         products = self._make_request('GET', 'products', params=params)
         if products and len(products) > 0:
             return products[0]
         return None
 
+    def list_products(self, page: int = 1, per_page: int = 100, fields: Fields = 'full',
+                      cache: Union[bool, str] = False, **params) -> Optional[List[Dict]]:
+        """Ürünleri sayfa sayfa getir
+
+        cache='probe' ile sayfalar değişmemişse yerel önbellekten verilir
+        (bkz. src.core.http_cache.ResponseCache).
+        """
+        params.update({'page': page, 'per_page': per_page})
+        return self._make_request('GET', 'products', params=with_fields(params, fields), cache=cache)
+
+    def get_products_by_skus(self, skus: List[str], fields: Fields = 'full') -> Optional[List[Dict]]:
+        """Birden çok SKU'yu tek istekte getir (virgülle ayrılmış sku filtresi)"""
+        params = with_fields({'sku': ','.join(skus), 'per_page': 100}, fields)
+        return self._make_request('GET', 'products', params=params)
+
     def create_product(self, data: Dict) -> Optional[Dict]:
         """Yeni ürün oluştur"""
         return self._make_request('POST', 'products', data=data)
@@ -63,9 +92,15 @@ class WooCommerceClient:
         """Ürün güncelle"""
         return self._make_request('PUT', f'products/{product_id}', data=data)
 
-    def get_categories(self) -> Optional[List[Dict]]:
+    def get_categories(self, fields: Fields = 'full') -> Optional[List[Dict]]:
         """Tüm kategorileri getir"""
-        return self._make_request('GET', 'products/categories', params={'per_page': 100})
+        return self._make_request('GET', 'products/categories', params=with_fields({'per_page': 100}, fields))
+
+    def list_categories(self, page: int = 1, per_page: int = 100, fields: Fields = 'full',
+                        cache: Union[bool, str] = False, **params) -> Optional[List[Dict]]:
+        """Kategorileri sayfa sayfa getir"""
+        params.update({'page': page, 'per_page': per_page})
+        return self._make_request('GET', 'products/categories', params=with_fields(params, fields), cache=cache)
 
     def create_category(self, name: str, parent: int = 0) -> Optional[Dict]:
         """Yeni kategori oluştur"""
@@ -95,12 +130,23 @@ class WooCommerceClient:
 
     def batch_update_products(self, updates: List[Dict]) -> Optional[Dict]:
         """Toplu ürün güncelleme"""
-        data = {'update': updates}
+        return self.batch_products({'update': updates})
+
+    def batch_products(self, data: Dict) -> Optional[Dict]:
+        """Toplu ürün oluşturma/güncelleme ({'create': [...], 'update': [...]})"""
         return self._make_request('POST', 'products/batch', data=data)
 
-    def get_product_variations(self, product_id: int) -> Optional[List[Dict]]:
+    def get_product_variations(self, product_id: int, fields: Fields = 'full') -> Optional[List[Dict]]:
         """Ürün varyasyonlarını getir"""
-        return self._make_request('GET', f'products/{product_id}/variations')
+        return self._make_request('GET', f'products/{product_id}/variations', params=with_fields(None, fields))
+
+    def list_product_variations(self, product_id: int, page: int = 1, per_page: int = 100,
+                                fields: Fields = 'full', cache: Union[bool, str] = False,
+                                **params) -> Optional[List[Dict]]:
+        """Ürün varyasyonlarını sayfa sayfa getir"""
+        params.update({'page': page, 'per_page': per_page})
+        return self._make_request('GET', f'products/{product_id}/variations',
+                                  params=with_fields(params, fields), cache=cache)
 
     def create_product_variation(self, product_id: int, data: Dict) -> Optional[Dict]:
         """Ürün varyasyonu oluştur"""
@@ -110,9 +156,18 @@ class WooCommerceClient:
         """Ürün varyasyonu güncelle"""
         return self._make_request('PUT', f'products/{product_id}/variations/{variation_id}', data=data)
 
-    def get_orders(self, status: Optional[str] = None, after: Optional[datetime] = None) -> Optional[List[Dict]]:
+    def batch_update_variations(self, product_id: int, updates: List[Dict]) -> Optional[Dict]:
+        """Toplu varyasyon güncelleme"""
+        return self.batch_variations(product_id, {'update': updates})
+
+    def batch_variations(self, product_id: int, data: Dict) -> Optional[Dict]:
+        """Toplu varyasyon oluşturma/güncelleme"""
+        return self._make_request('POST', f'products/{product_id}/variations/batch', data=data)
+
+    def get_orders(self, status: Optional[str] = None, after: Optional[datetime] = None,
+                   fields: Fields = 'full') -> Optional[List[Dict]]:
         """Siparişleri getir"""
-        params = {'per_page': 100}
+        params = with_fields({'per_page': 100}, fields)
         if status:
             params['status'] = status
         if after:
@@ -123,3 +178,7 @@ class WooCommerceClient:
         """Sipariş durumunu güncelle"""
         data = {'status': status}
         return self._make_request('PUT', f'orders/{order_id}', data=data)
+
+    def batch_update_orders(self, updates: List[Dict]) -> Optional[Dict]:
+        """Toplu sipariş güncelleme (ör. [{'id': 1, 'status': 'completed'}])"""
+        return self._make_request('POST', 'orders/batch', data={'update': updates})
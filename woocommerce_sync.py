@@ -4,6 +4,9 @@ from woocommerce import API
 import fdb
 from datetime import datetime
 
+from wolvox.product import WolvoxProduct
+from wolvox.stock_ledger import StockLedger
+
 # .env dosyasından konfigürasyon yükleme
 load_dotenv()
 
@@ -54,18 +57,18 @@ def get_product_data(cursor, stok_kodu):
     if not urun:
         return None
     
-    # Stok miktarını getir
-    cursor.execute("""
-        SELECT 
-            COALESCE(SUM(CASE WHEN sh.TUTAR_TURU = 0 THEN sh.MIKTARI ELSE -sh.MIKTARI END), 0) as MIKTAR_KALAN
-        FROM STOK s
-        LEFT JOIN STOKHR sh ON sh.BLSTKODU = s.BLKODU
-        WHERE s.STOKKODU = ?
-        GROUP BY s.STOKKODU
-    """, (stok_kodu,))
+    # Boş metin alanları '' olarak taşınır
+    metin = lambda value: value.strip() if value else ''
+    product = WolvoxProduct.row_factory(
+        ('stok_kodu', 'stok_adi', 'barkod', 'birim', 'kdv_orani', 'marka', 'model',
+         'aciklama', 'resim_yolu', 'kategori', 'webde_gorunsun', 'aktif', 'blkodu'),
+        converters={alan: metin for alan in ('barkod', 'marka', 'model', 'aciklama', 'resim_yolu', 'kategori')}
+    )(urun)
+    product.webde_gorunsun = product.webde_gorunsun == 1
+    product.aktif = product.aktif == 1
     
-    stok_miktar = cursor.fetchone()
-    miktar = float(stok_miktar[0]) if stok_miktar else 0
+    # Stok miktarını defterden al (işlenmemiş hareketler Wolvox'tan canlı okunur)
+    product.bakiye = StockLedger(cursor.connection).get_stock(product.stok_kodu)['total']
     
     # Fiyat bilgilerini getir
     cursor.execute("""
@@ -78,33 +81,16 @@ def get_product_data(cursor, stok_kodu):
         FROM STOK_FIYAT sf
         WHERE sf.BLSTKODU = ? AND sf.FIYAT_NO = 1 AND sf.ALIS_SATIS = 1
         ORDER BY sf.FIYAT_NO
-    """, (urun[12],))
+    """, (product.blkodu,))
     
     fiyat_bilgisi = cursor.fetchone()
     fiyat = float(fiyat_bilgisi[0]) if fiyat_bilgisi else 0
     
     # KDV hesaplamaları
-    kdv_orani = float(urun[4])
-    fiyat_kdv_dahil = fiyat
-    fiyat_kdv_haric = fiyat_kdv_dahil / (1 + (kdv_orani / 100))
+    product.kdv_dahil_fiyat = fiyat
+    product.kdv_haric_fiyat = fiyat / (1 + (product.kdv_orani / 100))
     
-    return {
-        'stok_kodu': urun[0].strip(),
-        'urun_adi': urun[1].strip(),
-        'barkod': urun[2].strip() if urun[2] else '',
-        'birim': urun[3].strip(),
-        'kdv_orani': kdv_orani,
-        'marka': urun[5].strip() if urun[5] else '',
-        'model': urun[6].strip() if urun[6] else '',
-        'aciklama': urun[7].strip() if urun[7] else '',
-        'resim_yolu': urun[8].strip() if urun[8] else '',
-        'kategori': urun[9].strip() if urun[9] else '',
-        'webde_gorunsun': urun[10] == 1,
-        'aktif': urun[11] == 1,
-        'stok_miktar': miktar,
-        'fiyat_kdv_dahil': fiyat_kdv_dahil,
-        'fiyat_kdv_haric': fiyat_kdv_haric
-    }
+    return product
 
 def sync_product_to_woocommerce(wcapi, product_data):
     """Ürün bilgilerini WooCommerce'e senkronize eder"""